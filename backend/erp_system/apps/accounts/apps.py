@@ -3,3 +3,13 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'erp_system.apps.accounts'
+
+    def ready(self):
+        from erp_system.apps.core.caching import track_model
+        from .models import (
+            Account, CostCenter, TransactionAccountMapping, PropertyClassification, ReceiptPaymentMapping,
+        )
+        # Reference data served through ReferenceDataCacheMixin
+        for model in (Account, CostCenter, TransactionAccountMapping, PropertyClassification,
+                      ReceiptPaymentMapping):
+            track_model(model)
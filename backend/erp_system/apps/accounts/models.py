@@ -123,6 +123,7 @@ class JournalEntry(models.Model):
     period = models.CharField(max_length=7, blank=True, default='')  # YYYY-MM
     description = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('reference_type', 'reference_id', 'entry_type', 'period')
@@ -141,6 +142,7 @@ class JournalLine(models.Model):
     cost_center = models.ForeignKey(CostCenter, on_delete=models.PROTECT, related_name='journal_lines')
     reference_type = models.CharField(max_length=100)
     reference_id = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.journal_entry_id} - {self.account.account_number}"
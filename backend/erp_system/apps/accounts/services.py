@@ -1,13 +1,17 @@
 from decimal import Decimal
 from django.db import transaction
 from django.core.exceptions import ValidationError
-from .models import JournalEntry, JournalLine, ChequeRegister, TransactionAccountMapping
+from django.utils import timezone
+from erp_system.apps.core.caching import bump_version
+from erp_system.apps.core.profiling import profiled
+from .models import CostCenter, JournalEntry, JournalLine, ChequeRegister, TransactionAccountMapping
 
 
 class ChequeRegisterService:
     """Service for cheque register status changes and accounting"""
 
     @staticmethod
+    @profiled
     @transaction.atomic
     def mark_cleared(cheque: ChequeRegister):
         if cheque.status == 'cleared':
@@ -72,10 +76,158 @@ class ChequeRegisterService:
             )
 
         cheque.status = 'cleared'
-        cheque.save(update_fields=['status'])
+        cheque.save(update_fields=['status', 'updated_at'])
         return entry
 
 
+class CostCenterProvisioningService:
+    """
+    Allocates per-record cost centers (CC-UNIT-0001, CC-TENANT-0001, ...) in bulk.
+
+    Existing cost centers are reused by code, missing ones are created with
+    one bulk insert and attached to their records with one bulk update.
+    """
+
+    BATCH_SIZE = 500
+
+    @staticmethod
+    def unit_code(unit):
+        return f"CC-UNIT-{unit.id:04d}"
+
+    @staticmethod
+    def tenant_code(tenant):
+        return f"CC-TENANT-{tenant.id:04d}"
+
+    @staticmethod
+    def supplier_code(supplier):
+        return f"CC-SUPPLIER-{supplier.id:04d}"
+
+    @staticmethod
+    def property_code(property_obj):
+        return f"CC-PROP-{property_obj.id:04d}"
+
+    @staticmethod
+    def _fetch(codes):
+        batch_size = CostCenterProvisioningService.BATCH_SIZE
+        found = {}
+        for offset in range(0, len(codes), batch_size):
+            for cost_center in CostCenter.objects.filter(code__in=codes[offset:offset + batch_size]):
+                found[cost_center.code] = cost_center
+        return found
+
+    @staticmethod
+    def ensure(specs):
+        """Get or create cost centers for a {code: name} mapping, returning {code: CostCenter}"""
+        codes = list(specs)
+        found = CostCenterProvisioningService._fetch(codes)
+        missing = [code for code in codes if code not in found]
+        if missing:
+            CostCenter.objects.bulk_create(
+                [CostCenter(code=code, name=specs[code]) for code in missing],
+                batch_size=CostCenterProvisioningService.BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+            # bulk_create sends no post_save, so invalidate cached cost center lists here
+            transaction.on_commit(lambda: bump_version(CostCenter))
+            found.update(CostCenterProvisioningService._fetch(missing))
+        return found
+
+    @staticmethod
+    def _attach(records, code_for, name_for):
+        pending = [record for record in records if record.pk and not record.cost_center_id]
+        if not pending:
+            return []
+
+        cost_centers = CostCenterProvisioningService.ensure({
+            code_for(record): name_for(record) for record in pending
+        })
+        now = timezone.now()
+        for record in pending:
+            record.cost_center = cost_centers[code_for(record)]
+            record.updated_at = now
+        type(pending[0]).objects.bulk_update(
+            pending, ['cost_center', 'updated_at'], batch_size=CostCenterProvisioningService.BATCH_SIZE
+        )
+        return pending
+
+    @staticmethod
+    def provision_units(units):
+        """Attach CC-UNIT cost centers to saved units that have none (units need property loaded)"""
+        return CostCenterProvisioningService._attach(
+            units,
+            CostCenterProvisioningService.unit_code,
+            lambda unit: f"{unit.property.name} - {unit.unit_number}",
+        )
+
+    @staticmethod
+    def provision_tenants(tenants):
+        """Attach CC-TENANT cost centers to saved tenants that have none"""
+        return CostCenterProvisioningService._attach(
+            tenants,
+            CostCenterProvisioningService.tenant_code,
+            lambda tenant: f"Tenant {tenant.first_name} {tenant.last_name}",
+        )
+
+    @staticmethod
+    def for_unit(unit):
+        CostCenterProvisioningService.provision_units([unit])
+        return unit.cost_center
+
+    @staticmethod
+    def for_tenant(tenant):
+        CostCenterProvisioningService.provision_tenants([tenant])
+        return tenant.cost_center
+
+    @staticmethod
+    def for_property(property_obj):
+        code = CostCenterProvisioningService.property_code(property_obj)
+        return CostCenterProvisioningService.ensure({code: f"{property_obj.name} - Property"})[code]
+
+    @staticmethod
+    def for_supplier(supplier):
+        code = CostCenterProvisioningService.supplier_code(supplier)
+        return CostCenterProvisioningService.ensure({
+            code: f"Supplier {supplier.first_name} {supplier.last_name}"
+        })[code]
+
+
+@profiled
+def post_journal_entries(entries):
+    """
+    Post a batch of journal entries with one insert for the headers and one
+    for the lines.
+
+    Each item is a dict of JournalEntry fields plus a 'lines' list of
+    JournalLine field dicts. Every entry must balance.
+    """
+    headers = []
+    line_groups = []
+    for data in entries:
+        data = dict(data)
+        lines = data.pop('lines')
+        total_debit = sum((Decimal(line.get('debit') or 0) for line in lines), Decimal('0.00'))
+        total_credit = sum((Decimal(line.get('credit') or 0) for line in lines), Decimal('0.00'))
+        if total_debit != total_credit:
+            raise ValidationError(
+                f"Journal entry for {data.get('reference_type')}:{data.get('reference_id')} "
+                f"is not balanced (debit {total_debit}, credit {total_credit})."
+            )
+        headers.append(JournalEntry(**data))
+        line_groups.append(lines)
+
+    if not headers:
+        return []
+
+    with transaction.atomic():
+        JournalEntry.objects.bulk_create(headers)
+        JournalLine.objects.bulk_create([
+            JournalLine(journal_entry=entry, **line)
+            for entry, lines in zip(headers, line_groups)
+            for line in lines
+        ])
+    return headers
+
+
 def require_transaction_mapping(transaction_type: str) -> TransactionAccountMapping:
     mapping = TransactionAccountMapping.objects.filter(
         transaction_type=transaction_type,
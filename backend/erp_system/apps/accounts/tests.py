@@ -0,0 +1,75 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .models import Account, ChequeRegister, CostCenter, JournalEntry, JournalLine
+
+
+class ConditionalDetailTests(TestCase):
+    """A detail GET revalidated with a stale ETag must see every saved change"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='etag', password='etag')
+        cls.cost_center = CostCenter.objects.create(code='CC-TEST', name='Test')
+        cls.cash = Account.objects.create(account_number='1000', account_name='Cash', account_type='asset')
+        cls.equity = Account.objects.create(account_number='3000', account_name='Capital', account_type='equity')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def revalidate(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        return etag
+
+    def test_cheque_status_change_invalidates_etag(self):
+        cheque = ChequeRegister.objects.create(
+            cheque_type='incoming', cheque_number='000123', cheque_date=date(2026, 1, 15), amount=Decimal('500.00')
+        )
+        url = f'/api/accounts/cheque-registers/{cheque.pk}/'
+        etag = self.revalidate(url)
+
+        response = self.client.post(f'{url}mark_deposited/')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'deposited')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_journal_line_edit_invalidates_entry_etag(self):
+        entry = JournalEntry.objects.create(
+            entry_type='manual', reference_type='manual_journal', reference_id=1, description='Opening balance'
+        )
+        line = JournalLine.objects.create(
+            journal_entry=entry, account=self.cash, debit=Decimal('100.00'), cost_center=self.cost_center,
+            reference_type='manual_journal', reference_id=1,
+        )
+        JournalLine.objects.create(
+            journal_entry=entry, account=self.equity, credit=Decimal('100.00'), cost_center=self.cost_center,
+            reference_type='manual_journal', reference_id=1,
+        )
+
+        for url in (f'/api/accounts/journal-entries/{entry.pk}/', f'/api/accounts/manual-journals/{entry.pk}/'):
+            etag = self.revalidate(url)
+            line.debit += Decimal('1.00')
+            line.save()
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_journal_entry_edit_invalidates_etag(self):
+        entry = JournalEntry.objects.create(
+            entry_type='manual', reference_type='manual_journal', reference_id=2, description='Accrual'
+        )
+        url = f'/api/accounts/journal-entries/{entry.pk}/'
+        etag = self.revalidate(url)
+
+        entry.description = 'Accrual reversal'
+        entry.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
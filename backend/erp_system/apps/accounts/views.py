@@ -3,6 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.pagination import PageNumberPagination
+from erp_system.apps.core.caching import ConditionalDetailMixin, ReferenceDataCacheMixin
+from erp_system.apps.core.db_router import reads_from_replica
 from django.db.models import Sum, Q  # ADD Q here
 from .models import (
     Account,
@@ -29,7 +31,7 @@ class CustomPageNumberPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
-class AccountViewSet(viewsets.ModelViewSet):
+class AccountViewSet(ReferenceDataCacheMixin, viewsets.ModelViewSet):
     queryset = Account.objects.all()
     serializer_class = AccountSerializer
     pagination_class = CustomPageNumberPagination
@@ -40,14 +42,15 @@ class AccountViewSet(viewsets.ModelViewSet):
     ordering = ['account_number']
 
 
-class CostCenterViewSet(viewsets.ModelViewSet):
+class CostCenterViewSet(ReferenceDataCacheMixin, viewsets.ModelViewSet):
     queryset = CostCenter.objects.all()
     serializer_class = CostCenterSerializer
 
 
-class JournalEntryViewSet(viewsets.ModelViewSet):
+class JournalEntryViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = JournalEntry.objects.all()
     serializer_class = JournalEntrySerializer
+    etag_dependencies = {'lines': 'updated_at'}
 
 
 class TrialBalancePagination(PageNumberPagination):
@@ -65,6 +68,7 @@ class JournalLineViewSet(viewsets.ModelViewSet):
     serializer_class = JournalLineSerializer
 
     @action(detail=False, methods=['get'])
+    @reads_from_replica
     def trial_balance(self, request):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
@@ -97,10 +101,6 @@ class JournalLineViewSet(viewsets.ModelViewSet):
                 Q(account__account_name__icontains=search_query)
             ).distinct()
         
-        # Debug: Check what data we're getting
-        print(f"Date range: {start_date} to {end_date}")
-        print(f"Total lines found: {lines.count()}")
-        
         # Group by account and calculate totals
         summary = lines.values(
             'account__id',
@@ -153,6 +153,7 @@ class JournalLineViewSet(viewsets.ModelViewSet):
         })
 
     @action(detail=False, methods=['get'])
+    @reads_from_replica
     def general_ledger(self, request):
         account_id = request.query_params.get('account_id')
         start_date = request.query_params.get('start_date')
@@ -256,7 +257,7 @@ class JournalLineViewSet(viewsets.ModelViewSet):
             }
         })
 
-class ChequeRegisterViewSet(viewsets.ModelViewSet):
+class ChequeRegisterViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = ChequeRegister.objects.select_related('payment_voucher', 'receipt_voucher')
     serializer_class = ChequeRegisterSerializer
     pagination_class = CustomPageNumberPagination
@@ -317,7 +318,7 @@ class ChequeRegisterViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Only received cheques can be marked as deposited.'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         cheque.status = 'deposited'
-        cheque.save(update_fields=['status'])
+        cheque.save(update_fields=['status', 'updated_at'])
         return Response(self.get_serializer(cheque).data)
     
     @action(detail=True, methods=['post'])
@@ -327,12 +328,13 @@ class ChequeRegisterViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Only cleared cheques can be marked as bounced.'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         cheque.status = 'bounced'
-        cheque.save(update_fields=['status'])
+        cheque.save(update_fields=['status', 'updated_at'])
         return Response(self.get_serializer(cheque).data)
 
-class ManualJournalEntryViewSet(viewsets.ModelViewSet):  # Change from ViewSet to ModelViewSet
+class ManualJournalEntryViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):  # Change from ViewSet to ModelViewSet
     queryset = JournalEntry.objects.filter(entry_type='manual')  # Filter only manual entries
     serializer_class = JournalEntrySerializer  # Use JournalEntrySerializer for all operations
+    etag_dependencies = {'lines': 'updated_at'}
     pagination_class = CustomPageNumberPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
@@ -380,16 +382,16 @@ class ManualJournalEntryViewSet(viewsets.ModelViewSet):  # Change from ViewSet t
         return queryset.select_related().prefetch_related('lines', 'lines__account', 'lines__cost_center')
 
 
-class TransactionAccountMappingViewSet(viewsets.ModelViewSet):
+class TransactionAccountMappingViewSet(ReferenceDataCacheMixin, viewsets.ModelViewSet):
     queryset = TransactionAccountMapping.objects.all()
     serializer_class = TransactionAccountMappingSerializer
 
 
-class PropertyClassificationViewSet(viewsets.ModelViewSet):
+class PropertyClassificationViewSet(ReferenceDataCacheMixin, viewsets.ModelViewSet):
     queryset = PropertyClassification.objects.all()
     serializer_class = PropertyClassificationSerializer
 
 
-class ReceiptPaymentMappingViewSet(viewsets.ModelViewSet):
+class ReceiptPaymentMappingViewSet(ReferenceDataCacheMixin, viewsets.ModelViewSet):
     queryset = ReceiptPaymentMapping.objects.all()
     serializer_class = ReceiptPaymentMappingSerializer
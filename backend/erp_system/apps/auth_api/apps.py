@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AuthApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'erp_system.apps.auth_api'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_delete, post_save
+        from rest_framework.authtoken.models import Token
+        from .signals import token_deleted, user_saved
+        post_delete.connect(token_deleted, sender=Token, dispatch_uid='auth_api.token_deleted')
+        post_save.connect(user_saved, sender=get_user_model(), dispatch_uid='auth_api.user_saved')
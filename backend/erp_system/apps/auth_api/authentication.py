@@ -0,0 +1,104 @@
+"""
+Token authentication with the token lookup cached.
+
+DRF's TokenAuthentication runs a Token join User query on every request.
+CachedTokenAuthentication keeps the authenticated token (with its user)
+in the shared cache for AUTH_TOKEN_CACHE_TIMEOUT seconds, keyed by a hash
+of the token so keys never contain credentials. Deleting a token (logout)
+or saving its user (deactivation, staff changes) drops the entry right
+away; see signals.py.
+
+Last use is recorded in memory and flushed to TokenActivity at most every
+AUTH_TOKEN_USAGE_FLUSH_INTERVAL seconds per process, one upsert for all
+tokens seen in that window.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from .models import TokenActivity
+
+logger = logging.getLogger(__name__)
+
+
+def token_cache_key(key):
+    return f'auth:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def invalidate_token(key):
+    cache.delete(token_cache_key(key))
+
+
+class TokenUsageBuffer:
+    """Last-used timestamps per token key, flushed to the database in batches"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, key):
+        now = timezone.now()
+        with self._lock:
+            self._pending[key] = now
+            interval = getattr(settings, 'AUTH_TOKEN_USAGE_FLUSH_INTERVAL', 60)
+            if time.monotonic() - self._last_flush < interval:
+                return
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        self.write(pending)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        self.write(pending)
+
+    @staticmethod
+    def write(pending):
+        if not pending:
+            return
+        try:
+            # Tokens deleted since they were used would violate the foreign key
+            live = set(Token.objects.filter(key__in=list(pending)).values_list('key', flat=True))
+            TokenActivity.objects.bulk_create(
+                [TokenActivity(token_id=key, last_used_at=used_at) for key, used_at in pending.items() if key in live],
+                update_conflicts=True,
+                unique_fields=['token'],
+                update_fields=['last_used_at'],
+            )
+        except Exception:
+            # Usage tracking must never fail the request that triggered the flush
+            logger.exception('Could not record token usage for %d tokens', len(pending))
+
+
+usage = TokenUsageBuffer()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication with the token and user lookup served from the cache"""
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            try:
+                token = self.get_model().objects.select_related('user').get(key=key)
+            except self.get_model().DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            if token.user.is_active:
+                cache.set(cache_key, token, getattr(settings, 'AUTH_TOKEN_CACHE_TIMEOUT', 60))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        usage.record(key)
+        return (token.user, token)
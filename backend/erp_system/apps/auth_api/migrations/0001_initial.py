@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('authtoken', '0003_tokenproxy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenActivity',
+            fields=[
+                ('token', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity', serialize=False, to='authtoken.token')),
+                ('last_used_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'Token activity',
+            },
+        ),
+    ]
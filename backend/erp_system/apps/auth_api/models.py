@@ -1,3 +1,17 @@
 from django.db import models
+from rest_framework.authtoken.models import Token
 
-# No models needed for auth_api - we use Django's built-in User and Token models
+
+class TokenActivity(models.Model):
+    """
+    When an API token was last used. Written in batches by
+    CachedTokenAuthentication, so it lags by up to AUTH_TOKEN_USAGE_FLUSH_INTERVAL.
+    """
+    token = models.OneToOneField(Token, on_delete=models.CASCADE, primary_key=True, related_name='activity')
+    last_used_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = 'Token activity'
+
+    def __str__(self):
+        return f"{self.token.user} last used {self.last_used_at:%Y-%m-%d %H:%M}"
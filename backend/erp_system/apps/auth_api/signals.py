@@ -0,0 +1,17 @@
+"""Drop cached tokens when they are deleted or their user changes"""
+
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+from .authentication import invalidate_token
+
+
+def token_deleted(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    keys = list(Token.objects.filter(user=instance).values_list('key', flat=True))
+    # After commit, so a concurrent request cannot re-cache the old user
+    transaction.on_commit(lambda: [invalidate_token(key) for key in keys])
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'erp_system.apps.core'
+
+    def ready(self):
+        from .sqlite import configure_sqlite_connection
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='core.sqlite_performance_mode')
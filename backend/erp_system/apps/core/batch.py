@@ -0,0 +1,106 @@
+"""
+In-process execution of read sub-requests for the batch endpoint.
+
+Each sub-request is resolved against the URLconf and dispatched straight to
+its view, so a form that needs accounts, cost centers, tenants and units
+costs one HTTP round trip and one authentication instead of one per list:
+the sub-request carries the batch request's user instead of its
+Authorization header, and BatchAuthentication hands that user to the
+view. Sub-requests skip the middleware stack, so their metrics are
+recorded here. They run on the batch request's thread and therefore share
+its database connection.
+"""
+
+import logging
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.response import Response
+from .middleware import measure
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/'
+
+# Per-item conditional headers; the batch request's own are not forwarded
+CONDITIONAL_HEADERS = {
+    'If-None-Match': 'HTTP_IF_NONE_MATCH',
+    'If-Modified-Since': 'HTTP_IF_MODIFIED_SINCE',
+}
+FORWARDED_RESPONSE_HEADERS = ('ETag', 'Last-Modified')
+
+# Set on sub-requests only; never derived from client input
+CREDENTIALS_ATTR = 'batch_credentials'
+
+
+class BatchAuthentication(BaseAuthentication):
+    """Authenticates batched sub-requests as the already authenticated batch request"""
+
+    def authenticate(self, request):
+        return getattr(request._request, CREDENTIALS_ATTR, None)
+
+
+def _error(status_code, message):
+    return {'status': status_code, 'data': {'error': message}}
+
+
+def _sub_request(request, path, query, headers):
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {
+        key: value for key, value in request.META.items()
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_AUTHORIZATION') and not key.startswith('HTTP_IF_')
+    }
+    sub.META.update({'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query})
+    for name, meta_key in CONDITIONAL_HEADERS.items():
+        if headers.get(name):
+            sub.META[meta_key] = str(headers[name])
+    sub.GET = QueryDict(query)
+    sub.COOKIES = request.COOKIES
+    if request.user and request.user.is_authenticated:
+        setattr(sub, CREDENTIALS_ATTR, (request.user, request.auth))
+    return sub
+
+
+def execute(request, item, batch_path):
+    """Run one sub-request and return {'status', 'data'[, 'headers']}"""
+    if isinstance(item, str):
+        item = {'path': item}
+    if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+        return _error(status.HTTP_400_BAD_REQUEST, 'Each request needs a path.')
+    if str(item.get('method', 'GET')).upper() != 'GET':
+        return _error(status.HTTP_405_METHOD_NOT_ALLOWED, 'Only GET requests can be batched.')
+
+    url = urlsplit(item['path'])
+    path = url.path if url.path.startswith(API_PREFIX) else API_PREFIX + url.path.lstrip('/')
+    if path == batch_path:
+        return _error(status.HTTP_400_BAD_REQUEST, 'Batch requests cannot be nested.')
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return _error(status.HTTP_404_NOT_FOUND, f'No endpoint at {path}.')
+
+    headers = item.get('headers') if isinstance(item.get('headers'), dict) else {}
+    sub = _sub_request(request, path, url.query, headers)
+    sub.resolver_match = match
+    view = lambda sub_request: match.func(sub_request, *match.args, **match.kwargs)  # noqa: E731
+    try:
+        if getattr(settings, 'METRICS_ENABLED', True):
+            response, _, _ = measure(sub, view)
+        else:
+            response = view(sub)
+    except Exception:
+        logger.exception('Batched request to %s failed', path)
+        return _error(status.HTTP_500_INTERNAL_SERVER_ERROR, 'Internal server error.')
+
+    if not isinstance(response, Response):
+        return _error(status.HTTP_400_BAD_REQUEST, f'{path} does not return JSON data and cannot be batched.')
+    result = {'status': response.status_code, 'data': response.data}
+    forwarded = {name: response[name] for name in FORWARDED_RESPONSE_HEADERS if response.has_header(name)}
+    if forwarded:
+        result['headers'] = forwarded
+    return result
@@ -0,0 +1,15 @@
+"""Request parsing shared by the bulk-action endpoints of the app views."""
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def request_ids(request):
+    """Parse the "ids" list of a bulk action, returning (ids, error response)"""
+    ids = request.data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        return None, Response({'error': 'ids must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        return [int(record_id) for record_id in ids], None
+    except (TypeError, ValueError):
+        return None, Response({'error': 'ids must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,197 @@
+"""
+Conditional GET support.
+
+ReferenceDataCacheMixin: ETags and cached payloads for rarely changing
+reference data. ConditionalDetailMixin: ETags for detail endpoints derived
+from the object's timestamps.
+
+
+For reference data every cached model has a version token in the shared cache, replaced on any
+write (post_save/post_delete, plus explicit ``bump_version`` calls after
+bulk operations that skip signals). A response's ETag is derived from the
+versions of the models it depends on and the request URL, so:
+
+- a matching If-None-Match/If-Modified-Since is answered with 304 before
+  the viewset touches the database;
+- otherwise the serialized payload is served from the cache, and only a
+  cold key runs the query.
+
+Settings: REFERENCE_CACHE_ALIAS, REFERENCE_CACHE_TIMEOUT.
+"""
+
+import hashlib
+import time
+from datetime import datetime
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+_registered = set()
+
+
+def _cache():
+    return caches[getattr(settings, 'REFERENCE_CACHE_ALIAS', 'default')]
+
+
+def _version_key(model):
+    return f'refdata:version:{model._meta.label_lower}'
+
+
+def bump_version(*models):
+    """Invalidate cached responses depending on the given models"""
+    version = time.time_ns()
+    _cache().set_many({_version_key(model): version for model in models}, timeout=None)
+
+
+def get_versions(models):
+    """Current version token per model, initialized on first use"""
+    cache = _cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        for key, version in missing.items():
+            # add() keeps a version another process set in the meantime
+            if not cache.add(key, version, timeout=None):
+                missing[key] = cache.get(key, version)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def not_modified(request, etag, last_modified):
+    """Evaluate If-None-Match (weak comparison) or, without it, If-Modified-Since"""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        if if_none_match.strip() == '*':
+            return True
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return etag.removeprefix('W/') in tags
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def _invalidate(sender, using=None, **kwargs):
+    # After commit, so a concurrent read cannot cache the old rows under the new version
+    transaction.on_commit(lambda: bump_version(sender), using=using)
+
+
+def track_model(model):
+    """Bump the model's version whenever an instance is saved or deleted"""
+    if model in _registered:
+        return
+    _registered.add(model)
+    uid = f'refdata:{model._meta.label_lower}'
+    post_save.connect(_invalidate, sender=model, dispatch_uid=uid, weak=False)
+    post_delete.connect(_invalidate, sender=model, dispatch_uid=uid, weak=False)
+
+
+class ReferenceDataCacheMixin:
+    """
+    ETag/Last-Modified and cached payloads for list and retrieve.
+
+    ``cache_models`` lists every model the serialized output depends on and
+    defaults to the queryset model. Each of them must be registered with
+    ``track_model`` at startup (in its AppConfig.ready), so writes from any
+    process invalidate the cache.
+    """
+
+    cache_models = None
+
+    def get_cache_models(self):
+        return self.cache_models or [self.queryset.model]
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        models = self.get_cache_models()
+        versions = get_versions(models)
+        signature = ':'.join(str(version) for version in versions)
+        digest = hashlib.md5(
+            f'{signature}|{request.build_absolute_uri()}|{request.accepted_renderer.format}'.encode()
+        ).hexdigest()
+        etag = quote_etag(digest)
+        last_modified = max(versions) // 1_000_000_000
+
+        if not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            cache = _cache()
+            key = f'refdata:response:{digest}'
+            data = cache.get(key)
+            if data is not None:
+                response = Response(data)
+            else:
+                response = handler(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                cache.set(key, response.data, getattr(settings, 'REFERENCE_CACHE_TIMEOUT', 3600))
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # Browsers must revalidate, which is a 304 while nothing changed
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class ConditionalDetailMixin:
+    """
+    ETag/Last-Modified for retrieve, checked before the object is serialized.
+
+    One values_list query reads ``etag_timestamp_field`` and, for each
+    ``etag_dependencies`` entry ({relation path: timestamp field}), the latest
+    related timestamp and the related row count, so renamed tenants or added
+    and removed child rows change the ETag as well.
+    """
+
+    etag_timestamp_field = 'updated_at'
+    etag_dependencies = {}
+
+    def retrieve(self, request, *args, **kwargs):
+        state = self._detail_state()
+        if state is None:
+            # Not found or filtered out: let the regular path answer
+            return super().retrieve(request, *args, **kwargs)
+
+        digest = hashlib.md5(
+            f'{self.get_serializer_class().__name__}|{state!r}|{request.accepted_renderer.format}'.encode()
+        ).hexdigest()
+        etag = f'W/{quote_etag(digest)}'
+        timestamps = [value for value in state if isinstance(value, datetime)]
+        last_modified = int(max(timestamps).timestamp()) if timestamps else None
+
+        if last_modified is not None and not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().retrieve(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def _detail_state(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).order_by()
+
+        fields = [self.etag_timestamp_field]
+        annotations = {}
+        for index, (path, timestamp_field) in enumerate(self.etag_dependencies.items()):
+            annotations[f'_etag_latest_{index}'] = Max(f'{path}__{timestamp_field}')
+            annotations[f'_etag_count_{index}'] = Count(path, distinct=True)
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset.values_list(*fields, *annotations).first()
@@ -0,0 +1,59 @@
+"""
+Read replica routing.
+
+Writes and ordinary reads always go to ``default``. Code running inside
+``read_from_replica()`` (or a view decorated with ``@reads_from_replica``)
+reads from the ``replica`` alias instead, when one is configured. Reports
+tolerate replication lag; posting services never opt in, so they always see
+the primary.
+"""
+
+import contextvars
+import functools
+from contextlib import contextmanager
+from django.conf import settings
+
+REPLICA_ALIAS = 'replica'
+
+_use_replica = contextvars.ContextVar('use_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def read_from_replica():
+    """Route reads made inside the block to the replica"""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def reads_from_replica(func):
+    """Run a read-only view or report against the replica"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with read_from_replica():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_configured():
+            return REPLICA_ALIAS
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema through replication
+        return db == 'default'
@@ -0,0 +1,56 @@
+import json
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from erp_system.apps.core.profiling import buffer
+from erp_system.apps.maintenance.services import MaintenanceAmortizationService
+from erp_system.apps.property.services import LeaseRevenueRecognitionService, UnitStatusService
+
+
+class Command(BaseCommand):
+    help = 'Run the month-end jobs under the service profiler and print a hot-path report'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=str, help='Run date in YYYY-MM-DD format')
+        parser.add_argument('--dry-run', action='store_true', help='Roll back everything the jobs wrote')
+        parser.add_argument('--sample-rate', type=float, default=1.0,
+                            help='Share of top-level calls captured with cProfile')
+        parser.add_argument('--show-profile', action='store_true', help='Print the sampled cProfile output')
+        parser.add_argument('--output', type=str, help='Write the report as JSON to this file')
+
+    def handle(self, *args, **options):
+        run_date = timezone.now().date()
+        if options.get('date'):
+            run_date = timezone.datetime.strptime(options['date'], '%Y-%m-%d').date()
+
+        settings.PROFILING_ENABLED = True
+        settings.PROFILING_SAMPLE_RATE = options['sample_rate']
+        buffer.clear()
+
+        with transaction.atomic():
+            LeaseRevenueRecognitionService.run_monthly_recognition(run_date=run_date)
+            MaintenanceAmortizationService.run_monthly_amortization(run_date=run_date)
+            UnitStatusService.project()
+            if options['dry_run']:
+                transaction.set_rollback(True)
+
+        report = buffer.report()
+        self.stdout.write(f"{'operation':<70}{'calls':>7}{'total ms':>12}{'p95 ms':>10}{'queries':>9}{'rows':>9}")
+        for item in report:
+            self.stdout.write(
+                f"{item['name']:<70}{item['calls']:>7}{item['total_ms']:>12.1f}{item['p95_ms']:>10.1f}"
+                f"{item['queries_avg']:>9.1f}{item['rows_written_avg']:>9.1f}"
+            )
+            if item['last_exception']:
+                self.stdout.write(self.style.WARNING(f"    last exception: {item['last_exception']}"))
+            if options['show_profile'] and item['sampled_profile']:
+                self.stdout.write(item['sampled_profile'])
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({'run_date': run_date.isoformat(), 'operations': report}, fh, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+
+        outcome = 'rolled back' if options['dry_run'] else 'committed'
+        self.stdout.write(self.style.SUCCESS(f'Month-end jobs for {run_date} profiled ({outcome}).'))
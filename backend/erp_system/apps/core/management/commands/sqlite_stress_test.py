@@ -0,0 +1,135 @@
+import statistics
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.utils import timezone
+from erp_system.apps.accounts.models import JournalLine
+from erp_system.apps.core.metrics import percentile
+from erp_system.apps.core.sqlite import pragma_status
+from erp_system.apps.property.models import Lease
+from erp_system.apps.property.services import LeaseRevenueRecognitionService
+
+MODES = ('default', 'performance')
+
+
+class Command(BaseCommand):
+    help = (
+        'Run report readers against the month-end recognition writer on SQLite, with the '
+        'default journal and in performance mode (the writer is rolled back unless --commit)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=MODES + ('both',), default='both')
+        parser.add_argument('--readers', type=int, default=4, help='Concurrent reader threads')
+        parser.add_argument('--hold', type=float, default=3.0,
+                            help='Seconds the writer keeps its transaction open after the run')
+        parser.add_argument('--date', type=str, help='Recognition run date in YYYY-MM-DD format')
+        parser.add_argument('--commit', action='store_true', help='Commit the recognition run')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The stress test only applies to the SQLite backend.')
+        if not Lease.objects.filter(status='active').exists():
+            raise CommandError('No active leases found; run generate_load_data first.')
+
+        self.run_date = timezone.now().date()
+        if options.get('date'):
+            self.run_date = timezone.datetime.strptime(options['date'], '%Y-%m-%d').date()
+        self.since = self.run_date - timedelta(days=90)
+
+        enabled = getattr(settings, 'SQLITE_PERFORMANCE_MODE', False)
+        modes = MODES if options['mode'] == 'both' else (options['mode'],)
+        self.stdout.write(f"{'mode':<13}{'journal':>9}{'reads':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}"
+                          f"{'max ms':>9}{'writer s':>10}")
+        try:
+            for mode in modes:
+                result = self._run(mode, options)
+                self.stdout.write(
+                    f"{mode:<13}{result['journal_mode']:>9}{result['reads']:>7}{result['errors']:>8}"
+                    f"{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{result['max_ms']:>9.1f}"
+                    f"{result['writer_s']:>10.2f}"
+                )
+                if result['writer_error']:
+                    self.stdout.write(self.style.WARNING(f"    writer failed: {result['writer_error']}"))
+        finally:
+            # Leave the database file in the configured mode
+            self._switch(enabled)
+
+        if options['commit']:
+            self.stdout.write('Recognition run committed.')
+
+    def _switch(self, performance):
+        """Reconnect with or without the performance pragmas"""
+        settings.SQLITE_PERFORMANCE_MODE = performance
+        connections.close_all()
+        if not performance:
+            # journal_mode is stored in the database file, so switch it back explicitly
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode = DELETE')
+
+    def _run(self, mode, options):
+        self._switch(mode == 'performance')
+        journal_mode = pragma_status(connection)['journal_mode']
+        connections.close_all()
+
+        writer_started = threading.Event()
+        writer_done = threading.Event()
+        state = {'latencies': [], 'errors': 0, 'writer_s': 0.0, 'writer_error': None}
+        lock = threading.Lock()
+
+        def writer():
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    writer_started.set()
+                    LeaseRevenueRecognitionService.run_monthly_recognition(run_date=self.run_date)
+                    time.sleep(options['hold'])
+                    if not options['commit']:
+                        transaction.set_rollback(True)
+            except OperationalError as exc:
+                state['writer_error'] = str(exc)
+            finally:
+                state['writer_s'] = time.perf_counter() - started
+                writer_started.set()
+                writer_done.set()
+                connection.close()
+
+        def reader():
+            writer_started.wait()
+            try:
+                while not writer_done.is_set():
+                    started = time.perf_counter()
+                    try:
+                        list(JournalLine.objects.filter(journal_entry__entry_date__gte=self.since)
+                             .order_by('-id').values('account_id', 'debit', 'credit')[:200])
+                        list(Lease.objects.filter(status='active').values('id', 'monthly_rent')[:200])
+                    except OperationalError:
+                        with lock:
+                            state['errors'] += 1
+                        continue
+                    with lock:
+                        state['latencies'].append((time.perf_counter() - started) * 1000)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(max(options['readers'], 1))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies = sorted(state['latencies'])
+        return {
+            'journal_mode': journal_mode,
+            'reads': len(latencies),
+            'errors': state['errors'],
+            'p50_ms': statistics.median(latencies) if latencies else 0.0,
+            'p95_ms': percentile(latencies, 0.95),
+            'max_ms': latencies[-1] if latencies else 0.0,
+            'writer_s': state['writer_s'],
+            'writer_error': state['writer_error'],
+        }
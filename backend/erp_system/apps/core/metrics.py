@@ -0,0 +1,136 @@
+"""
+In-process request metrics: per-endpoint latency percentiles, SQL query
+counts, DB time and duplicate (N+1) query detection.
+
+Numbers are kept per worker process in bounded buffers, so the overhead per
+request is a few dictionary updates and the memory use is fixed.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, deque
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def query_signature(sql):
+    """Normalize SQL so the same statement with different parameters maps to one signature"""
+    return _WHITESPACE.sub(' ', _IN_LIST.sub('IN (...)', sql)).strip()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class QueryCollector:
+    """connection.execute_wrapper that records the queries of a single request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.signatures = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.signatures[query_signature(sql)] += 1
+
+    def duplicates(self, threshold):
+        """Signatures executed at least ``threshold`` times (typical N+1 pattern)"""
+        return {sql: count for sql, count in self.signatures.items() if count >= threshold}
+
+
+class EndpointStats:
+    def __init__(self, sample_size):
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=sample_size)
+        self.queries = 0
+        self.max_queries = 0
+        self.db_time = 0.0
+        self.duplicate_requests = 0
+        self.duplicate_signatures = Counter()
+
+    def snapshot(self):
+        latencies = sorted(self.latencies)
+        requests = max(self.requests, 1)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'latency_ms': {
+                'p50': round(percentile(latencies, 0.50) * 1000, 2),
+                'p90': round(percentile(latencies, 0.90) * 1000, 2),
+                'p99': round(percentile(latencies, 0.99) * 1000, 2),
+                'max': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            },
+            'queries_avg': round(self.queries / requests, 2),
+            'queries_max': self.max_queries,
+            'db_time_ms_avg': round(self.db_time / requests * 1000, 2),
+            'duplicate_query_requests': self.duplicate_requests,
+            'top_duplicates': [
+                {'sql': sql, 'max_repeats': count}
+                for sql, count in self.duplicate_signatures.most_common(5)
+            ],
+        }
+
+
+class MetricsRegistry:
+    MAX_ENDPOINTS = 500
+
+    def __init__(self, sample_size=1000):
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.started_at = time.time()
+
+    def record(self, endpoint, status_code, duration, collector, duplicates):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                if len(self._endpoints) >= self.MAX_ENDPOINTS:
+                    endpoint = 'other'
+                    stats = self._endpoints.get(endpoint)
+                if stats is None:
+                    stats = self._endpoints[endpoint] = EndpointStats(self.sample_size)
+            stats.requests += 1
+            if status_code >= 500:
+                stats.errors += 1
+            stats.latencies.append(duration)
+            stats.queries += collector.count
+            stats.max_queries = max(stats.max_queries, collector.count)
+            stats.db_time += collector.duration
+            if duplicates:
+                stats.duplicate_requests += 1
+                for sql, count in duplicates.items():
+                    if count > stats.duplicate_signatures[sql]:
+                        stats.duplicate_signatures[sql] = count
+                # Keep only the worst offenders per endpoint
+                if len(stats.duplicate_signatures) > 20:
+                    stats.duplicate_signatures = Counter(dict(stats.duplicate_signatures.most_common(20)))
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {name: stats.snapshot() for name, stats in self._endpoints.items()}
+        return {
+            'since': self.started_at,
+            'endpoints': dict(sorted(
+                endpoints.items(), key=lambda item: item[1]['latency_ms']['p90'], reverse=True
+            )),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+            self.started_at = time.time()
+
+
+registry = MetricsRegistry()
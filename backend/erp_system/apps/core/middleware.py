@@ -0,0 +1,71 @@
+import logging
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from .metrics import QueryCollector, registry
+
+logger = logging.getLogger(__name__)
+
+
+def _endpoint(request):
+    match = getattr(request, 'resolver_match', None)
+    name = match.view_name if match and match.view_name else 'unresolved'
+    return f'{request.method} {name}'
+
+
+def measure(request, get_response, duplicate_threshold=None):
+    """
+    Call get_response(request) and record its latency and queries under the
+    request's endpoint. Returns (response, collector, duration). Also used
+    for batched sub-requests, which do not pass through the middleware.
+    """
+    if duplicate_threshold is None:
+        duplicate_threshold = getattr(settings, 'METRICS_DUPLICATE_QUERY_THRESHOLD', 5)
+    collector = QueryCollector()
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(collector))
+        response = get_response(request)
+    duration = time.perf_counter() - started
+
+    endpoint = _endpoint(request)
+    duplicates = collector.duplicates(duplicate_threshold)
+    if duplicates:
+        worst_sql, worst_count = max(duplicates.items(), key=lambda item: item[1])
+        logger.warning(
+            'Duplicate queries on %s: %s query executed %d times (%d queries total)',
+            endpoint, worst_sql[:200], worst_count, collector.count,
+        )
+    registry.record(endpoint, response.status_code, duration, collector, duplicates)
+    return response, collector, duration
+
+
+class QueryMetricsMiddleware:
+    """
+    Records latency, SQL query count, DB time and duplicate queries for every
+    request and optionally reports them in a Server-Timing header.
+
+    Controlled by METRICS_ENABLED, METRICS_SERVER_TIMING and
+    METRICS_DUPLICATE_QUERY_THRESHOLD.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        self.server_timing = getattr(settings, 'METRICS_SERVER_TIMING', False)
+        self.duplicate_threshold = getattr(settings, 'METRICS_DUPLICATE_QUERY_THRESHOLD', 5)
+        registry.sample_size = getattr(settings, 'METRICS_SAMPLE_SIZE', registry.sample_size)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        response, collector, duration = measure(request, self.get_response, self.duplicate_threshold)
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'db;dur={collector.duration * 1000:.1f};desc="{collector.count} queries", '
+                f'total;dur={duration * 1000:.1f}'
+            )
+        return response
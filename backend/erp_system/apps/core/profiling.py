@@ -0,0 +1,168 @@
+"""
+Lightweight profiling for service-layer operations.
+
+Decorate a service method with ``@profiled`` to record each call's duration,
+query count, rows written and exception into an in-memory ring buffer.
+A configurable share of calls is additionally captured with cProfile.
+
+Settings: PROFILING_ENABLED, PROFILING_BUFFER_SIZE, PROFILING_SAMPLE_RATE.
+"""
+
+import cProfile
+import functools
+import io
+import pstats
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from .metrics import percentile
+
+_WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class _CallCollector:
+    """execute_wrapper counting the queries and written rows of one profiled call"""
+
+    def __init__(self):
+        self.queries = 0
+        self.rows_written = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        self.queries += 1
+        statement = sql.lstrip()[:6].upper()
+        if statement.startswith(_WRITE_PREFIXES):
+            if many:
+                self.rows_written += len(params)
+            elif statement == 'INSERT':
+                # rowcount is not reliable for INSERT ... RETURNING on every backend
+                self.rows_written += sql.count('), (') + 1
+            else:
+                self.rows_written += max(context['cursor'].rowcount, 0)
+        return result
+
+
+class ProfileBuffer:
+    def __init__(self, size=2000):
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=size)
+        self._local = threading.local()
+
+    @property
+    def depth(self):
+        return getattr(self._local, 'depth', 0)
+
+    @depth.setter
+    def depth(self, value):
+        self._local.depth = value
+
+    def add(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def records(self, name=None):
+        with self._lock:
+            records = list(self._records)
+        return [record for record in records if name is None or record['name'] == name]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def report(self):
+        """Aggregate the buffered calls per operation, slowest total time first"""
+        grouped = defaultdict(list)
+        for record in self.records():
+            grouped[record['name']].append(record)
+
+        report = []
+        for name, records in grouped.items():
+            durations = sorted(record['duration_ms'] for record in records)
+            calls = len(records)
+            report.append({
+                'name': name,
+                'calls': calls,
+                'errors': sum(1 for record in records if record['exception']),
+                'total_ms': round(sum(durations), 2),
+                'avg_ms': round(sum(durations) / calls, 2),
+                'p95_ms': round(percentile(durations, 0.95), 2),
+                'max_ms': round(durations[-1], 2),
+                'queries_avg': round(sum(record['queries'] for record in records) / calls, 2),
+                'rows_written_avg': round(sum(record['rows_written'] for record in records) / calls, 2),
+                'last_exception': next(
+                    (record['exception'] for record in reversed(records) if record['exception']), None
+                ),
+                'sampled_profile': next(
+                    (record['profile'] for record in reversed(records) if record['profile']), None
+                ),
+            })
+        return sorted(report, key=lambda item: item['total_ms'], reverse=True)
+
+
+buffer = ProfileBuffer(getattr(settings, 'PROFILING_BUFFER_SIZE', 2000))
+
+
+def _profile_text(profiler, limit=25):
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
+
+
+def profiled(func=None, *, name=None):
+    """Record duration, queries, rows written and exceptions of every call"""
+    if func is None:
+        return functools.partial(profiled, name=name)
+
+    # Prefix with the app label: several apps define a ReceiptVoucherService
+    operation = name or f"{func.__module__.split('.')[-2]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not getattr(settings, 'PROFILING_ENABLED', True):
+            return func(*args, **kwargs)
+
+        collector = _CallCollector()
+        depth = buffer.depth
+        # cProfile cannot nest, so only top-level calls are sampled
+        profiler = None
+        if depth == 0 and random.random() < getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0):
+            profiler = cProfile.Profile()
+
+        exception = None
+        buffer.depth = depth + 1
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            started = time.perf_counter()
+            try:
+                if profiler:
+                    try:
+                        profiler.enable()
+                    except ValueError:
+                        # Another profiler (debugger, coverage) is already active
+                        profiler = None
+                return func(*args, **kwargs)
+            except Exception as exc:
+                exception = f'{type(exc).__name__}: {exc}'
+                raise
+            finally:
+                if profiler:
+                    profiler.disable()
+                duration = time.perf_counter() - started
+                buffer.depth = depth
+                buffer.add({
+                    'name': operation,
+                    'started_at': time.time() - duration,
+                    'duration_ms': round(duration * 1000, 3),
+                    'queries': collector.queries,
+                    'rows_written': collector.rows_written,
+                    'exception': exception,
+                    'depth': depth,
+                    'profile': _profile_text(profiler) if profiler else None,
+                })
+
+    return wrapper
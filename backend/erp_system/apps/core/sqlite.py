@@ -0,0 +1,49 @@
+"""
+SQLite performance mode.
+
+With the default rollback journal a writer needs an exclusive lock to commit,
+so a long month-end run and the readers around it block each other and
+surface as "database is locked". In WAL mode readers keep reading the last
+committed snapshot while a single writer appends to the log.
+
+Applied to every new SQLite connection through ``connection_created`` when
+SQLITE_PERFORMANCE_MODE is on (off by default: switching a database file to
+WAL is persistent). Settings: SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHE_SIZE_KB,
+SQLITE_MMAP_SIZE.
+"""
+
+from django.conf import settings
+
+
+def performance_pragmas():
+    return [
+        # Persistent on the database file; readers no longer block on the writer
+        ('journal_mode', 'WAL'),
+        # Durable across application crashes; WAL only syncs at checkpoints
+        ('synchronous', 'NORMAL'),
+        # Wait for the write lock instead of failing immediately
+        ('busy_timeout', getattr(settings, 'SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        # Negative values are KiB rather than pages
+        ('cache_size', -getattr(settings, 'SQLITE_CACHE_SIZE_KB', 65536)),
+        ('mmap_size', getattr(settings, 'SQLITE_MMAP_SIZE', 268435456)),
+        ('temp_store', 'MEMORY'),
+    ]
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """connection_created receiver applying the performance pragmas"""
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_PERFORMANCE_MODE', False):
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in performance_pragmas():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+def pragma_status(connection):
+    """Current values of the tuned pragmas on a connection"""
+    status = {}
+    with connection.cursor() as cursor:
+        for pragma, _ in performance_pragmas():
+            cursor.execute(f'PRAGMA {pragma}')
+            status[pragma] = cursor.fetchone()[0]
+    return status
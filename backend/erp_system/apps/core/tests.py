@@ -0,0 +1,81 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from erp_system.apps.accounts.models import ChequeRegister
+from .metrics import registry
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class BatchViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='batch', password='batch')
+        cls.token = Token.objects.create(user=cls.user)
+        cls.cheque = ChequeRegister.objects.create(
+            cheque_type='incoming', cheque_number='000777', cheque_date=date(2026, 2, 1), amount=Decimal('250.00')
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.url = f'/api/accounts/cheque-registers/{self.cheque.pk}/'
+
+    def batch(self, *items):
+        response = self.client.post('/api/batch/', {'requests': list(items)}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data['responses']
+
+    def test_sub_requests_run_as_the_batch_user(self):
+        [result] = self.batch({'path': self.url})
+        self.assertEqual(result['status'], 200)
+        self.assertEqual(result['data']['cheque_number'], '000777')
+
+        self.client.credentials()
+        response = self.client.post('/api/batch/', {'requests': [{'path': self.url}]}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+        self.client.force_login(self.user)
+        [result] = self.batch({'path': self.url})
+        self.assertEqual(result['status'], 200)
+
+    def test_items_revalidate_with_their_own_etag(self):
+        [first] = self.batch({'path': self.url})
+        etag = first['headers']['ETag']
+
+        fresh, stale = self.batch(
+            {'path': self.url, 'headers': {'If-None-Match': etag}},
+            {'path': self.url, 'headers': {'If-None-Match': '"stale"'}},
+        )
+        self.assertEqual(fresh['status'], 304)
+        self.assertEqual(fresh['headers']['ETag'], etag)
+        self.assertEqual(stale['status'], 200)
+
+    def test_nested_batches_and_non_get_items_are_rejected(self):
+        nested, posted, missing, ok = self.batch(
+            {'path': '/api/batch/'},
+            {'path': self.url, 'method': 'POST'},
+            {'path': '/api/no-such-endpoint/'},
+            self.url,
+        )
+        self.assertEqual(nested['status'], 400)
+        self.assertEqual(posted['status'], 405)
+        self.assertEqual(missing['status'], 404)
+        self.assertEqual(ok['status'], 200)
+
+    def test_sub_requests_are_recorded_in_metrics(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.batch({'path': self.url}, {'path': self.url})
+
+        endpoints = registry.snapshot()['endpoints']
+        sub_requests = [stats for name, stats in endpoints.items() if name.startswith('GET ')]
+        self.assertEqual([stats['requests'] for stats in sub_requests], [2])
+        self.assertEqual(endpoints['POST batch']['requests'], 1)
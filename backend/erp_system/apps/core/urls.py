@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('metrics/', views.metrics_view, name='metrics'),
+    path('metrics/profile/', views.profile_view, name='metrics-profile'),
+    path('batch/', views.batch_view, name='batch'),
+]
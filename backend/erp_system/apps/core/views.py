@@ -0,0 +1,55 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from . import batch
+from .metrics import registry
+from .profiling import buffer
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    """
+    Per-endpoint latency and query metrics of this worker process.
+    DELETE resets the counters.
+    """
+    if request.method == 'DELETE':
+        registry.reset()
+    return Response(registry.snapshot())
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def profile_view(request):
+    """
+    Service-layer call statistics from the profiling ring buffer of this
+    worker process. DELETE clears the buffer.
+    """
+    if request.method == 'DELETE':
+        buffer.clear()
+    return Response({'operations': buffer.report()})
+
+
+@api_view(['POST'])
+def batch_view(request):
+    """
+    Execute several GET requests in one round trip.
+
+    POST {"requests": [{"path": "/api/accounts/accounts/?page_size=100"},
+                       {"path": "/api/property/units/", "headers": {"If-None-Match": "..."}}]}
+    returns {"responses": [{"status": 200, "data": {...}, "headers": {...}}, ...]}
+    in request order. Paths may omit the /api prefix. At most
+    BATCH_MAX_REQUESTS sub-requests are accepted.
+    """
+    items = request.data.get('requests') if isinstance(request.data, dict) else request.data
+    if not isinstance(items, list) or not items:
+        return Response({'error': 'requests must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+    max_requests = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+    if len(items) > max_requests:
+        return Response(
+            {'error': f'At most {max_requests} requests can be batched.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response({'responses': [batch.execute(request, item, request.path) for item in items]})
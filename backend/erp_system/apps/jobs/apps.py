@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'erp_system.apps.jobs'
+
+    def ready(self):
+        from . import handlers  # noqa: F401 -- imported for its @register side effects
@@ -0,0 +1,155 @@
+"""
+Built-in background jobs: month-end recognition and amortization, general
+ledger exports and portfolio imports.
+"""
+
+import csv
+import io
+import tempfile
+from datetime import datetime
+from django.core.files import File
+from django.core.files.storage import default_storage
+from erp_system.apps.accounts.models import JournalLine
+from erp_system.apps.core.db_router import read_from_replica
+from erp_system.apps.maintenance.services import MaintenanceAmortizationService
+from erp_system.apps.property.services import LeaseRevenueRecognitionService, PortfolioImportService
+from .registry import register
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be in YYYY-MM-DD format.')
+
+
+def _clean_run_date(params):
+    run_date = params.get('run_date')
+    if run_date:
+        _parse_date(run_date, 'run_date')
+    return {'run_date': run_date} if run_date else {}
+
+
+@register('revenue_recognition', 'Monthly lease revenue recognition', clean=_clean_run_date, staff_only=True)
+def revenue_recognition(progress, run_date=None):
+    entries = LeaseRevenueRecognitionService.run_monthly_recognition(
+        run_date=_parse_date(run_date, 'run_date') if run_date else None,
+        progress=progress,
+    )
+    return {'entries_posted': len(entries)}
+
+
+@register('maintenance_amortization', 'Monthly maintenance amortization', clean=_clean_run_date, staff_only=True)
+def maintenance_amortization(progress, run_date=None):
+    MaintenanceAmortizationService.run_monthly_amortization(
+        run_date=_parse_date(run_date, 'run_date') if run_date else None,
+        progress=progress,
+    )
+    return {'contracts_processed': progress.total or 0}
+
+
+GENERAL_LEDGER_FILTERS = ('account_id', 'start_date', 'end_date', 'entry_type', 'reference_type')
+
+
+def _clean_general_ledger(params):
+    cleaned = {name: str(params[name]) for name in GENERAL_LEDGER_FILTERS if params.get(name)}
+    for name in ('start_date', 'end_date'):
+        if name in cleaned:
+            _parse_date(cleaned[name], name)
+    if 'account_id' in cleaned and not cleaned['account_id'].isdigit():
+        raise ValueError('account_id must be an integer.')
+    return cleaned
+
+
+@register('general_ledger_export', 'General ledger CSV export', clean=_clean_general_ledger)
+def general_ledger_export(progress, account_id=None, start_date=None, end_date=None,
+                          entry_type=None, reference_type=None):
+    lines = JournalLine.objects.select_related('journal_entry', 'account', 'cost_center')
+    if account_id:
+        lines = lines.filter(account_id=account_id)
+    if start_date:
+        lines = lines.filter(journal_entry__entry_date__gte=start_date)
+    if end_date:
+        lines = lines.filter(journal_entry__entry_date__lte=end_date)
+    if entry_type:
+        lines = lines.filter(journal_entry__entry_type=entry_type)
+    if reference_type:
+        lines = lines.filter(reference_type=reference_type)
+    lines = lines.order_by('journal_entry__entry_date', 'id')
+
+    # Spooled locally and stored in one save(), so any storage backend works and
+    # a cancelled or failed export leaves no truncated file behind
+    written = 0
+    with tempfile.TemporaryFile() as buffer:
+        fh = io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+        with read_from_replica():
+            total = lines.count()
+            progress(0, total)
+            writer = csv.writer(fh)
+            writer.writerow([
+                'entry_id', 'entry_date', 'entry_type', 'reference_type', 'reference_id',
+                'account_number', 'account_name', 'debit', 'credit', 'cost_center',
+            ])
+            for line in lines.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                writer.writerow([
+                    line.journal_entry_id,
+                    line.journal_entry.entry_date.isoformat(),
+                    line.journal_entry.entry_type,
+                    line.reference_type,
+                    line.reference_id,
+                    line.account.account_number,
+                    line.account.account_name,
+                    line.debit,
+                    line.credit,
+                    line.cost_center.code if line.cost_center else '',
+                ])
+                written += 1
+                if written % EXPORT_CHUNK_SIZE == 0:
+                    progress(written, total)
+        fh.flush()
+        fh.detach()
+        buffer.seek(0)
+        name = default_storage.save(f'exports/general-ledger-job-{progress.job_id}.csv', File(buffer))
+    progress(written, total)
+    return {'file': name, 'rows': written}
+
+
+def _clean_portfolio_import(params):
+    if params.get('kind') not in PortfolioImportService.KINDS:
+        raise ValueError(f"kind must be one of: {', '.join(PortfolioImportService.KINDS)}.")
+    return {'kind': params['kind'], 'file': params.get('file')}
+
+
+def _count_rows(file_obj, name):
+    """Data rows in the file, for percent complete"""
+    if name.lower().endswith(('.xlsx', '.xlsm')):
+        try:
+            import openpyxl
+        except ImportError:
+            # read_rows reports the missing dependency
+            return 0
+        workbook = openpyxl.load_workbook(file_obj, read_only=True)
+        try:
+            return max((workbook.active.max_row or 1) - 1, 0)
+        finally:
+            workbook.close()
+    return max(sum(1 for _ in file_obj) - 1, 0)
+
+
+@register('portfolio_import', 'Portfolio import (properties, units, tenants)',
+          clean=_clean_portfolio_import, accepts_file=True)
+def portfolio_import(progress, kind, file):
+    with default_storage.open(file, 'rb') as fh:
+        total = _count_rows(fh, file)
+        fh.seek(0)
+        progress(0, total)
+        result = PortfolioImportService.run(
+            kind,
+            PortfolioImportService.read_rows(fh, file),
+            on_chunk=lambda state: progress(state['rows'], max(total, state['rows'])),
+        )
+    # Failed imports keep the upload so the job can be inspected or re-run
+    default_storage.delete(file)
+    return result
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from erp_system.apps.jobs.services import JobService
+
+
+class Command(BaseCommand):
+    help = 'Delete finished jobs and their export/upload files after the retention period (run daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, help='Keep jobs finished within this many days (default JOBS_RETENTION_DAYS)'
+        )
+
+    def handle(self, *args, **options):
+        days = options.get('days')
+        if days is None:
+            days = settings.JOBS_RETENTION_DAYS
+        if days < 0:
+            raise CommandError('--days must not be negative.')
+        pruned = JobService.prune(days)
+        self.stdout.write(self.style.SUCCESS(f'Pruned {pruned} job(s) finished more than {days} day(s) ago.'))
@@ -0,0 +1,41 @@
+import os
+import signal
+import socket
+import threading
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from erp_system.apps.jobs.services import JobService
+
+
+class Command(BaseCommand):
+    help = 'Process queued background jobs (start several processes for parallel workers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+        parser.add_argument('--max-jobs', type=int, help='Exit after this many jobs')
+        parser.add_argument('--kinds', nargs='+', help='Only run jobs of these kinds')
+        parser.add_argument('--poll-interval', type=float, help='Seconds between polls of an empty queue')
+        parser.add_argument('--name', type=str, help='Worker name (defaults to host:pid)')
+
+    def handle(self, *args, **options):
+        worker = options.get('name') or f'{socket.gethostname()}:{os.getpid()}'
+        poll_interval = None if options['once'] else (options.get('poll_interval') or settings.JOBS_POLL_INTERVAL)
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            # Finish the current job, then exit
+            self.stdout.write(f'Worker {worker} stopping after the current job.')
+            stop.set()
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        self.stdout.write(f'Worker {worker} started.')
+        processed = JobService.work(
+            worker,
+            kinds=options.get('kinds'),
+            max_jobs=options.get('max_jobs'),
+            poll_interval=poll_interval,
+            stop=stop,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker} processed {processed} job(s).'))
@@ -0,0 +1,50 @@
+"""
+Job handler registry.
+
+A handler is a function ``handler(progress, **params)`` returning a JSON
+serializable result. ``progress(done, total)`` reports progress and raises
+JobCancelled once cancellation was requested, so handlers should call it
+between units of work (and services accept it as a plain callback).
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+class JobCancelled(Exception):
+    """Raised from the progress callback of a job whose cancellation was requested"""
+
+
+@dataclass(frozen=True)
+class JobType:
+    kind: str
+    label: str
+    handler: Callable
+    clean: Optional[Callable] = None
+    staff_only: bool = False
+    accepts_file: bool = False
+
+
+_job_types = {}
+
+
+def register(kind, label, clean=None, staff_only=False, accepts_file=False):
+    """
+    Register a job handler.
+
+    ``clean(params)`` validates and normalizes the enqueue parameters and
+    raises ValueError for invalid input. ``accepts_file`` jobs receive the
+    uploaded file as ``params['file']`` (a storage name).
+    """
+    def decorator(handler):
+        _job_types[kind] = JobType(kind, label, handler, clean, staff_only, accepts_file)
+        return handler
+    return decorator
+
+
+def get_job_type(kind):
+    return _job_types.get(kind)
+
+
+def job_types():
+    return list(_job_types.values())
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+from .models import Job
+from .services import JobService
+
+
+class JobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+    created_by_username = serializers.CharField(source='created_by.username', read_only=True, default=None)
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'kind', 'status', 'params', 'result', 'error', 'progress',
+            'attempts', 'worker', 'created_by', 'created_by_username',
+            'created_at', 'started_at', 'finished_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj):
+        return JobService.progress(obj)
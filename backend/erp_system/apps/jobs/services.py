@@ -0,0 +1,275 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from .models import Job
+from .registry import JobCancelled, get_job_type
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _progress_key(job_id):
+    return f'jobs:progress:{job_id}'
+
+
+def _cancel_key(job_id):
+    return f'jobs:cancel:{job_id}'
+
+
+def _heartbeat_key(job_id):
+    return f'jobs:heartbeat:{job_id}'
+
+
+class JobProgress:
+    """
+    Progress callback handed to job handlers.
+
+    A running job usually holds a write transaction (recognition posts the
+    whole month atomically), so progress and cancellation go through the
+    shared cache instead of the job row, which is only written when the job
+    finishes. Cache writes are throttled to JOBS_PROGRESS_INTERVAL seconds.
+    """
+
+    def __init__(self, job):
+        self.job_id = job.id
+        self.done = 0
+        self.total = None
+        self.interval = _setting('JOBS_PROGRESS_INTERVAL', 1.0)
+        self._last_report = None
+
+    def __call__(self, done, total=None):
+        self.done = done
+        if total is not None:
+            self.total = total
+        now = time.monotonic()
+        if self._last_report is not None and now - self._last_report < self.interval and done != self.total:
+            return
+        self._last_report = now
+        self.report()
+
+    def report(self):
+        cache.set(_progress_key(self.job_id), {
+            'done': self.done,
+            'total': self.total,
+            'reported_at': time.time(),
+        }, timeout=_setting('JOBS_STATE_TTL', 86400))
+        if cache.get(_cancel_key(self.job_id)):
+            raise JobCancelled()
+
+
+class _Heartbeat(threading.Thread):
+    """Marks a job alive while its handler runs, so stale-job recovery can tell crashed workers apart"""
+
+    def __init__(self, job_id):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.stopped = threading.Event()
+
+    def run(self):
+        interval = _setting('JOBS_HEARTBEAT_INTERVAL', 15)
+        while True:
+            cache.set(_heartbeat_key(self.job_id), time.time(), timeout=_setting('JOBS_STATE_TTL', 86400))
+            if self.stopped.wait(interval):
+                return
+
+
+class JobService:
+    """Database-backed job queue: enqueue, claim, run, cancel and recover jobs"""
+
+    @staticmethod
+    def enqueue(kind, params=None, user=None):
+        job_type = get_job_type(kind)
+        if not job_type:
+            raise ValueError(f"Unknown job kind '{kind}'.")
+        params = dict(params or {})
+        if job_type.clean:
+            params = job_type.clean(params)
+        return Job.objects.create(
+            kind=kind,
+            params=params,
+            created_by=user if user and user.is_authenticated else None,
+        )
+
+    @staticmethod
+    def claim_next(worker, kinds=None):
+        """
+        Atomically take the oldest queued job. The conditional UPDATE makes
+        concurrent workers safe without row locks, so SQLite works as well.
+        """
+        queued = Job.objects.filter(status='queued')
+        if kinds:
+            queued = queued.filter(kind__in=kinds)
+        for job_id in queued.order_by('created_at', 'id').values_list('id', flat=True)[:10]:
+            now = timezone.now()
+            claimed = Job.objects.filter(id=job_id, status='queued').update(
+                status='running',
+                worker=worker,
+                attempts=F('attempts') + 1,
+                started_at=now,
+                updated_at=now,
+            )
+            if claimed:
+                return Job.objects.get(id=job_id)
+        return None
+
+    @staticmethod
+    def run(job):
+        job_type = get_job_type(job.kind)
+        progress = JobProgress(job)
+        heartbeat = _Heartbeat(job.id)
+        heartbeat.start()
+        try:
+            if not job_type:
+                raise ValueError(f"No handler registered for job kind '{job.kind}'.")
+            progress.report()
+            result = job_type.handler(progress, **job.params)
+        except JobCancelled:
+            job.status = 'cancelled'
+            job.cancel_requested = True
+        except Exception as exc:
+            logger.exception('Job %s (%s) failed', job.id, job.kind)
+            job.status = 'failed'
+            job.error = f'{type(exc).__name__}: {exc}'
+        else:
+            job.status = 'succeeded'
+            job.result = result
+            if progress.total is not None:
+                progress.done = progress.total
+        finally:
+            heartbeat.stopped.set()
+
+        job.progress_done = progress.done
+        job.progress_total = progress.total
+        job.finished_at = timezone.now()
+        job.save()
+        cache.delete_many([_progress_key(job.id), _heartbeat_key(job.id), _cancel_key(job.id)])
+        return job
+
+    @staticmethod
+    def cancel(job):
+        """Cancel a queued job right away; ask a running one to stop at its next progress report"""
+        now = timezone.now()
+        if Job.objects.filter(id=job.id, status='queued').update(
+            status='cancelled', cancel_requested=True, finished_at=now, updated_at=now
+        ):
+            job.refresh_from_db()
+            return job
+        if job.status == 'running':
+            # Not written to the row: the worker may hold a write lock until it finishes
+            cache.set(_cancel_key(job.id), True, timeout=_setting('JOBS_STATE_TTL', 86400))
+        return job
+
+    @staticmethod
+    def recover_stale():
+        """
+        Requeue running jobs whose worker stopped sending heartbeats, or fail
+        them once JOBS_MAX_ATTEMPTS is reached. Returns the affected job ids.
+        """
+        stale_after = _setting('JOBS_STALE_AFTER', 120)
+        cutoff = timezone.now() - timedelta(seconds=stale_after)
+        recovered = []
+        for job in Job.objects.filter(status='running', started_at__lt=cutoff):
+            beat = cache.get(_heartbeat_key(job.id))
+            if beat and time.time() - beat < stale_after:
+                continue
+            now = timezone.now()
+            if job.attempts < _setting('JOBS_MAX_ATTEMPTS', 3):
+                changes = {'status': 'queued', 'worker': '', 'started_at': None}
+            else:
+                changes = {'status': 'failed', 'error': 'Worker stopped responding.', 'finished_at': now}
+            if Job.objects.filter(id=job.id, status='running', worker=job.worker).update(updated_at=now, **changes):
+                logger.warning('Job %s (%s) from worker %s marked %s', job.id, job.kind, job.worker, changes['status'])
+                recovered.append(job.id)
+        return recovered
+
+    @staticmethod
+    def files(job):
+        """Storage names a job owns: its export and an upload a failed import kept"""
+        names = [(job.result or {}).get('file'), (job.params or {}).get('file')]
+        return [name for name in names if isinstance(name, str) and name]
+
+    @staticmethod
+    def prune(days=None):
+        """
+        Delete jobs finished more than ``days`` (JOBS_RETENTION_DAYS) ago
+        together with their files. Returns the number of jobs deleted.
+        """
+        days = _setting('JOBS_RETENTION_DAYS', 30) if days is None else days
+        cutoff = timezone.now() - timedelta(days=days)
+        jobs = Job.objects.filter(status__in=Job.FINISHED_STATUSES, finished_at__lt=cutoff)
+        pruned = 0
+        for job in jobs.only('id', 'params', 'result').iterator():
+            for name in JobService.files(job):
+                default_storage.delete(name)
+            job.delete()
+            pruned += 1
+        return pruned
+
+    @staticmethod
+    def work(worker, kinds=None, max_jobs=None, poll_interval=None, stop=None):
+        """Claim and run jobs until ``stop`` is set, ``max_jobs`` ran or (with poll_interval None) the queue is empty"""
+        processed = 0
+        while not (stop and stop.is_set()):
+            close_old_connections()
+            JobService.recover_stale()
+            job = JobService.claim_next(worker, kinds)
+            if not job:
+                if poll_interval is None:
+                    break
+                if stop:
+                    stop.wait(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+                continue
+            logger.info('Worker %s running job %s (%s)', worker, job.id, job.kind)
+            JobService.run(job)
+            processed += 1
+            if max_jobs and processed >= max_jobs:
+                break
+        return processed
+
+    @staticmethod
+    def progress(job):
+        """Progress, percent complete, throughput and ETA of a job"""
+        done, total = job.progress_done, job.progress_total
+        if job.status == 'running':
+            live = cache.get(_progress_key(job.id))
+            if live:
+                done, total = live['done'], live['total']
+
+        elapsed = None
+        if job.started_at:
+            elapsed = ((job.finished_at or timezone.now()) - job.started_at).total_seconds()
+        throughput = round(done / elapsed, 2) if elapsed and done else 0.0
+
+        percent = None
+        if total:
+            percent = round(min(done / total, 1) * 100, 1)
+        elif job.status == 'succeeded':
+            percent = 100.0
+
+        eta = None
+        if job.status == 'running' and total and throughput:
+            eta = round(max(total - done, 0) / throughput, 1)
+
+        return {
+            'done': done,
+            'total': total,
+            'percent_complete': percent,
+            'elapsed_seconds': round(elapsed, 1) if elapsed is not None else None,
+            'throughput_per_second': throughput,
+            'eta_seconds': eta,
+            'cancel_requested': job.cancel_requested or bool(
+                job.status == 'running' and cache.get(_cancel_key(job.id))
+            ),
+        }
@@ -0,0 +1,91 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from erp_system.apps.accounts.models import Account, CostCenter, JournalEntry, JournalLine
+from .models import Job
+from .services import JobService
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class JobFileTests(TestCase):
+    """Exports and uploads go through default_storage and are removed with their job"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='jobs', password='jobs', is_staff=True)
+        cost_center = CostCenter.objects.create(code='CC-JOBS', name='Jobs')
+        cash = Account.objects.create(account_number='1000', account_name='Cash', account_type='asset')
+        equity = Account.objects.create(account_number='3000', account_name='Capital', account_type='equity')
+        entry = JournalEntry.objects.create(entry_type='manual', reference_type='manual_journal', reference_id=1)
+        for account, debit, credit in [(cash, Decimal('10.00'), Decimal('0')), (equity, Decimal('0'), Decimal('10.00'))]:
+            JournalLine.objects.create(
+                journal_entry=entry, account=account, debit=debit, credit=credit, cost_center=cost_center,
+                reference_type='manual_journal', reference_id=1,
+            )
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def run_queue(self):
+        JobService.work('test-worker')
+
+    def test_export_is_stored_downloadable_and_pruned(self):
+        job = JobService.enqueue('general_ledger_export', user=self.user)
+        self.run_queue()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded', job.error)
+        self.assertEqual(job.result['rows'], 2)
+        self.assertTrue(default_storage.exists(job.result['file']))
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(f'/api/jobs/{job.pk}/download/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content).decode().count('\n'), 3)
+
+        self.assertEqual(JobService.prune(days=30), 0)
+        Job.objects.filter(pk=job.pk).update(finished_at=timezone.now() - timedelta(days=31))
+        self.assertEqual(JobService.prune(days=30), 1)
+        self.assertFalse(Job.objects.filter(pk=job.pk).exists())
+        self.assertFalse(default_storage.exists(job.result['file']))
+
+    def test_prune_removes_upload_kept_by_failed_import(self):
+        name = default_storage.save('job_uploads/units.csv', ContentFile(b'property_id,unit_number\n'))
+        job = Job.objects.create(
+            kind='portfolio_import', status='failed', params={'kind': 'units', 'file': name},
+            finished_at=timezone.now() - timedelta(days=60),
+        )
+        running = Job.objects.create(kind='general_ledger_export', status='running')
+
+        self.assertEqual(JobService.prune(days=30), 1)
+        self.assertFalse(Job.objects.filter(pk=job.pk).exists())
+        self.assertFalse(default_storage.exists(name))
+        self.assertTrue(Job.objects.filter(pk=running.pk).exists())
+
+    def test_portfolio_import_reads_upload_from_storage(self):
+        name = default_storage.save(
+            'job_uploads/properties.csv',
+            ContentFile(b'property_id,name,property_type,street_address,city,state,country,acquisition_date\n'
+                        b'JOB-P1,Job Tower,residential,1 Queue Street,Dubai,N/A,UAE,2020-01-01\n'),
+        )
+        job = JobService.enqueue('portfolio_import', {'kind': 'properties', 'file': name}, user=self.user)
+        self.run_queue()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded', job.error)
+        self.assertEqual(job.result['created'], 1)
+        self.assertFalse(default_storage.exists(name))
@@ -0,0 +1,107 @@
+import json
+import os
+import uuid
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from .models import Job
+from .registry import get_job_type, job_types
+from .serializers import JobSerializer
+from .services import JobService
+
+
+class JobPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class JobViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Background jobs.
+
+    POST /api/jobs/ {"kind": "revenue_recognition", "params": {"run_date": "2026-01-31"}}
+    enqueues a job and returns it with 202; file jobs take multipart data
+    with "kind", "file" and "params" as a JSON string. Workers are started
+    with ``manage.py run_job_worker``; ``manage.py prune_jobs`` removes
+    finished jobs and their files after JOBS_RETENTION_DAYS.
+    """
+    queryset = Job.objects.select_related('created_by')
+    serializer_class = JobSerializer
+    pagination_class = JobPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['status', 'kind']
+    ordering_fields = ['created_at', 'started_at', 'finished_at']
+    ordering = ['-created_at']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(created_by=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        kind = request.data.get('kind')
+        job_type = get_job_type(kind)
+        if not job_type:
+            return Response({'error': f"Unknown job kind '{kind}'."}, status=status.HTTP_400_BAD_REQUEST)
+        if job_type.staff_only and not request.user.is_staff:
+            return Response({'detail': 'Not authorized.'}, status=status.HTTP_403_FORBIDDEN)
+
+        params = request.data.get('params') or {}
+        if isinstance(params, str):
+            try:
+                params = json.loads(params)
+            except ValueError:
+                return Response({'error': 'params must be a JSON object.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(params, dict):
+            return Response({'error': 'params must be a JSON object.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if job_type.accepts_file:
+            upload = request.FILES.get('file')
+            if not upload:
+                return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+            params['file'] = default_storage.save(
+                f'job_uploads/{uuid.uuid4().hex}-{os.path.basename(upload.name)}', upload
+            )
+
+        try:
+            job = JobService.enqueue(kind, params, user=request.user)
+        except ValueError as exc:
+            if job_type.accepts_file:
+                default_storage.delete(params['file'])
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'])
+    def kinds(self, request):
+        """Job kinds that can be enqueued"""
+        return Response([
+            {'kind': job_type.kind, 'label': job_type.label, 'staff_only': job_type.staff_only,
+             'accepts_file': job_type.accepts_file}
+            for job_type in job_types()
+        ])
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        job = self.get_object()
+        if job.status in Job.FINISHED_STATUSES:
+            return Response(
+                {'error': f'Job is already {job.status}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        job = JobService.cancel(job)
+        return Response(self.get_serializer(job).data)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Download the file produced by an export job"""
+        job = self.get_object()
+        name = (job.result or {}).get('file') if job.status == 'succeeded' else None
+        if not name or not default_storage.exists(name):
+            return Response({'error': 'This job has no file to download.'}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(default_storage.open(name, 'rb'), as_attachment=True, filename=os.path.basename(name))
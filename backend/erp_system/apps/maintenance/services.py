@@ -2,7 +2,9 @@ from decimal import Decimal, ROUND_HALF_UP
 from django.db import transaction
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from erp_system.apps.core.profiling import profiled
 from erp_system.apps.accounts.models import CostCenter, JournalEntry, JournalLine
+from erp_system.apps.accounts.services import CostCenterProvisioningService
 from erp_system.apps.property.models import Unit, Property
 from .models import MaintenanceRequest, MaintenanceContract
 
@@ -10,15 +12,7 @@ from .models import MaintenanceRequest, MaintenanceContract
 class MaintenanceRequestService:
     @staticmethod
     def _get_or_create_cost_center_for_unit(unit: Unit) -> CostCenter:
-        if unit.cost_center:
-            return unit.cost_center
-        cost_center = CostCenter.objects.create(
-            code=f"UNIT-{unit.id}",
-            name=f"Unit {unit.unit_number}",
-        )
-        unit.cost_center = cost_center
-        unit.save(update_fields=['cost_center'])
-        return cost_center
+        return CostCenterProvisioningService.for_unit(unit)
 
     @staticmethod
     def create_request(data, user):
@@ -44,21 +38,9 @@ class MaintenanceRequestService:
 class MaintenanceContractService:
     @staticmethod
     def _get_or_create_cost_center(unit: Unit, property_obj: Property) -> CostCenter:
-        if unit and unit.cost_center:
-            return unit.cost_center
         if unit:
-            cost_center = CostCenter.objects.create(
-                code=f"UNIT-{unit.id}",
-                name=f"Unit {unit.unit_number}",
-            )
-            unit.cost_center = cost_center
-            unit.save(update_fields=['cost_center'])
-            return cost_center
-        cost_center = CostCenter.objects.create(
-            code=f"PROP-{property_obj.id}",
-            name=f"Property {property_obj.name}",
-        )
-        return cost_center
+            return CostCenterProvisioningService.for_unit(unit)
+        return CostCenterProvisioningService.for_property(property_obj)
 
     @staticmethod
     def _calculate_duration_months(start_date, end_date) -> int:
@@ -70,6 +52,7 @@ class MaintenanceContractService:
         return max(months, 1)
 
     @staticmethod
+    @profiled
     def create_contract(data):
         unit = data.get('unit')
         property_obj = data.get('property')
@@ -108,11 +91,12 @@ class MaintenanceContractService:
         with transaction.atomic():
             if contract.status != 'active':
                 contract.status = 'active'
-                contract.save(update_fields=['status'])
+                contract.save(update_fields=['status', 'updated_at'])
             MaintenanceContractService.post_prepaid_entry(contract)
         return contract
 
     @staticmethod
+    @profiled
     def post_prepaid_entry(contract: MaintenanceContract):
         existing = JournalEntry.objects.filter(
             reference_type='maintenance_contract',
@@ -154,7 +138,14 @@ class MaintenanceContractService:
 
 class MaintenanceAmortizationService:
     @staticmethod
-    def run_monthly_amortization(run_date=None):
+    @profiled
+    def run_monthly_amortization(run_date=None, progress=None):
+        """
+        Amortize the month's share of every active contract, one transaction
+        per contract. ``progress(done, total)`` is called before each contract
+        and at the end; an exception it raises stops the run after the last
+        committed contract.
+        """
         run_date = run_date or timezone.now().date()
         period = f"{run_date.year:04d}-{run_date.month:02d}"
 
@@ -163,8 +154,11 @@ class MaintenanceAmortizationService:
             start_date__lte=run_date,
             end_date__gte=run_date,
         )
+        total = contracts.count() if progress else None
 
-        for contract in contracts:
+        for index, contract in enumerate(contracts, start=1):
+            if progress:
+                progress(index - 1, total)
             existing = JournalEntry.objects.filter(
                 reference_type='maintenance_contract',
                 reference_id=contract.id,
@@ -179,7 +173,7 @@ class MaintenanceAmortizationService:
             remaining = (contract.total_amount - contract.amortized_amount).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
             if remaining <= Decimal('0.00'):
                 contract.status = 'completed'
-                contract.save(update_fields=['status'])
+                contract.save(update_fields=['status', 'updated_at'])
                 continue
 
             amount = monthly_amount if remaining >= monthly_amount else remaining
@@ -214,6 +208,9 @@ class MaintenanceAmortizationService:
                 contract.amortized_amount = (contract.amortized_amount + amount).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
                 if contract.amortized_amount >= contract.total_amount:
                     contract.status = 'completed'
-                    contract.save(update_fields=['amortized_amount', 'status'])
+                    contract.save(update_fields=['amortized_amount', 'status', 'updated_at'])
                 else:
-                    contract.save(update_fields=['amortized_amount'])
+                    contract.save(update_fields=['amortized_amount', 'updated_at'])
+
+        if progress:
+            progress(total, total)
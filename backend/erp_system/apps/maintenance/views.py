@@ -1,6 +1,7 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from erp_system.apps.core.caching import ConditionalDetailMixin
 from rest_framework.permissions import IsAuthenticated
 from .models import MaintenanceRequest, MaintenanceContract
 from .serializers import MaintenanceRequestSerializer, MaintenanceContractSerializer
@@ -15,9 +16,10 @@ class MaintenanceRequestPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class MaintenanceRequestViewSet(viewsets.ModelViewSet):
+class MaintenanceRequestViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = MaintenanceRequest.objects.all()
     serializer_class = MaintenanceRequestSerializer
+    etag_dependencies = {'property': 'updated_at', 'unit': 'updated_at'}
     permission_classes = [IsAuthenticated]
     pagination_class = MaintenanceRequestPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -35,9 +37,10 @@ class MaintenanceRequestViewSet(viewsets.ModelViewSet):
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
 
-class MaintenanceContractViewSet(viewsets.ModelViewSet):
+class MaintenanceContractViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = MaintenanceContract.objects.all()
     serializer_class = MaintenanceContractSerializer
+    etag_dependencies = {'property': 'updated_at', 'unit': 'updated_at', 'supplier': 'updated_at'}
     permission_classes = [IsAuthenticated]
     pagination_class = MaintenanceRequestPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
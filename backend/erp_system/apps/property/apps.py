@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class PropertyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'erp_system.apps.property'
+
+    def ready(self):
+        from erp_system.apps.core.caching import track_model
+        from .models import Tenant
+        from .services import DashboardService
+        # Dashboard KPIs and tenant autocomplete results are cached under the versions of these models
+        for model in (*DashboardService.SOURCE_MODELS, Tenant):
+            track_model(model)
@@ -0,0 +1,530 @@
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from erp_system.apps.accounts.models import Account, ChequeRegister, JournalEntry, TransactionAccountMapping
+from erp_system.apps.accounts.services import CostCenterProvisioningService, post_journal_entries
+from erp_system.apps.maintenance.models import MaintenanceContract
+from erp_system.apps.property.models import Property, Unit, Tenant, Lease
+from erp_system.apps.purchase.models import SupplierInvoice
+from erp_system.apps.sales.models import ReceiptVoucher, CustomerInvoice
+from erp_system.apps.search.services import SearchIndexService
+
+# Chart of accounts used by the generated documents (same numbers as seed_accounts)
+ACCOUNTS = {
+    '1000': ('Prepaid Maintenance Expense', 'asset'),
+    '1100': ('Tenant Receivable (Customer Account)', 'asset'),
+    '1200': ('Cash on Hand', 'asset'),
+    '1210': ('Bank Account', 'asset'),
+    '1230': ('Cheques Received', 'asset'),
+    '2000': ('Maintenance Supplier Payable', 'liability'),
+    '2100': ('Unearned Lease Revenue', 'liability'),
+    '2200': ('Refundable Security Deposits', 'liability'),
+    '2300': ('Tax Payable (VAT/GST)', 'liability'),
+    '2400': ('Supplier Payable', 'liability'),
+    '4000': ('Lease Revenue / Rent Income', 'income'),
+    '4005': ('Service Income', 'income'),
+    '6000': ('Maintenance Expense', 'expense'),
+    '6200': ('Property Utilities', 'expense'),
+    '6300': ('Property Taxes & Insurance', 'expense'),
+}
+
+MAPPINGS = {
+    'lease_creation': ('1100', '2100'),
+    'receipt_voucher': ('1210', '1100'),
+    'customer_invoice': ('1100', '4005'),
+    'supplier_invoice': ('6200', '2400'),
+    'payment_voucher': ('2400', '1210'),
+    'revenue_recognition': ('2100', '4000'),
+    'maintenance_request': ('6000', '2000'),
+}
+
+PAYMENT_METHODS = ['cash', 'bank', 'cheque', 'post_dated_cheque']
+PAYMENT_WEIGHTS = [20, 40, 25, 15]
+TAX_RATE = Decimal('5.00')
+
+
+def _add_months(day, months):
+    month_index = day.month - 1 + months
+    return date(day.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def _line(account, cost_center, reference_type, reference_id, debit=Decimal('0.00'), credit=Decimal('0.00')):
+    return {
+        'account': account,
+        'debit': debit,
+        'credit': credit,
+        'cost_center': cost_center,
+        'reference_type': reference_type,
+        'reference_id': reference_id,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic large portfolio with several years of posted history for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', type=str, default='LOAD', help='Namespace for generated identifiers')
+        parser.add_argument('--properties', type=int, default=100)
+        parser.add_argument('--units-per-property', type=int, default=50)
+        parser.add_argument('--occupancy', type=float, default=0.9, help='Share of units with an active lease')
+        parser.add_argument('--months', type=int, default=36, help='Months of posted history before the current month')
+        parser.add_argument('--invoice-share', type=float, default=0.5, help='Share of lease-months with a service invoice')
+        parser.add_argument('--suppliers', type=int, default=50)
+        parser.add_argument('--supplier-invoices-per-month', type=int, default=200)
+        parser.add_argument('--contracts', type=int, default=200, help='Maintenance contracts')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        if Property.objects.filter(property_id__startswith=f'{self.prefix}-').exists():
+            raise CommandError(f"Load data with prefix '{self.prefix}' already exists; use another --prefix.")
+
+        today = timezone.now().date()
+        self.history_start = _add_months(today.replace(day=1), -options['months'])
+        self.periods = [_add_months(self.history_start, offset) for offset in range(options['months'])]
+        self.line_count = 0
+
+        self.accounts = self._ensure_accounts()
+        properties = self._create_properties(options['properties'])
+        units = self._create_units(properties, options['units_per_property'])
+        leased_units = self.rng.sample(units, int(len(units) * options['occupancy']))
+        tenants = self._create_tenants(leased_units)
+        suppliers = self._create_suppliers(options['suppliers'])
+        leases = self._create_leases(leased_units, tenants, options['months'])
+        self.stdout.write(
+            f'{len(properties)} properties, {len(units)} units, {len(tenants)} tenants, {len(leases)} leases'
+        )
+
+        self.numbers = {
+            'receipt': self._next_number(ReceiptVoucher, 'receipt_number'),
+            'customer_invoice': self._next_number(CustomerInvoice, 'invoice_number'),
+            'supplier_invoice': self._next_number(SupplierInvoice, 'invoice_number'),
+        }
+        for period in self.periods:
+            with transaction.atomic():
+                self._generate_month(period, leases, suppliers, units, options)
+            self.stdout.write(f'{period:%Y-%m}: {self.line_count} journal lines so far')
+
+        self._create_contracts(options['contracts'], properties, units, suppliers)
+
+        # Everything above is bulk-inserted without post_save, so index in one pass per kind
+        SearchIndexService.rebuild(progress=lambda kind, count: self.stdout.write(f'Indexed {count} {kind} documents'))
+        self.stdout.write(self.style.SUCCESS(f'Load data generated ({self.line_count} journal lines).'))
+
+    def _money(self, low, high, step=1):
+        return Decimal(self.rng.randrange(low, high + 1, step)).quantize(Decimal('0.01'))
+
+    def _next_number(self, model, field):
+        last = model.objects.order_by('-id').values_list(field, flat=True).first()
+        try:
+            return int(last.split('-')[-1]) + 1
+        except (AttributeError, ValueError, IndexError):
+            return 1
+
+    def _take_number(self, kind):
+        number = self.numbers[kind]
+        self.numbers[kind] += 1
+        return number
+
+    def _ensure_accounts(self):
+        accounts = {}
+        for number, (name, account_type) in ACCOUNTS.items():
+            accounts[number], _ = Account.objects.get_or_create(
+                account_number=number,
+                defaults={'account_name': name, 'account_type': account_type},
+            )
+        for transaction_type, (debit, credit) in MAPPINGS.items():
+            TransactionAccountMapping.objects.get_or_create(
+                transaction_type=transaction_type,
+                defaults={'debit_account': accounts[debit], 'credit_account': accounts[credit]},
+            )
+        return accounts
+
+    def _create_properties(self, count):
+        properties = [
+            Property(
+                property_id=f'{self.prefix}-P{index:05d}',
+                name=f'{self.prefix.title()} Property {index}',
+                property_type=self.rng.choice(['residential', 'commercial', 'mixed']),
+                street_address=f'{index} Benchmark Street',
+                city=self.rng.choice(['Dubai', 'Abu Dhabi', 'Sharjah', 'Doha', 'Riyadh']),
+                state='N/A',
+                country='UAE',
+                acquisition_date=self.history_start - timedelta(days=self.rng.randrange(0, 3650)),
+            )
+            for index in range(1, count + 1)
+        ]
+        return Property.objects.bulk_create(properties)
+
+    def _create_units(self, properties, per_property):
+        units = Unit.objects.bulk_create([
+            Unit(
+                property=prop,
+                unit_number=f'{number:04d}',
+                unit_type=self.rng.choice(['Studio', '1BR', '2BR', '3BR', 'Shop', 'Office']),
+                area=self._money(30, 400),
+                bedrooms=self.rng.randrange(0, 4),
+                bathrooms=self.rng.randrange(1, 4),
+                monthly_rent=self._money(800, 6000, 50),
+            )
+            for prop in properties
+            for number in range(1, per_property + 1)
+        ])
+        CostCenterProvisioningService.provision_units(units)
+        return units
+
+    def _create_tenants(self, units):
+        tenants = [
+            Tenant(
+                unit=unit,
+                first_name=f'Tenant{index}',
+                last_name=self.prefix.title(),
+                email=f'{self.prefix.lower()}.tenant{index}@example.com',
+                phone=f'+9715{index:08d}',
+                move_in_date=self.history_start,
+                ledger_account=self.accounts['1100'],
+            )
+            for index, unit in enumerate(units, start=1)
+        ]
+        tenants = Tenant.objects.bulk_create(self._with_name_keys(tenants))
+        CostCenterProvisioningService.provision_tenants(tenants)
+        Unit.objects.filter(pk__in=[unit.pk for unit in units]).update(status='occupied')
+        return tenants
+
+    def _create_suppliers(self, count):
+        suppliers = [
+            Tenant(
+                first_name=f'Supplier{index}',
+                last_name=self.prefix.title(),
+                email=f'{self.prefix.lower()}.supplier{index}@example.com',
+                phone=f'+9714{index:08d}',
+                move_in_date=self.history_start,
+                ledger_account_type='supplier',
+                ledger_account=self.accounts['2400'],
+            )
+            for index in range(1, count + 1)
+        ]
+        suppliers = Tenant.objects.bulk_create(self._with_name_keys(suppliers))
+        CostCenterProvisioningService.provision_tenants(suppliers)
+        return suppliers
+
+    @staticmethod
+    def _with_name_keys(tenants):
+        # bulk_create bypasses Tenant.save(), which fills the autocomplete keys
+        for tenant in tenants:
+            tenant.refresh_name_keys()
+        return tenants
+
+    def _create_leases(self, units, tenants, months):
+        accounts = self.accounts
+        end_date = _add_months(self.history_start, months + 12) - timedelta(days=1)
+        leases = Lease.objects.bulk_create([
+            Lease(
+                lease_number=f'{self.prefix}-L{index:06d}',
+                unit=unit,
+                tenant=tenant,
+                start_date=self.history_start,
+                end_date=end_date,
+                monthly_rent=unit.monthly_rent,
+                security_deposit=unit.monthly_rent * 2,
+                status='active',
+                cost_center=unit.cost_center,
+                unearned_revenue_account=accounts['2100'],
+                rental_income_account=accounts['4000'],
+                refundable_deposit_account=accounts['2200'],
+                accounting_posted=True,
+            )
+            for index, (unit, tenant) in enumerate(zip(units, tenants), start=1)
+        ])
+
+        entries = post_journal_entries([
+            {
+                'entry_type': 'prepaid',
+                'reference_type': 'lease',
+                'reference_id': lease.id,
+                'description': f'Lease {lease.lease_number} creation - Tenant receivable',
+                'lines': [
+                    _line(accounts['1100'], lease.cost_center, 'lease', lease.id,
+                          debit=lease.security_deposit + lease.monthly_rent),
+                    _line(accounts['2100'], lease.cost_center, 'lease', lease.id, credit=lease.monthly_rent),
+                    _line(accounts['2200'], lease.cost_center, 'lease', lease.id, credit=lease.security_deposit),
+                ],
+            }
+            for lease in leases
+        ])
+        self.line_count += 3 * len(entries)
+        self._date_entries({self.history_start: [entry.pk for entry in entries]})
+        return leases
+
+    def _date_entries(self, ids_by_date):
+        """entry_date is auto_now_add, so backdate generated entries after the insert"""
+        for entry_date, ids in ids_by_date.items():
+            for offset in range(0, len(ids), 5000):
+                JournalEntry.objects.filter(pk__in=ids[offset:offset + 5000]).update(entry_date=entry_date)
+
+    def _generate_month(self, period, leases, suppliers, units, options):
+        rng = self.rng
+        accounts = self.accounts
+        period_key = f'{period:%Y-%m}'
+        is_last_period = period == self.periods[-1]
+        ids_by_date = defaultdict(list)
+
+        recognition = post_journal_entries([
+            {
+                'entry_type': 'revenue_recognition',
+                'reference_type': 'lease',
+                'reference_id': lease.id,
+                'period': period_key,
+                'description': f'Revenue recognition {period_key} - Lease {lease.lease_number}',
+                'lines': [
+                    _line(accounts['2100'], lease.cost_center, 'lease', lease.id, debit=lease.monthly_rent),
+                    _line(accounts['4000'], lease.cost_center, 'lease', lease.id, credit=lease.monthly_rent),
+                ],
+            }
+            for lease in leases
+        ])
+        ids_by_date[period].extend(entry.pk for entry in recognition)
+        self.line_count += 2 * len(recognition)
+
+        receipts = ReceiptVoucher.objects.bulk_create([
+            ReceiptVoucher(
+                receipt_number=f"RV-{self._take_number('receipt'):05d}",
+                tenant_id=lease.tenant_id,
+                lease=lease,
+                payment_date=period.replace(day=rng.randrange(1, 29)),
+                amount=lease.monthly_rent,
+                payment_method=rng.choices(PAYMENT_METHODS, PAYMENT_WEIGHTS)[0],
+                status='submitted',
+                tenant_account=accounts['1100'],
+                cost_center=lease.cost_center,
+                accounting_posted=True,
+            )
+            for lease in leases
+        ])
+        debit_accounts = {'cash': accounts['1200'], 'bank': accounts['1210']}
+        receipt_entries = post_journal_entries([
+            {
+                'entry_type': 'receipt',
+                'reference_type': 'receipt_voucher',
+                'reference_id': receipt.id,
+                'description': f'Receipt {receipt.receipt_number}',
+                'lines': [
+                    _line(debit_accounts.get(receipt.payment_method, accounts['1230']), receipt.cost_center,
+                          'receipt_voucher', receipt.id, debit=receipt.amount),
+                    _line(accounts['1100'], receipt.cost_center, 'receipt_voucher', receipt.id, credit=receipt.amount),
+                ],
+            }
+            for receipt in receipts
+        ])
+        for receipt, entry in zip(receipts, receipt_entries):
+            ids_by_date[receipt.payment_date].append(entry.pk)
+        self.line_count += 2 * len(receipt_entries)
+
+        cheques = ChequeRegister.objects.bulk_create([
+            ChequeRegister(
+                cheque_type='incoming',
+                cheque_number=f'{self.prefix}-{receipt.receipt_number}',
+                cheque_date=receipt.payment_date,
+                amount=receipt.amount,
+                bank_name='Benchmark Bank',
+                status='received' if is_last_period else 'cleared',
+                receipt_voucher=receipt,
+                cheques_received_account=accounts['1230'],
+                bank_account=accounts['1210'],
+                cost_center=receipt.cost_center,
+            )
+            for receipt in receipts
+            if receipt.payment_method in ('cheque', 'post_dated_cheque')
+        ])
+        cleared = [cheque for cheque in cheques if cheque.status == 'cleared']
+        cheque_entries = post_journal_entries([
+            {
+                'entry_type': 'cheque',
+                'reference_type': 'cheque_register',
+                'reference_id': cheque.id,
+                'description': f'Cheque cleared (incoming) {cheque.cheque_number}',
+                'lines': [
+                    _line(accounts['1210'], cheque.cost_center, 'cheque_register', cheque.id, debit=cheque.amount),
+                    _line(accounts['1230'], cheque.cost_center, 'cheque_register', cheque.id, credit=cheque.amount),
+                ],
+            }
+            for cheque in cleared
+        ])
+        for cheque, entry in zip(cleared, cheque_entries):
+            ids_by_date[min(cheque.cheque_date + timedelta(days=3), _add_months(period, 1))].append(entry.pk)
+        self.line_count += 2 * len(cheque_entries)
+
+        invoices = []
+        for lease in leases:
+            if rng.random() >= options['invoice_share']:
+                continue
+            amount = self._money(50, 500)
+            tax_amount = (amount * TAX_RATE / Decimal('100.00')).quantize(Decimal('0.01'))
+            invoices.append(CustomerInvoice(
+                invoice_number=f"CI-{self._take_number('customer_invoice'):05d}",
+                tenant_id=lease.tenant_id,
+                lease=lease,
+                invoice_date=period.replace(day=rng.randrange(1, 29)),
+                amount=amount,
+                is_taxable=True,
+                tax_rate=TAX_RATE,
+                tax_amount=tax_amount,
+                total_amount=amount + tax_amount,
+                income_account=accounts['4005'],
+                tax_account=accounts['2300'],
+                tenant_account=accounts['1100'],
+                cost_center=lease.cost_center,
+                status='submitted',
+                accounting_posted=True,
+            ))
+        invoices = CustomerInvoice.objects.bulk_create(invoices)
+        invoice_entries = post_journal_entries([
+            {
+                'entry_type': 'invoice',
+                'reference_type': 'customer_invoice',
+                'reference_id': invoice.id,
+                'description': f'Customer invoice {invoice.invoice_number}',
+                'lines': [
+                    _line(accounts['1100'], invoice.cost_center, 'customer_invoice', invoice.id,
+                          debit=invoice.total_amount),
+                    _line(accounts['4005'], invoice.cost_center, 'customer_invoice', invoice.id, credit=invoice.amount),
+                    _line(accounts['2300'], invoice.cost_center, 'customer_invoice', invoice.id,
+                          credit=invoice.tax_amount),
+                ],
+            }
+            for invoice in invoices
+        ])
+        for invoice, entry in zip(invoices, invoice_entries):
+            ids_by_date[invoice.invoice_date].append(entry.pk)
+        self.line_count += 3 * len(invoice_entries)
+
+        supplier_invoices = []
+        for _ in range(options['supplier_invoices_per_month'] if suppliers else 0):
+            amount = self._money(100, 20000)
+            tax_amount = (amount * TAX_RATE / Decimal('100.00')).quantize(Decimal('0.01'))
+            invoice_date = period.replace(day=rng.randrange(1, 29))
+            supplier_invoices.append(SupplierInvoice(
+                invoice_number=f"SI-{self._take_number('supplier_invoice'):05d}",
+                supplier=rng.choice(suppliers),
+                invoice_date=invoice_date,
+                due_date=invoice_date + timedelta(days=30),
+                amount=amount,
+                is_taxable=True,
+                tax_rate=TAX_RATE,
+                tax_amount=tax_amount,
+                total_amount=amount + tax_amount,
+                expense_account=accounts[rng.choice(['6000', '6200', '6300'])],
+                supplier_account=accounts['2400'],
+                tax_account=accounts['2300'],
+                cost_center=rng.choice(units).cost_center,
+                status='submitted',
+                accounting_posted=True,
+            ))
+        supplier_invoices = SupplierInvoice.objects.bulk_create(supplier_invoices)
+        supplier_entries = post_journal_entries([
+            {
+                'entry_type': 'invoice',
+                'reference_type': 'supplier_invoice',
+                'reference_id': invoice.id,
+                'description': f'Supplier invoice {invoice.invoice_number}',
+                'lines': [
+                    _line(invoice.expense_account, invoice.cost_center, 'supplier_invoice', invoice.id,
+                          debit=invoice.amount),
+                    _line(accounts['2300'], invoice.cost_center, 'supplier_invoice', invoice.id,
+                          debit=invoice.tax_amount),
+                    _line(accounts['2400'], invoice.cost_center, 'supplier_invoice', invoice.id,
+                          credit=invoice.total_amount),
+                ],
+            }
+            for invoice in supplier_invoices
+        ])
+        for invoice, entry in zip(supplier_invoices, supplier_entries):
+            ids_by_date[invoice.invoice_date].append(entry.pk)
+        self.line_count += 3 * len(supplier_entries)
+
+        self._date_entries(ids_by_date)
+
+    def _create_contracts(self, count, properties, units, suppliers):
+        if not count or not suppliers:
+            return
+        accounts = self.accounts
+        contracts = []
+        for _ in range(count):
+            unit = self.rng.choice(units)
+            start = self.rng.choice(self.periods)
+            duration = self.rng.choice([6, 12, 24])
+            total = self._money(1200, 60000, 12)
+            elapsed = min(duration, len([period for period in self.periods if period >= start]))
+            monthly = (total / Decimal(duration)).quantize(Decimal('0.01'))
+            amortized = total if elapsed == duration else monthly * elapsed
+            contracts.append(MaintenanceContract(
+                supplier=self.rng.choice(suppliers),
+                property_id=unit.property_id,
+                unit=unit,
+                cost_center=unit.cost_center,
+                start_date=start,
+                end_date=_add_months(start, duration) - timedelta(days=1),
+                total_amount=total,
+                duration_months=duration,
+                amortized_amount=amortized,
+                prepaid_account=accounts['1000'],
+                expense_account=accounts['6000'],
+                supplier_account=accounts['2000'],
+                status='completed' if elapsed == duration else 'active',
+            ))
+        contracts = MaintenanceContract.objects.bulk_create(contracts)
+
+        entries = []
+        ids_by_date = defaultdict(list)
+        dates = []
+        for contract in contracts:
+            entries.append({
+                'entry_type': 'prepaid',
+                'reference_type': 'maintenance_contract',
+                'reference_id': contract.id,
+                'description': f'Prepaid maintenance for contract {contract.id}',
+                'lines': [
+                    _line(accounts['1000'], contract.cost_center, 'maintenance_contract', contract.id,
+                          debit=contract.total_amount),
+                    _line(accounts['2000'], contract.cost_center, 'maintenance_contract', contract.id,
+                          credit=contract.total_amount),
+                ],
+            })
+            dates.append(contract.start_date)
+
+            monthly = (contract.total_amount / Decimal(contract.duration_months)).quantize(Decimal('0.01'))
+            remaining = contract.amortized_amount
+            for offset in range(contract.duration_months):
+                period = _add_months(contract.start_date, offset)
+                if remaining <= 0 or period not in self.periods:
+                    break
+                amount = min(monthly, remaining)
+                if offset == contract.duration_months - 1:
+                    amount = remaining
+                remaining -= amount
+                period_key = f'{period:%Y-%m}'
+                entries.append({
+                    'entry_type': 'amortization',
+                    'reference_type': 'maintenance_contract',
+                    'reference_id': contract.id,
+                    'period': period_key,
+                    'description': f'Maintenance amortization {period_key} for contract {contract.id}',
+                    'lines': [
+                        _line(accounts['6000'], contract.cost_center, 'maintenance_contract', contract.id,
+                              debit=amount),
+                        _line(accounts['1000'], contract.cost_center, 'maintenance_contract', contract.id,
+                              credit=amount),
+                    ],
+                })
+                dates.append(period)
+
+        with transaction.atomic():
+            for entry, entry_date in zip(post_journal_entries(entries), dates):
+                ids_by_date[entry_date].append(entry.pk)
+            self._date_entries(ids_by_date)
+        self.line_count += 2 * len(entries)
@@ -0,0 +1,67 @@
+import json
+import os
+from django.core.management.base import BaseCommand, CommandError
+from erp_system.apps.property.services import PortfolioImportService
+
+COUNTERS = ('rows', 'created', 'updated', 'unchanged', 'error_count')
+
+
+class Command(BaseCommand):
+    help = 'Bulk import properties, units or tenants from a CSV/XLSX file (resumable)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='CSV or XLSX file with a header row')
+        parser.add_argument('--kind', required=True, choices=PortfolioImportService.KINDS)
+        parser.add_argument('--chunk-size', type=int, default=PortfolioImportService.CHUNK_SIZE)
+        parser.add_argument('--checkpoint', type=str, help='Checkpoint file (defaults to <path>.<kind>.checkpoint.json)')
+        parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint and start over')
+
+    def handle(self, *args, **options):
+        path = os.path.abspath(options['path'])
+        kind = options['kind']
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+
+        checkpoint_path = options.get('checkpoint') or f'{path}.{kind}.checkpoint.json'
+        result = PortfolioImportService.new_result(kind)
+        skip_rows = 0
+        if os.path.exists(checkpoint_path) and not options['restart']:
+            with open(checkpoint_path) as fh:
+                checkpoint = json.load(fh)
+            if checkpoint.get('file') != path or checkpoint.get('kind') != kind:
+                raise CommandError(f'Checkpoint {checkpoint_path} belongs to another import; use --restart.')
+            skip_rows = checkpoint['rows']
+            result.update({name: checkpoint.get(name, 0) for name in COUNTERS})
+            self.stdout.write(f'Resuming after {skip_rows} row(s).')
+
+        def save_checkpoint(progress):
+            state = {name: progress[name] for name in COUNTERS}
+            state.update(kind=kind, file=path)
+            tmp_path = f'{checkpoint_path}.tmp'
+            with open(tmp_path, 'w') as fh:
+                json.dump(state, fh)
+            os.replace(tmp_path, checkpoint_path)
+            self.stdout.write(f"{progress['rows']} row(s) processed")
+
+        try:
+            with open(path, 'rb') as fh:
+                rows = PortfolioImportService.read_rows(fh, path)
+                PortfolioImportService.run(
+                    kind, rows,
+                    chunk_size=options['chunk_size'],
+                    skip_rows=skip_rows,
+                    result=result,
+                    on_chunk=save_checkpoint,
+                )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for error in result['errors'][:50]:
+            self.stdout.write(self.style.WARNING(f"Row {error['row']}: {'; '.join(error['errors'])}"))
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {kind}: {result['created']} created, {result['updated']} updated, "
+            f"{result['unchanged']} unchanged, "
+            f"{result['error_count']} row(s) rejected."
+        ))
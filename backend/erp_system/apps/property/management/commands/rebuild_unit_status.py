@@ -0,0 +1,13 @@
+from collections import Counter
+from django.core.management.base import BaseCommand
+from erp_system.apps.property.services import UnitStatusService
+
+
+class Command(BaseCommand):
+    help = 'Recompute unit status for the whole portfolio from active leases and open legal cases'
+
+    def handle(self, *args, **options):
+        changes = UnitStatusService.project()
+        for new_status, count in sorted(Counter(changes.values()).items()):
+            self.stdout.write(f"{count} unit(s) -> {new_status}")
+        self.stdout.write(self.style.SUCCESS(f'Unit status rebuilt ({len(changes)} unit(s) changed).'))
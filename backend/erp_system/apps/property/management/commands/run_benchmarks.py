@@ -0,0 +1,218 @@
+import json
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+from erp_system.apps.accounts.models import Account, ChequeRegister, JournalLine
+from erp_system.apps.accounts.services import ChequeRegisterService
+from erp_system.apps.maintenance.services import MaintenanceAmortizationService
+from erp_system.apps.property.models import Lease, Unit
+from erp_system.apps.property.services import LeaseService, LeaseRevenueRecognitionService
+from erp_system.apps.sales.models import ReceiptVoucher
+from erp_system.apps.sales.services import ReceiptVoucherService
+
+BENCHMARKS = [
+    'lease_creation',
+    'receipt_posting',
+    'cheque_clearing',
+    'monthly_recognition',
+    'maintenance_amortization',
+    'trial_balance',
+    'general_ledger',
+]
+
+
+class QueryCounter:
+    """execute_wrapper that counts queries (the test client clears connection.queries per request)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark posting and reporting hot paths against the generated load data (all writes are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='Run a subset of the benchmarks')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (median is reported)')
+        parser.add_argument('--batch', type=int, default=50, help='Documents per run for the posting benchmarks')
+        parser.add_argument('--output', type=str, help='Write JSON results to this file')
+        parser.add_argument('--baseline', type=str, help='JSON results of an earlier run to compare against')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Allowed relative wall time/memory regression against the baseline (0.25 = 25%%)')
+
+    def handle(self, *args, **options):
+        if not JournalLine.objects.exists():
+            raise CommandError('No journal history found; run generate_load_data first.')
+
+        self.batch = options['batch']
+        self.today = timezone.now().date()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.filter(is_superuser=True).first() or User(username='benchmark'))
+
+        results = {}
+        for name in options['only'] or BENCHMARKS:
+            results[name] = self._measure(getattr(self, f'bench_{name}'), options['repeat'])
+            self.stdout.write(
+                f"{name:<26} {results[name]['wall_ms']:>10.1f} ms {results[name]['queries']:>7} queries "
+                f"{results[name]['peak_memory_kb']:>10.0f} KB peak"
+            )
+
+        report = {
+            'generated_at': timezone.now().isoformat(),
+            'commit': self._commit(),
+            'database': connection.vendor,
+            'dataset': {
+                'journal_lines': JournalLine.objects.count(),
+                'active_leases': Lease.objects.filter(status='active').count(),
+                'units': Unit.objects.count(),
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options['baseline']:
+            self._compare(results, options['baseline'], options['threshold'])
+
+    def _measure(self, benchmark, repeat):
+        """
+        One instrumented run for queries and peak memory (which also warms the
+        caches), then the median wall time of ``repeat`` plain runs.
+        """
+        queries = QueryCounter()
+        tracemalloc.start()
+        try:
+            with transaction.atomic(), connection.execute_wrapper(queries):
+                benchmark()
+                transaction.set_rollback(True)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings = []
+        for _ in range(max(repeat, 1)):
+            with transaction.atomic():
+                started = time.perf_counter()
+                benchmark()
+                timings.append((time.perf_counter() - started) * 1000)
+                transaction.set_rollback(True)
+
+        return {
+            'wall_ms': round(statistics.median(timings), 2),
+            'wall_ms_runs': [round(timing, 2) for timing in timings],
+            'queries': queries.count,
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def _commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _compare(self, results, baseline_path, threshold):
+        with open(baseline_path) as fh:
+            baseline = json.load(fh).get('results', {})
+
+        regressions = []
+        for name, result in results.items():
+            previous = baseline.get(name)
+            if not previous:
+                continue
+            for metric in ('wall_ms', 'queries', 'peak_memory_kb'):
+                before, after = previous[metric], result[metric]
+                # Query counts are deterministic, so any increase counts
+                allowed = before if metric == 'queries' else before * (1 + threshold)
+                if before and after > allowed:
+                    regressions.append(f'{name}.{metric}: {before} -> {after} (+{(after / before - 1) * 100:.0f}%)')
+
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            raise CommandError(f'{len(regressions)} regression(s) above {threshold:.0%} against {baseline_path}.')
+        self.stdout.write(self.style.SUCCESS(f'No regressions above {threshold:.0%} against {baseline_path}.'))
+
+    def _accounts(self):
+        return {account.account_number: account for account in Account.objects.filter(
+            account_number__in=['1100', '1210', '2100', '2200', '4000']
+        )}
+
+    def bench_lease_creation(self):
+        accounts = self._accounts()
+        units = Unit.objects.filter(status='vacant').select_related('property', 'property__classification')
+        for unit in units[:self.batch]:
+            LeaseService.create_lease({
+                'lease_number': f'BENCH-{unit.id}',
+                'unit': unit,
+                'start_date': self.today,
+                'end_date': self.today + timedelta(days=364),
+                'monthly_rent': unit.monthly_rent or Decimal('1000.00'),
+                'security_deposit': (unit.monthly_rent or Decimal('1000.00')) * 2,
+                'status': 'active',
+                'rental_income_account': accounts['4000'],
+                'unearned_revenue_account': accounts['2100'],
+                'refundable_deposit_account': accounts['2200'],
+            })
+
+    def bench_receipt_posting(self):
+        accounts = self._accounts()
+        leases = Lease.objects.filter(status='active', tenant__isnull=False).select_related('tenant', 'tenant__unit')
+        for lease in leases[:self.batch]:
+            receipt = ReceiptVoucher.objects.create(
+                tenant=lease.tenant,
+                lease=lease,
+                payment_date=self.today,
+                amount=lease.monthly_rent,
+                payment_method='bank',
+                bank_account=accounts['1210'],
+                tenant_account=accounts['1100'],
+                cost_center=lease.cost_center,
+            )
+            ReceiptVoucherService.post_receipt_voucher(receipt)
+
+    def bench_cheque_clearing(self):
+        cheques = ChequeRegister.objects.filter(status='received', bank_account__isnull=False)
+        for cheque in cheques[:self.batch]:
+            ChequeRegisterService.mark_cleared(cheque)
+
+    def bench_monthly_recognition(self):
+        LeaseRevenueRecognitionService.run_monthly_recognition(run_date=self.today)
+
+    def bench_maintenance_amortization(self):
+        MaintenanceAmortizationService.run_monthly_amortization(run_date=self.today)
+
+    def _get(self, url, params):
+        response = self.client.get(url, params)
+        if response.status_code != 200:
+            raise CommandError(f'{url} returned HTTP {response.status_code}')
+        return response
+
+    def bench_trial_balance(self):
+        self._get('/api/accounts/journal-lines/trial_balance/', {
+            'start_date': (self.today - timedelta(days=3 * 365)).isoformat(),
+            'end_date': self.today.isoformat(),
+        })
+
+    def bench_general_ledger(self):
+        account = Account.objects.filter(account_number='1100').first()
+        self._get('/api/accounts/journal-lines/general_ledger/', {
+            'account_id': account.id if account else '',
+            'start_date': (self.today - timedelta(days=365)).isoformat(),
+            'end_date': self.today.isoformat(),
+        })
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_status_tracking(apps, schema_editor):
+    RentalLegalCase = apps.get_model('property', 'RentalLegalCase')
+    RentalLegalCaseStatusHistory = apps.get_model('property', 'RentalLegalCaseStatusHistory')
+    history = RentalLegalCaseStatusHistory.objects.filter(legal_case=OuterRef('pk')).order_by().values('legal_case')
+    RentalLegalCase.objects.update(
+        last_status_change_at=Subquery(history.annotate(latest=Max('changed_at')).values('latest')),
+        # The filing itself is logged with an empty previous status
+        status_change_count=Coalesce(Subquery(
+            history.annotate(total=Count('id', filter=~Q(previous_status=''))).values('total')
+        ), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0013_property_classification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rentallegalcase',
+            name='last_status_change_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='rentallegalcase',
+            name='status_change_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='rentallegalcase',
+            index=models.Index(fields=['court_name', 'current_status'], name='legalcase_court_status_idx'),
+        ),
+        migrations.RunPython(backfill_status_tracking, migrations.RunPython.noop),
+    ]
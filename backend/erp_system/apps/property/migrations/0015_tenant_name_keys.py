@@ -0,0 +1,56 @@
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def normalize_name(value):
+    # Frozen copy of property.models.normalize_name as of this migration
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(char for char in value if not unicodedata.combining(char)).lower()
+    return ' '.join(re.findall(r'[^\W_]+', value))
+
+
+def backfill_name_keys(apps, schema_editor):
+    Tenant = apps.get_model('property', 'Tenant')
+    batch = []
+    for tenant in Tenant.objects.only('first_name', 'last_name').iterator(chunk_size=BATCH_SIZE):
+        first, last = normalize_name(tenant.first_name), normalize_name(tenant.last_name)
+        tenant.name_key = f'{first} {last}'.strip()
+        tenant.surname_key = f'{last} {first}'.strip()
+        batch.append(tenant)
+        if len(batch) >= BATCH_SIZE:
+            Tenant.objects.bulk_update(batch, ['name_key', 'surname_key'])
+            batch = []
+    Tenant.objects.bulk_update(batch, ['name_key', 'surname_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0014_rentallegalcase_status_tracking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenant',
+            name='name_key',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddField(
+            model_name='tenant',
+            name='surname_key',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(fields=['name_key'], name='tenant_name_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(fields=['surname_key'], name='tenant_surname_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(backfill_name_keys, migrations.RunPython.noop),
+    ]
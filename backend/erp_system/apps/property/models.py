@@ -1,7 +1,17 @@
+import re
+import unicodedata
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
 from erp_system.apps.accounts.models import CostCenter
+from erp_system.apps.accounts.services import CostCenterProvisioningService
+
+
+def normalize_name(value):
+    """Lowercase, accent-free, single-spaced form of a name for prefix lookups"""
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(char for char in value if not unicodedata.combining(char)).lower()
+    return ' '.join(re.findall(r'[^\W_]+', value))
 
 
 class Property(models.Model):
@@ -105,23 +115,11 @@ class Unit(models.Model):
     def __str__(self):
         return f"{self.property.name} - Unit {self.unit_number}"
 
-    def _get_or_create_cost_center(self):
-        code = f"CC-UNIT-{self.id:04d}"
-        name = f"{self.property.name} - {self.unit_number}"
-        cost_center, _ = CostCenter.objects.get_or_create(
-            code=code,
-            defaults={'name': name}
-        )
-        return cost_center
-
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
 
-        if not self.cost_center:
-            cost_center = self._get_or_create_cost_center()
-            if self.cost_center_id != cost_center.id:
-                self.cost_center = cost_center
-                super().save(update_fields=['cost_center'])
+        if not self.cost_center_id:
+            CostCenterProvisioningService.provision_units([self])
 
 
 class Tenant(models.Model):
@@ -169,29 +167,39 @@ class Tenant(models.Model):
         help_text="Cost center for tenant-related tracking"
     )
     
+    # Normalized "first last" and "last first" for autocomplete prefix lookups
+    name_key = models.CharField(max_length=201, blank=True, editable=False)
+    surname_key = models.CharField(max_length=201, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    NAME_KEY_FIELDS = ('name_key', 'surname_key')
+
+    class Meta:
+        indexes = [
+            # Pattern ops make LIKE 'prefix%' indexable on PostgreSQL; other backends ignore opclasses
+            models.Index(fields=['name_key'], name='tenant_name_key_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['surname_key'], name='tenant_surname_key_idx', opclasses=['varchar_pattern_ops']),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
-    def _get_or_create_cost_center(self):
-        code = f"CC-TENANT-{self.id:04d}"
-        name = f"Tenant {self.first_name} {self.last_name}"
-        cost_center, _ = CostCenter.objects.get_or_create(
-            code=code,
-            defaults={'name': name}
-        )
-        return cost_center
+    def refresh_name_keys(self):
+        first, last = normalize_name(self.first_name), normalize_name(self.last_name)
+        self.name_key = f'{first} {last}'.strip()
+        self.surname_key = f'{last} {first}'.strip()
 
     def save(self, *args, **kwargs):
+        self.refresh_name_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'first_name', 'last_name'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, *self.NAME_KEY_FIELDS}
         super().save(*args, **kwargs)
 
-        if not self.cost_center:
-            cost_center = self._get_or_create_cost_center()
-            if self.cost_center_id != cost_center.id:
-                self.cost_center = cost_center
-                super().save(update_fields=['cost_center'])
+        if not self.cost_center_id:
+            CostCenterProvisioningService.provision_tenants([self])
 
 
 class Lease(models.Model):
@@ -584,6 +592,10 @@ class RentalLegalCase(models.Model):
     current_status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='filed')
     court_name = models.CharField(max_length=200)
     remarks = models.TextField(blank=True)
+
+    # Denormalized from status_history so lists never read the history
+    last_status_change_at = models.DateTimeField(blank=True, null=True)
+    status_change_count = models.PositiveIntegerField(default=0)
     
     # Audit Trail
     created_by = models.CharField(max_length=200, blank=True)
@@ -594,6 +606,9 @@ class RentalLegalCase(models.Model):
         ordering = ['-filing_date']
         verbose_name = 'Rental Legal Case'
         verbose_name_plural = 'Rental Legal Cases'
+        indexes = [
+            models.Index(fields=['court_name', 'current_status'], name='legalcase_court_status_idx'),
+        ]
     
     def __str__(self):
         return f"Case {self.case_number} - {self.tenant}"
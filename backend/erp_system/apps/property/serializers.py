@@ -4,6 +4,7 @@ from .models import (
     Property, Unit, Tenant, Lease, Maintenance, Expense, Rent,
     LeaseRenewal, LeaseTermination, RentalLegalCase, RentalLegalCaseStatusHistory
 )
+from .services import UnitStatusService
 
 
 class PropertySerializer(serializers.ModelSerializer):
@@ -33,6 +34,18 @@ class UnitSerializer(serializers.ModelSerializer):
             )
         ]
 
+    def validate_status(self, value):
+        # Statuses follow from leases and legal cases and are reprojected on save;
+        # a free unit may also be put on a manual status
+        derived = UnitStatusService.derived_status(self.instance.pk if self.instance else None)
+        allowed = [derived, *UnitStatusService.MANUAL_STATUSES] if derived == 'vacant' else [derived]
+        if value not in allowed:
+            raise serializers.ValidationError(
+                f'Status follows from the unit\'s leases and legal cases; it can be '
+                f'{" or ".join(allowed)} now.'
+            )
+        return value
+
 
 class TenantSerializer(serializers.ModelSerializer):
     move_out_date = serializers.DateField(required=False, allow_null=True)
@@ -205,13 +218,12 @@ class RentalLegalCaseStatusHistorySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'changed_at']
 
 
-class RentalLegalCaseSerializer(serializers.ModelSerializer):
-    """Serializer for rental legal cases"""
+class RentalLegalCaseListSerializer(serializers.ModelSerializer):
+    """Serializer for rental legal case lists - status history is summarized, not embedded"""
     tenant_name = serializers.SerializerMethodField()
     lease_number = serializers.CharField(source='lease.lease_number', read_only=True)
     property_name = serializers.CharField(source='property.name', read_only=True)
     unit_number = serializers.CharField(source='unit.unit_number', read_only=True)
-    status_history = RentalLegalCaseStatusHistorySerializer(many=True, read_only=True)
     
     class Meta:
         model = RentalLegalCase
@@ -220,11 +232,13 @@ class RentalLegalCaseSerializer(serializers.ModelSerializer):
             'property', 'property_name', 'unit', 'unit_number',
             'cost_center', 'case_type', 'case_number', 'filing_date',
             'current_status', 'court_name', 'remarks',
-            'created_by', 'created_at', 'updated_at', 'status_history'
+            'last_status_change_at', 'status_change_count',
+            'created_by', 'created_at', 'updated_at'
         ]
         read_only_fields = [
             'id', 'cost_center', 'current_status', 'created_at', 'updated_at',
-            'tenant_name', 'lease_number', 'property_name', 'unit_number', 'status_history'
+            'tenant_name', 'lease_number', 'property_name', 'unit_number',
+            'last_status_change_at', 'status_change_count'
         ]
         extra_kwargs = {
             'remarks': {'required': False, 'allow_blank': True},
@@ -247,3 +261,11 @@ class RentalLegalCaseSerializer(serializers.ModelSerializer):
         
         return data
 
+
+class RentalLegalCaseSerializer(RentalLegalCaseListSerializer):
+    """Serializer for rental legal cases, with the full status history"""
+    status_history = RentalLegalCaseStatusHistorySerializer(many=True, read_only=True)
+
+    class Meta(RentalLegalCaseListSerializer.Meta):
+        fields = RentalLegalCaseListSerializer.Meta.fields + ['status_history']
+        read_only_fields = RentalLegalCaseListSerializer.Meta.read_only_fields + ['status_history']
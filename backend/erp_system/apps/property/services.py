@@ -4,12 +4,57 @@ Implements strict double-entry accounting with cost centers and reference tracki
 """
 
 import calendar
+import codecs
+from collections import OrderedDict, defaultdict
+import csv
+import hashlib
+from datetime import timedelta
 from decimal import Decimal, ROUND_HALF_UP
-from django.db import transaction
+import threading
+from types import SimpleNamespace
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Case, CharField, Count, DecimalField, Exists, F, Max, OuterRef, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from erp_system.apps.core.caching import bump_version, get_versions
+from erp_system.apps.core.profiling import profiled
+from erp_system.apps.search.services import SearchIndexService
 from erp_system.apps.accounts.models import Account, JournalEntry, JournalLine, CostCenter
-from erp_system.apps.accounts.services import require_transaction_mapping
-from erp_system.apps.property.models import Lease, LeaseRenewal, LeaseTermination, RentalLegalCase, RentalLegalCaseStatusHistory, Unit
+from erp_system.apps.accounts.services import (
+    CostCenterProvisioningService, post_journal_entries, require_transaction_mapping
+)
+from erp_system.apps.property.models import (
+    Lease, LeaseRenewal, LeaseTermination, Maintenance, Property, Rent, RentalLegalCase,
+    RentalLegalCaseStatusHistory, Tenant, Unit, normalize_name
+)
+
+
+def _bulk_transition(model, ids, allowed_statuses, error, changes):
+    """
+    Move the given rows to a new status in one UPDATE.
+
+    Rows are locked, transitions are checked in memory and the valid ones
+    are written together, since every row gets the same values. Returns
+    (updated ids, errors by id).
+    """
+    current = dict(
+        model.objects.select_for_update().filter(id__in=ids).values_list('id', 'status')
+    )
+    updated, errors = [], {}
+    for record_id in dict.fromkeys(ids):
+        if record_id not in current:
+            errors[record_id] = f'{model._meta.verbose_name.capitalize()} not found.'
+        elif current[record_id] not in allowed_statuses:
+            errors[record_id] = error
+        else:
+            updated.append(record_id)
+    if updated:
+        model.objects.filter(id__in=updated).update(updated_at=timezone.now(), **changes)
+    return updated, errors
 
 
 class LeaseService:
@@ -23,29 +68,12 @@ class LeaseService:
         """
         if property_obj.classification and property_obj.classification.default_cost_center:
             return property_obj.classification.default_cost_center
-        if unit and unit.cost_center:
-            return unit.cost_center
-        
-        # Auto-create from unit if not exists
         if unit:
-            code = f"CC-UNIT-{unit.id:04d}"
-            name = f"{unit.property.name} - {unit.unit_number}"
-            cost_center, created = CostCenter.objects.get_or_create(
-                code=code,
-                defaults={'name': name}
-            )
-            return cost_center
-        
-        # Fall back to property-level
-        code = f"CC-PROP-{property_obj.id:04d}"
-        name = f"{property_obj.name} - Property"
-        cost_center, created = CostCenter.objects.get_or_create(
-            code=code,
-            defaults={'name': name}
-        )
-        return cost_center
+            return CostCenterProvisioningService.for_unit(unit)
+        return CostCenterProvisioningService.for_property(property_obj)
     
     @staticmethod
+    @profiled
     @transaction.atomic
     def create_lease(lease_data):
         """
@@ -144,15 +172,22 @@ class LeaseService:
         
         lease.accounting_posted = True
         lease.save()
+
+        UnitStatusService.sync_unit(lease.unit)
         
         return lease, journal_entry
 
 
 class LeaseRenewalService:
     """Service for lease renewal activation with accounting"""
-    
+
+    @staticmethod
+    def _renewal_lease_number(renewal):
+        # Renewal ids are unique, so the derived lease number never collides
+        # with an earlier renewal of the same lease.
+        return f"{renewal.original_lease.lease_number}-REN-{renewal.id}"
+
     @staticmethod
-    @transaction.atomic
     def activate_renewal(renewal, new_lease_data):
         """
         Activate lease renewal: create new lease with same accounting logic as initial lease.
@@ -162,108 +197,657 @@ class LeaseRenewalService:
         - refundable_deposit_account
         - other_charges_account (optional)
         """
-        # Create new lease with renewal terms
-        lease_data = {
-            'lease_number': f"{renewal.original_lease.lease_number}-REN-{renewal.id}",
-            'unit': renewal.original_lease.unit,
-            'tenant': renewal.original_lease.tenant,
-            'start_date': renewal.new_start_date,
-            'end_date': renewal.new_end_date,
-            'monthly_rent': renewal.new_monthly_rent,
-            'security_deposit': renewal.new_security_deposit or renewal.original_lease.security_deposit,
-            'other_charges': 0,
-            'status': 'active',
-            'terms_conditions': renewal.terms_conditions or renewal.original_lease.terms_conditions,
-        }
-        
-        # Add accounting fields
-        lease_data['unearned_revenue_account'] = new_lease_data.get('unearned_revenue_account')
-        lease_data['refundable_deposit_account'] = new_lease_data.get('refundable_deposit_account')
-        lease_data['other_charges_account'] = new_lease_data.get('other_charges_account')
-        
-        # Create new lease via LeaseService
-        new_lease, journal_entry = LeaseService.create_lease(lease_data)
-        
-        # End original lease
-        renewal.original_lease.status = 'expired'
-        renewal.original_lease.save()
-        
-        # Mark renewal as active
-        renewal.status = 'active'
-        renewal.activation_date = timezone.now().date()
-        renewal.save()
-        
+        activated, errors = LeaseRenewalService.activate_renewals([renewal.id], new_lease_data)
+        if errors:
+            raise ValueError(errors[renewal.id])
+
+        new_lease, journal_entry = activated[renewal.id]
+        renewal.refresh_from_db()
         return new_lease, journal_entry
 
+    @staticmethod
+    @transaction.atomic
+    def approve_renewals(renewal_ids):
+        """Approve many draft or pending renewals. Returns (approved ids, errors by id)"""
+        return _bulk_transition(
+            LeaseRenewal, renewal_ids, ['draft', 'pending_approval'],
+            'Only draft or pending approval renewals can be approved.',
+            {'status': 'approved', 'approval_date': timezone.now().date()},
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def reject_renewals(renewal_ids):
+        """Reject many renewals that were not activated yet. Returns (rejected ids, errors by id)"""
+        return _bulk_transition(
+            LeaseRenewal, renewal_ids, ['draft', 'pending_approval', 'approved'],
+            'Only draft, pending approval or approved renewals can be rejected.',
+            {'status': 'rejected'},
+        )
+
+    @staticmethod
+    @profiled
+    @transaction.atomic
+    def activate_renewals(renewal_ids, new_lease_data=None):
+        """
+        Activate many approved renewals in one pass.
+
+        Creates the renewed leases and their lease creation entries in bulk,
+        expires the original leases and marks the renewals active.
+        Accounts missing from new_lease_data fall back to the original lease.
+
+        Returns (activated, errors): activated maps renewal id to
+        (new_lease, journal_entry), errors maps renewal id to a message.
+        """
+        require_transaction_mapping('lease_creation')
+        new_lease_data = new_lease_data or {}
+
+        renewals = {
+            renewal.id: renewal
+            for renewal in LeaseRenewal.objects.select_for_update(of=('self',)).select_related(
+                'original_lease__tenant',
+                'original_lease__unit__cost_center',
+                'original_lease__unit__property__classification__default_cost_center',
+                'original_lease__unit__property__classification__default_revenue_account',
+            ).filter(id__in=renewal_ids)
+        }
+
+        tenant_account = Account.objects.filter(
+            account_type='asset',
+            account_name__icontains='tenant'
+        ).first()
+
+        errors = {}
+        pending = []
+        for renewal_id in dict.fromkeys(renewal_ids):
+            renewal = renewals.get(renewal_id)
+            if renewal is None:
+                errors[renewal_id] = 'Renewal not found.'
+                continue
+            if renewal.status != 'approved':
+                errors[renewal_id] = 'Only approved renewals can be activated.'
+                continue
+
+            original_lease = renewal.original_lease
+            unearned_account = new_lease_data.get('unearned_revenue_account') or original_lease.unearned_revenue_account
+            deposit_account = new_lease_data.get('refundable_deposit_account') or original_lease.refundable_deposit_account
+            if not unearned_account or not deposit_account:
+                errors[renewal_id] = 'Unearned Revenue and Refundable Deposit accounts are required'
+                continue
+            if not tenant_account:
+                errors[renewal_id] = 'Tenant (Customer) Account not found. Please seed accounts first.'
+                continue
+            pending.append((renewal, unearned_account, deposit_account))
+
+        if not pending:
+            return {}, errors
+
+        cost_centers = {}
+        new_leases = []
+        for renewal, unearned_account, deposit_account in pending:
+            original_lease = renewal.original_lease
+            unit = original_lease.unit
+            if unit.id not in cost_centers:
+                cost_centers[unit.id] = LeaseService._get_or_create_cost_center(unit, unit.property)
+
+            rental_income_account = original_lease.rental_income_account
+            if not rental_income_account and unit.property.classification:
+                rental_income_account = unit.property.classification.default_revenue_account
+
+            new_leases.append(Lease(
+                lease_number=LeaseRenewalService._renewal_lease_number(renewal),
+                unit=unit,
+                tenant=original_lease.tenant,
+                start_date=renewal.new_start_date,
+                end_date=renewal.new_end_date,
+                monthly_rent=renewal.new_monthly_rent,
+                security_deposit=renewal.new_security_deposit or original_lease.security_deposit,
+                other_charges=Decimal('0.00'),
+                status='active',
+                terms_conditions=renewal.terms_conditions or original_lease.terms_conditions,
+                cost_center=cost_centers[unit.id],
+                unearned_revenue_account=unearned_account,
+                refundable_deposit_account=deposit_account,
+                other_charges_account=new_lease_data.get('other_charges_account') or original_lease.other_charges_account,
+                rental_income_account=rental_income_account,
+                accounting_posted=True,
+            ))
+
+        Lease.objects.bulk_create(new_leases)
+        SearchIndexService.index_records(Lease, [lease.pk for lease in new_leases])
+
+        entries = []
+        for lease in new_leases:
+            total_debit = lease.security_deposit + lease.monthly_rent
+            line_defaults = {
+                'cost_center': lease.cost_center,
+                'reference_type': 'lease',
+                'reference_id': lease.id,
+            }
+            entries.append({
+                'entry_type': 'prepaid',
+                'reference_type': 'lease',
+                'reference_id': lease.id,
+                'description': f"Lease {lease.lease_number} creation - Tenant receivable",
+                'lines': [
+                    {'account': tenant_account, 'debit': total_debit, **line_defaults},
+                    {'account': lease.unearned_revenue_account, 'credit': lease.monthly_rent, **line_defaults},
+                    {'account': lease.refundable_deposit_account, 'credit': lease.security_deposit, **line_defaults},
+                ],
+            })
+        journal_entries = post_journal_entries(entries)
+
+        now = timezone.now()
+        activated_ids = [renewal.id for renewal, _, _ in pending]
+        Lease.objects.filter(
+            id__in=[renewal.original_lease_id for renewal, _, _ in pending]
+        ).update(status='expired', updated_at=now)
+        LeaseRenewal.objects.filter(id__in=activated_ids).update(
+            status='active',
+            activation_date=now.date(),
+            updated_at=now,
+        )
+        UnitStatusService.project({lease.unit_id for lease in new_leases})
+
+        activated = {
+            renewal_id: (lease, entry)
+            for renewal_id, lease, entry in zip(activated_ids, new_leases, journal_entries)
+        }
+        return activated, errors
+
 
 class LeaseTerminationService:
     """Service for lease termination with accounting"""
-    
+    # bulk_update builds one CASE per field and batch
+    UPDATE_BATCH_SIZE = 200
+
     @staticmethod
     @transaction.atomic
-    def complete_normal_termination(termination):
+    def approve_terminations(termination_ids):
+        """Approve many draft or pending terminations. Returns (approved ids, errors by id)"""
+        return _bulk_transition(
+            LeaseTermination, termination_ids, ['draft', 'pending_approval'],
+            'Only draft or pending approval terminations can be approved.',
+            {'status': 'approved', 'approval_date': timezone.now().date()},
+        )
+
+    @staticmethod
+    def calculate_settlements(terminations):
         """
-        Complete normal termination with accounting entry:
-        
-        Debit:  Refundable Security Deposit Account
-        Credit: Tenant Account
-        Credit: Maintenance Charges Account
-        
-        Requires: deposit_account, tenant_account, maintenance_charges_account
+        Settlement amounts for many terminations at once, keyed by id.
+
+        Unearned rent (early terminations only) is the rent for the days
+        after the termination date, prorated exactly like the recognition
+        schedule and computed for all terminations in one lease x month
+        matrix. net_refund = deposit + unearned rent - penalty - maintenance
+        charges; the penalty only applies to early terminations. Terminations
+        need their lease loaded.
         """
-        if not termination.deposit_account or not termination.tenant_account:
-            raise ValueError('Deposit and Tenant accounts are required for normal termination')
-        
-        # Get or create cost center
-        cost_center = LeaseTerminationService._get_or_create_cost_center(
-            termination.lease.unit,
-            termination.lease.unit.property
+        terminations = list(terminations)
+        if not terminations:
+            return {}
+
+        to_cents = LeaseScheduleService._to_cents
+        early = np.array([termination.termination_type == 'early' for termination in terminations])
+        remaining_terms = [
+            SimpleNamespace(
+                start_date=max(termination.termination_date + timedelta(days=1), termination.lease.start_date),
+                end_date=termination.lease.end_date,
+                monthly_rent=termination.lease.monthly_rent,
+            )
+            for termination in terminations
+        ]
+        first_day = min(term.start_date for term in remaining_terms)
+        last_day = max(term.end_date for term in remaining_terms)
+        unearned = np.zeros(len(terminations), dtype=np.int64)
+        if first_day <= last_day:
+            unearned = LeaseScheduleService.amount_matrix(remaining_terms, first_day, last_day)[1].sum(axis=1)
+        unearned = np.where(early, unearned, 0)
+
+        deposit = np.array([to_cents(termination.refundable_amount) for termination in terminations], dtype=np.int64)
+        penalty = np.where(early, np.array(
+            [to_cents(termination.early_termination_penalty) for termination in terminations], dtype=np.int64
+        ), 0)
+        maintenance = np.array([to_cents(termination.maintenance_charges) for termination in terminations], dtype=np.int64)
+        net_refund = deposit + unearned - penalty - maintenance
+
+        from_cents = LeaseScheduleService._from_cents
+        return {
+            termination.id: {
+                'refundable_amount': from_cents(deposit[row]),
+                'unearned_rent': from_cents(unearned[row]),
+                'early_termination_penalty': from_cents(penalty[row]),
+                'maintenance_charges': from_cents(maintenance[row]),
+                'net_refund': from_cents(net_refund[row]),
+            }
+            for row, termination in enumerate(terminations)
+        }
+
+    @staticmethod
+    def _settlement_entry(termination, amounts, tenant_account_id):
+        """
+        Balanced journal entry for a settlement:
+
+        Debit:  Refundable Security Deposit (deposit refunded)
+        Debit:  Unearned Revenue (rent for the remaining term)
+        Credit: Early Termination Penalties, Maintenance Charges
+        Credit: Post-Dated Cheques (cancelled cheques, up to the unearned rent)
+        Credit: Tenant Account with the rest (Debit when charges exceed it)
+
+        Accounts left empty on the termination fall back to the lease's.
+        Raises ValueError when an account needed for a non-zero amount is missing.
+        """
+        lease = termination.lease
+        deposit_account = termination.deposit_account_id or lease.refundable_deposit_account_id
+        unearned_account = termination.unearned_revenue_account_id or lease.unearned_revenue_account_id
+        tenant_account = termination.tenant_account_id or tenant_account_id
+
+        deposit = amounts['refundable_amount']
+        unearned = amounts['unearned_rent']
+        penalty = amounts['early_termination_penalty']
+        maintenance = amounts['maintenance_charges']
+        remainder = amounts['net_refund']
+        cheques = Decimal('0.00')
+        if (termination.termination_type == 'early' and termination.post_dated_cheques_adjusted
+                and termination.post_dated_cheques_account_id and remainder > 0):
+            cheques = min(unearned, remainder)
+        to_tenant = remainder - cheques
+
+        postings = [
+            ('Refundable Deposit', deposit_account, deposit, 0),
+            ('Unearned Revenue', unearned_account, unearned, 0),
+            ('Penalty', termination.penalty_account_id, 0, penalty),
+            ('Maintenance Charges', termination.maintenance_charges_account_id, 0, maintenance),
+            ('Post-Dated Cheques', termination.post_dated_cheques_account_id, 0, cheques),
+            ('Tenant', tenant_account, max(-to_tenant, 0), max(to_tenant, 0)),
+        ]
+        missing = [name for name, account_id, debit, credit in postings if (debit or credit) and not account_id]
+        if missing:
+            raise ValueError(f"{', '.join(missing)} account{'s are' if len(missing) > 1 else ' is'} required.")
+
+        line_defaults = {
+            'cost_center_id': lease.cost_center_id or lease.unit.cost_center_id,
+            'reference_type': 'lease_termination',
+            'reference_id': termination.id,
+        }
+        return {
+            'entry_type': 'prepaid',
+            'reference_type': 'lease_termination',
+            'reference_id': termination.id,
+            'description': f"Lease {lease.lease_number} {termination.termination_type} termination - Settlement",
+            'lines': [
+                {'account_id': account_id, 'debit': debit, 'credit': credit, **line_defaults}
+                for _, account_id, debit, credit in postings if debit or credit
+            ],
+        }
+
+    @staticmethod
+    @profiled
+    @transaction.atomic
+    def complete_terminations(termination_ids):
+        """
+        Complete many approved terminations: post their settlements, terminate
+        the leases, set the tenants' move-out dates and re-project the units,
+        with one write per table instead of several saves per termination.
+        All settlement entries are posted with one bulk insert.
+
+        Returns (completed, errors): completed is a list of the completed
+        terminations (with their leases and a journal_entry attribute, None
+        when accounting was already posted), errors maps id to a message.
+        """
+        terminations = {
+            termination.id: termination
+            for termination in LeaseTermination.objects.select_for_update(of=('self',))
+            .select_related('lease__unit__property').filter(id__in=termination_ids)
+        }
+
+        candidates, errors = [], {}
+        for termination_id in dict.fromkeys(termination_ids):
+            termination = terminations.get(termination_id)
+            if termination is None:
+                errors[termination_id] = 'Lease termination not found.'
+            elif termination.status != 'approved':
+                errors[termination_id] = 'Only approved terminations can be completed.'
+            else:
+                candidates.append(termination)
+        if not candidates:
+            return [], errors
+
+        settlements = LeaseTerminationService.calculate_settlements(candidates)
+        CostCenterProvisioningService.provision_units(
+            [termination.lease.unit for termination in candidates if not termination.lease.cost_center_id]
         )
-        
-        # Create journal entry
-        journal_entry = JournalEntry.objects.create(
-            entry_type='prepaid',
-            reference_type='lease_termination',
-            reference_id=termination.id,
-            description=f"Lease {termination.lease.lease_number} normal termination - Security deposit refund"
+        tenant_account_id = Account.objects.filter(
+            account_type='asset',
+            account_name__icontains='tenant'
+        ).values_list('id', flat=True).first()
+
+        completed, entries = [], []
+        for termination in candidates:
+            if termination.accounting_posted:
+                termination.journal_entry = None
+                completed.append(termination)
+                continue
+            try:
+                entries.append(LeaseTerminationService._settlement_entry(
+                    termination, settlements[termination.id], tenant_account_id
+                ))
+            except ValueError as exc:
+                errors[termination.id] = str(exc)
+                continue
+            completed.append(termination)
+        if not completed:
+            return [], errors
+
+        journal_entries = iter(post_journal_entries(entries))
+        now = timezone.now()
+        for termination in completed:
+            if not termination.accounting_posted:
+                for field, value in settlements[termination.id].items():
+                    setattr(termination, field, value)
+                termination.accounting_posted = True
+                termination.journal_entry = next(journal_entries)
+            termination.status = 'completed'
+            termination.completion_date = now.date()
+            termination.updated_at = now
+            termination.lease.status = 'terminated'
+        LeaseTermination.objects.bulk_update(
+            completed,
+            ['refundable_amount', 'unearned_rent', 'early_termination_penalty', 'maintenance_charges',
+             'net_refund', 'accounting_posted', 'status', 'completion_date', 'updated_at'],
+            batch_size=LeaseTerminationService.UPDATE_BATCH_SIZE,
         )
-        
-        # Debit: Refundable Security Deposit (liability reduction)
-        JournalLine.objects.create(
-            journal_entry=journal_entry,
-            account=termination.deposit_account,
-            debit=termination.refundable_amount,
-            cost_center=cost_center,
-            reference_type='lease_termination',
-            reference_id=termination.id
+        Lease.objects.filter(id__in=[termination.lease_id for termination in completed]).update(
+            status='terminated', updated_at=now
         )
-        
-        # Credit: Tenant Account (customer payable)
-        credit_to_tenant = termination.refundable_amount - termination.maintenance_charges
-        JournalLine.objects.create(
-            journal_entry=journal_entry,
-            account=termination.tenant_account,
-            credit=credit_to_tenant,
-            cost_center=cost_center,
-            reference_type='lease_termination',
-            reference_id=termination.id
+
+        # The latest termination wins when one tenant appears more than once
+        move_out_dates = {}
+        for termination in completed:
+            tenant_id = termination.lease.tenant_id
+            if tenant_id and (tenant_id not in move_out_dates or termination.termination_date > move_out_dates[tenant_id]):
+                move_out_dates[tenant_id] = termination.termination_date
+        Tenant.objects.bulk_update(
+            [Tenant(id=tenant_id, move_out_date=move_out, updated_at=now) for tenant_id, move_out in move_out_dates.items()],
+            ['move_out_date', 'updated_at'],
+            batch_size=LeaseTerminationService.UPDATE_BATCH_SIZE,
         )
-        
-        # Credit: Maintenance Charges (if applicable)
-        if termination.maintenance_charges and termination.maintenance_charges_account:
-            JournalLine.objects.create(
-                journal_entry=journal_entry,
-                account=termination.maintenance_charges_account,
-                credit=termination.maintenance_charges,
-                cost_center=cost_center,
-                reference_type='lease_termination',
-                reference_id=termination.id
+
+        UnitStatusService.project({termination.lease.unit_id for termination in completed})
+        return completed, errors
+
+
+class LeaseScheduleService:
+    """
+    Month-by-month recognition schedules for many leases at once.
+
+    Day counts are computed with NumPy date arithmetic over a lease x month
+    grid. Full months recognize the monthly rent as-is; only partial months
+    are prorated, with the same Decimal rounding as a single-month run.
+    """
+
+    CHUNK_SIZE = 5000
+
+    @staticmethod
+    def _month_grid(first_day, last_day):
+        months = np.arange(np.datetime64(first_day, 'M'), np.datetime64(last_day, 'M') + 1)
+        month_starts = months.astype('datetime64[D]')
+        month_ends = (months + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')
+        return months, month_starts, month_ends
+
+    @staticmethod
+    def _to_cents(amount):
+        return int((Decimal(amount) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+    @staticmethod
+    def _from_cents(cents):
+        return (Decimal(int(cents)) / 100).quantize(Decimal('0.01'))
+
+    @staticmethod
+    def _prorate(monthly_rent, month_days, active_days):
+        amount = (Decimal(monthly_rent) / Decimal(int(month_days))) * Decimal(int(active_days))
+        return amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    @staticmethod
+    def _matrix(leases, window_start, window_end):
+        """
+        Active days and recognized amounts (in cents) per lease and month.
+
+        Returns (months, month_days, days, cents) where days and cents are
+        len(leases) x len(months) arrays.
+        """
+        months, month_starts, month_ends = LeaseScheduleService._month_grid(window_start, window_end)
+        month_days = (month_ends - month_starts).astype(np.int64) + 1
+
+        window_start = np.datetime64(window_start, 'D')
+        window_end = np.datetime64(window_end, 'D')
+        starts = np.maximum(np.array([lease.start_date for lease in leases], dtype='datetime64[D]'), window_start)
+        ends = np.minimum(np.array([lease.end_date for lease in leases], dtype='datetime64[D]'), window_end)
+
+        active_start = np.maximum(starts[:, None], month_starts[None, :])
+        active_end = np.minimum(ends[:, None], month_ends[None, :])
+        days = np.clip((active_end - active_start).astype(np.int64) + 1, 0, None)
+
+        rents = np.array([LeaseScheduleService._to_cents(lease.monthly_rent) for lease in leases], dtype=np.int64)
+        full = days == month_days[None, :]
+        cents = np.where(full, rents[:, None], 0)
+
+        # Edges: partial months keep exact Decimal proration
+        for row, col in zip(*np.nonzero((days > 0) & ~full)):
+            cents[row, col] = LeaseScheduleService._to_cents(LeaseScheduleService._prorate(
+                leases[row].monthly_rent, month_days[col], days[row, col]
+            ))
+
+        return months, month_days, days, cents
+
+    @staticmethod
+    def _chunks(leases):
+        leases = list(leases)
+        for offset in range(0, len(leases), LeaseScheduleService.CHUNK_SIZE):
+            yield leases[offset:offset + LeaseScheduleService.CHUNK_SIZE]
+
+    @staticmethod
+    def amount_matrix(leases, window_start, window_end):
+        """Recognized amounts in cents as a len(leases) x month array over the window"""
+        months, _, _ = LeaseScheduleService._month_grid(window_start, window_end)
+        blocks = [
+            LeaseScheduleService._matrix(chunk, window_start, window_end)[3]
+            for chunk in LeaseScheduleService._chunks(leases)
+        ]
+        if not blocks:
+            return months, np.zeros((0, len(months)), dtype=np.int64)
+        return months, np.vstack(blocks)
+
+    @staticmethod
+    def amounts_for_period(leases, period_start, period_end):
+        """Total prorated rent per lease id for the days between period_start and period_end"""
+        amounts = {}
+        if period_end < period_start:
+            return {lease.id: Decimal('0.00') for lease in leases}
+        for chunk in LeaseScheduleService._chunks(leases):
+            _, _, _, cents = LeaseScheduleService._matrix(chunk, period_start, period_end)
+            for lease, total in zip(chunk, cents.sum(axis=1)):
+                amounts[lease.id] = LeaseScheduleService._from_cents(total)
+        return amounts
+
+    @staticmethod
+    def unearned_after(lease, as_of_date):
+        """Rent for the remaining lease term after as_of_date"""
+        period_start = max(as_of_date + timedelta(days=1), lease.start_date)
+        return LeaseScheduleService.amounts_for_period([lease], period_start, lease.end_date)[lease.id]
+
+    @staticmethod
+    def build_schedules(leases):
+        """
+        Full recognition schedule for each lease, keyed by lease id.
+
+        Each row holds the period, days active, prorated amount, cumulative
+        recognized and remaining unearned amounts.
+        """
+        schedules = {}
+        for chunk in LeaseScheduleService._chunks(leases):
+            if not chunk:
+                continue
+            first_day = min(lease.start_date for lease in chunk)
+            last_day = max(lease.end_date for lease in chunk)
+            months, month_days, days, cents = LeaseScheduleService._matrix(chunk, first_day, last_day)
+            cumulative = np.cumsum(cents, axis=1)
+            totals = cumulative[:, -1]
+
+            for row, lease in enumerate(chunk):
+                active_months = np.nonzero(days[row] > 0)[0]
+                schedules[lease.id] = [
+                    {
+                        'period': str(months[col]),
+                        'days_in_month': int(month_days[col]),
+                        'days_active': int(days[row, col]),
+                        'amount': LeaseScheduleService._from_cents(cents[row, col]),
+                        'cumulative_recognized': LeaseScheduleService._from_cents(cumulative[row, col]),
+                        'remaining_unearned': LeaseScheduleService._from_cents(totals[row] - cumulative[row, col]),
+                    }
+                    for col in active_months
+                ]
+        return schedules
+
+    @staticmethod
+    def build_schedule(lease):
+        return LeaseScheduleService.build_schedules([lease]).get(lease.id, [])
+
+
+class LeaseForecastService:
+    """
+    Forward rental revenue forecast over the active lease book.
+
+    Active leases count in full; renewals in the pipeline are weighted by
+    their likelihood (approved renewals count in full, draft and pending
+    ones by renewal_probability). Results are cached until a lease or
+    renewal changes, or a unit, property or cost center they group by does.
+    """
+
+    CACHE_TIMEOUT = 60 * 60
+    PIPELINE_STATUSES = ['draft', 'pending_approval', 'approved']
+
+    @staticmethod
+    def _cache_key(window_start, months, renewal_probability):
+        leases = Lease.objects.aggregate(latest=Max('updated_at'), count=Count('id'))
+        renewals = LeaseRenewal.objects.aggregate(latest=Max('updated_at'), count=Count('id'))
+        # Names and cost center assignments come from these, tracked by version
+        versions = ':'.join(str(version) for version in get_versions([Unit, Property, CostCenter]))
+        version = hashlib.md5((
+            f"{leases['latest']}:{leases['count']}:"
+            f"{renewals['latest']}:{renewals['count']}:{versions}"
+        ).encode()).hexdigest()
+        return f"lease-forecast:{window_start:%Y-%m}:{months}:{renewal_probability}:{version}"
+
+    @staticmethod
+    def _aggregate(keys, weighted_cents):
+        """Sum rows of weighted_cents by key, returning (unique keys, key x month cents)"""
+        positions = {}
+        index = np.array([positions.setdefault(key, len(positions)) for key in keys], dtype=np.int64)
+        totals = np.zeros((len(positions), weighted_cents.shape[1]))
+        np.add.at(totals, index, weighted_cents)
+        return list(positions), np.rint(totals).astype(np.int64)
+
+    @staticmethod
+    def forecast(start_date=None, months=12, renewal_probability=Decimal('0')):
+        start_date = (start_date or timezone.now().date()).replace(day=1)
+        cache_key = LeaseForecastService._cache_key(start_date, months, renewal_probability)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        last_month = np.datetime64(start_date, 'M') + months - 1
+        window_end = ((last_month + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')).astype(object)
+
+        leases = list(Lease.objects.filter(
+            status='active',
+            start_date__lte=window_end,
+            end_date__gte=start_date,
+        ).select_related('unit__property', 'unit__cost_center', 'cost_center'))
+
+        renewals = list(LeaseRenewal.objects.filter(
+            status__in=LeaseForecastService.PIPELINE_STATUSES,
+            new_start_date__lte=window_end,
+            new_end_date__gte=start_date,
+        ).select_related(
+            'original_lease__unit__property',
+            'original_lease__unit__cost_center',
+            'original_lease__cost_center',
+        ))
+
+        book = []
+        for lease in leases:
+            book.append((lease, lease, 1.0, False))
+        for renewal in renewals:
+            original = renewal.original_lease
+            projected = Lease(
+                start_date=renewal.new_start_date,
+                end_date=renewal.new_end_date,
+                monthly_rent=renewal.new_monthly_rent,
             )
-        
-        termination.accounting_posted = True
-        termination.save()
-        
-        return journal_entry
+            weight = 1.0 if renewal.status == 'approved' else float(renewal_probability)
+            book.append((projected, original, weight, True))
+
+        month_grid, cents = LeaseScheduleService.amount_matrix(
+            [projected for projected, _, _, _ in book], start_date, window_end
+        )
+        weights = np.array([weight for _, _, weight, _ in book], dtype=float)
+        weighted = cents * weights[:, None] if len(book) else cents.astype(float)
+        is_renewal = np.array([renewal for _, _, _, renewal in book], dtype=bool)
+
+        def cost_center_of(lease):
+            cost_center = lease.cost_center or lease.unit.cost_center
+            return (cost_center.id, cost_center.code, cost_center.name) if cost_center else (None, '', 'Unassigned')
+
+        def to_amounts(row):
+            return [float(LeaseScheduleService._from_cents(value)) for value in row]
+
+        property_keys = [
+            (source.unit.property.id, source.unit.property.property_id, source.unit.property.name)
+            for _, source, _, _ in book
+        ]
+        cost_center_keys = [cost_center_of(source) for _, source, _, _ in book]
+
+        by_property = []
+        by_cost_center = []
+        if book:
+            keys, totals = LeaseForecastService._aggregate(property_keys, weighted)
+            for (property_id, code, name), row in zip(keys, totals):
+                by_property.append({
+                    'property': property_id,
+                    'property_code': code,
+                    'property_name': name,
+                    'monthly': to_amounts(row),
+                    'total': float(LeaseScheduleService._from_cents(row.sum())),
+                })
+            keys, totals = LeaseForecastService._aggregate(cost_center_keys, weighted)
+            for (cost_center_id, code, name), row in zip(keys, totals):
+                by_cost_center.append({
+                    'cost_center': cost_center_id,
+                    'cost_center_code': code,
+                    'cost_center_name': name,
+                    'monthly': to_amounts(row),
+                    'total': float(LeaseScheduleService._from_cents(row.sum())),
+                })
+
+        contracted = np.rint(weighted[~is_renewal].sum(axis=0)).astype(np.int64)
+        pipeline = np.rint(weighted[is_renewal].sum(axis=0)).astype(np.int64)
+        result = {
+            'months': [str(month) for month in month_grid],
+            'renewal_probability': float(renewal_probability),
+            'lease_count': len(leases),
+            'renewal_count': len(renewals),
+            'by_property': by_property,
+            'by_cost_center': by_cost_center,
+            'totals': {
+                'contracted': to_amounts(contracted),
+                'renewals': to_amounts(pipeline),
+                'monthly': to_amounts(contracted + pipeline),
+                'grand_total': float(LeaseScheduleService._from_cents((contracted + pipeline).sum())),
+            },
+        }
+        cache.set(cache_key, result, LeaseForecastService.CACHE_TIMEOUT)
+        return result
 
 
 class LeaseRevenueRecognitionService:
@@ -274,223 +858,99 @@ class LeaseRevenueRecognitionService:
         month_days = calendar.monthrange(run_date.year, run_date.month)[1]
         period_start = run_date.replace(day=1)
         period_end = run_date.replace(day=month_days)
-
-        start_date = max(lease.start_date, period_start)
-        end_date = min(lease.end_date, period_end)
-        if end_date < start_date:
-            return Decimal('0.00')
-
-        active_days = (end_date - start_date).days + 1
-        amount = (Decimal(lease.monthly_rent) / Decimal(month_days)) * Decimal(active_days)
-        return amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        return LeaseScheduleService.amounts_for_period([lease], period_start, period_end)[lease.id]
 
     @staticmethod
+    @profiled
     @transaction.atomic
-    def run_monthly_recognition(run_date=None):
+    def run_monthly_recognition(run_date=None, progress=None, chunk_size=500):
+        """
+        Recognize the month's revenue for every active lease not yet posted.
+
+        ``progress(done, total)`` is called after each chunk of posted
+        entries; an exception it raises rolls the whole run back.
+        """
         require_transaction_mapping('revenue_recognition')
         run_date = run_date or timezone.now().date()
         period = f"{run_date.year:04d}-{run_date.month:02d}"
+        month_days = calendar.monthrange(run_date.year, run_date.month)[1]
+
+        already_posted = JournalEntry.objects.filter(
+            reference_type='lease',
+            entry_type='revenue_recognition',
+            period=period,
+        ).values_list('reference_id', flat=True)
 
-        leases = Lease.objects.filter(
+        leases = list(Lease.objects.filter(
             status='active',
             start_date__lte=run_date,
             end_date__gte=run_date,
+            unearned_revenue_account__isnull=False,
+            rental_income_account__isnull=False,
+        ).exclude(
+            id__in=already_posted
+        ).select_related(
+            'cost_center',
+            'unit__cost_center',
+            'unit__property__classification__default_cost_center',
+        ))
+
+        amounts = LeaseScheduleService.amounts_for_period(
+            leases,
+            run_date.replace(day=1),
+            run_date.replace(day=month_days),
         )
 
+        entries = []
+        missing_cost_center = []
         for lease in leases:
-            if not lease.unearned_revenue_account or not lease.rental_income_account:
-                continue
-
-            existing = JournalEntry.objects.filter(
-                reference_type='lease',
-                reference_id=lease.id,
-                entry_type='revenue_recognition',
-                period=period,
-            ).first()
-            if existing:
-                continue
-
-            amount = LeaseRevenueRecognitionService._calculate_prorated_amount(lease, run_date)
+            amount = amounts[lease.id]
             if amount <= Decimal('0.00'):
                 continue
 
-            cost_center = lease.cost_center or LeaseService._get_or_create_cost_center(
-                lease.unit,
-                lease.unit.property
-            )
-            if lease.cost_center_id != cost_center.id:
-                lease.cost_center = cost_center
-                lease.save(update_fields=['cost_center'])
+            if not lease.cost_center:
+                lease.cost_center = LeaseService._get_or_create_cost_center(
+                    lease.unit,
+                    lease.unit.property
+                )
+                lease.updated_at = timezone.now()
+                missing_cost_center.append(lease)
 
-            entry = JournalEntry.objects.create(
-                entry_type='revenue_recognition',
-                reference_type='lease',
-                reference_id=lease.id,
-                period=period,
-                description=f"Lease {lease.lease_number} revenue recognition {period}",
-            )
+            line_defaults = {
+                'cost_center': lease.cost_center,
+                'reference_type': 'lease',
+                'reference_id': lease.id,
+            }
+            entries.append({
+                'entry_type': 'revenue_recognition',
+                'reference_type': 'lease',
+                'reference_id': lease.id,
+                'period': period,
+                'description': f"Lease {lease.lease_number} revenue recognition {period}",
+                'lines': [
+                    {'account_id': lease.unearned_revenue_account_id, 'debit': amount, 'credit': Decimal('0.00'), **line_defaults},
+                    {'account_id': lease.rental_income_account_id, 'debit': Decimal('0.00'), 'credit': amount, **line_defaults},
+                ],
+            })
 
-            JournalLine.objects.create(
-                journal_entry=entry,
-                account=lease.unearned_revenue_account,
-                debit=amount,
-                credit=Decimal('0.00'),
-                cost_center=cost_center,
-                reference_type='lease',
-                reference_id=lease.id,
-            )
+        if missing_cost_center:
+            Lease.objects.bulk_update(missing_cost_center, ['cost_center', 'updated_at'])
+        if not progress:
+            return post_journal_entries(entries)
 
-            JournalLine.objects.create(
-                journal_entry=entry,
-                account=lease.rental_income_account,
-                debit=Decimal('0.00'),
-                credit=amount,
-                cost_center=cost_center,
-                reference_type='lease',
-                reference_id=lease.id,
-            )
-    
-    @staticmethod
-    @transaction.atomic
-    def complete_early_termination(termination):
-        """
-        Complete early termination with accounting entry:
-        
-        Debit:  Unearned Revenue Account
-        Debit:  Refundable Security Deposit Account
-        Credit: Tenant Account
-        Credit: Post-Dated Cheques Account (if applicable)
-        Credit: Early Termination Penalties Account
-        Credit: Maintenance Charges Account
-        
-        Requires: unearned_revenue_account, deposit_account, tenant_account, penalty_account
-        """
-        required_accounts = [
-            termination.unearned_revenue_account,
-            termination.deposit_account,
-            termination.tenant_account,
-            termination.penalty_account
-        ]
-        
-        if any(acc is None for acc in required_accounts):
-            raise ValueError('Unearned Revenue, Deposit, Tenant, and Penalty accounts are required for early termination')
-        
-        # Get or create cost center
-        cost_center = LeaseTerminationService._get_or_create_cost_center(
-            termination.lease.unit,
-            termination.lease.unit.property
-        )
-        
-        # Create journal entry
-        journal_entry = JournalEntry.objects.create(
-            entry_type='prepaid',
-            reference_type='lease_termination',
-            reference_id=termination.id,
-            description=f"Lease {termination.lease.lease_number} early termination - Unearned revenue reversal"
-        )
-        
-        # Debit: Unearned Revenue (income reversal)
-        JournalLine.objects.create(
-            journal_entry=journal_entry,
-            account=termination.unearned_revenue_account,
-            debit=termination.unearned_rent,
-            cost_center=cost_center,
-            reference_type='lease_termination',
-            reference_id=termination.id
-        )
-        
-        # Debit: Refundable Security Deposit (liability reduction)
-        JournalLine.objects.create(
-            journal_entry=journal_entry,
-            account=termination.deposit_account,
-            debit=termination.refundable_amount,
-            cost_center=cost_center,
-            reference_type='lease_termination',
-            reference_id=termination.id
-        )
-        
-        # Calculate total credits
-        total_debits = termination.unearned_rent + termination.refundable_amount
-        total_credits = total_debits  # Must balance
-        
-        # Allocate credits: tenant, post-dated cheques, penalties, maintenance
-        refund_to_tenant = total_credits - termination.early_termination_penalty - termination.maintenance_charges
-        
-        # Credit: Tenant Account
-        JournalLine.objects.create(
-            journal_entry=journal_entry,
-            account=termination.tenant_account,
-            credit=max(refund_to_tenant, 0),  # Only if positive
-            cost_center=cost_center,
-            reference_type='lease_termination',
-            reference_id=termination.id
-        )
-        
-        # Credit: Post-Dated Cheques (if applicable and adjusted)
-        if termination.post_dated_cheques_adjusted and termination.post_dated_cheques_account:
-            # Calculate amount based on uncleared cheques
-            pdc_amount = min(termination.unearned_rent, total_credits)
-            if pdc_amount > 0:
-                JournalLine.objects.create(
-                    journal_entry=journal_entry,
-                    account=termination.post_dated_cheques_account,
-                    credit=pdc_amount,
-                    cost_center=cost_center,
-                    reference_type='lease_termination',
-                    reference_id=termination.id
-                )
-        
-        # Credit: Early Termination Penalties
-        if termination.early_termination_penalty:
-            JournalLine.objects.create(
-                journal_entry=journal_entry,
-                account=termination.penalty_account,
-                credit=termination.early_termination_penalty,
-                cost_center=cost_center,
-                reference_type='lease_termination',
-                reference_id=termination.id
-            )
-        
-        # Credit: Maintenance Charges (if applicable)
-        if termination.maintenance_charges and termination.maintenance_charges_account:
-            JournalLine.objects.create(
-                journal_entry=journal_entry,
-                account=termination.maintenance_charges_account,
-                credit=termination.maintenance_charges,
-                cost_center=cost_center,
-                reference_type='lease_termination',
-                reference_id=termination.id
-            )
-        
-        termination.accounting_posted = True
-        termination.save()
-        
-        return journal_entry
-    
-    @staticmethod
-    def _get_or_create_cost_center(unit, property_obj):
-        """Get or create cost center for termination"""
-        if unit and unit.cost_center:
-            return unit.cost_center
-        
-        if unit:
-            code = f"CC-UNIT-{unit.id:04d}"
-            name = f"{unit.property.name} - {unit.unit_number}"
-        else:
-            code = f"CC-PROP-{property_obj.id:04d}"
-            name = f"{property_obj.name} - Property"
-        
-        cost_center, created = CostCenter.objects.get_or_create(
-            code=code,
-            defaults={'name': name}
-        )
-        return cost_center
+        posted = []
+        progress(0, len(entries))
+        for offset in range(0, len(entries), chunk_size):
+            posted += post_journal_entries(entries[offset:offset + chunk_size])
+            progress(len(posted), len(entries))
+        return posted
 
 
 class ReceiptVoucherService:
     """Service for receipt voucher (tenant payment) accounting"""
     
     @staticmethod
+    @profiled
     @transaction.atomic
     def post_receipt_voucher(receipt_voucher):
         """
@@ -526,13 +986,8 @@ class ReceiptVoucherService:
             cost_center = receipt_voucher.tenant.unit.cost_center
         
         if not cost_center:
-            # Create default cost center
-            code = f"CC-TENANT-{receipt_voucher.tenant.id:04d}"
-            name = f"Tenant {receipt_voucher.tenant.first_name} {receipt_voucher.tenant.last_name}"
-            cost_center, created = CostCenter.objects.get_or_create(
-                code=code,
-                defaults={'name': name}
-            )
+            # Fall back to the tenant's own cost center
+            cost_center = CostCenterProvisioningService.for_tenant(receipt_voucher.tenant)
         
         # Create journal entry
         journal_entry = JournalEntry.objects.create(
@@ -565,7 +1020,7 @@ class ReceiptVoucherService:
         receipt_voucher.accounting_posted = True
         if receipt_voucher.status == 'draft':
             receipt_voucher.status = 'submitted'
-        receipt_voucher.save(update_fields=['accounting_posted', 'status', 'tenant_account'])
+        receipt_voucher.save(update_fields=['accounting_posted', 'status', 'tenant_account', 'updated_at'])
         
         return journal_entry
 
@@ -580,6 +1035,7 @@ class RentalLegalCaseService:
         'closed_tenant_won': [],
         'closed_owner_won': [],
     }
+    OPEN_STATUSES = ['filed', 'in_progress', 'judgment_passed']
     
     @staticmethod
     @transaction.atomic
@@ -600,10 +1056,6 @@ class RentalLegalCaseService:
         if lease and lease.tenant_id != tenant.id:
             raise ValueError('Selected lease does not belong to the selected tenant.')
         
-        # Refresh unit to ensure cost_center is populated (auto-created in Unit.save())
-        if unit:
-            unit.refresh_from_db()
-        
         # Get cost center from unit
         cost_center = unit.cost_center if unit else None
         if not cost_center:
@@ -622,6 +1074,7 @@ class RentalLegalCaseService:
             current_status='filed',
             court_name=case_data.get('court_name', ''),
             remarks=case_data.get('remarks', ''),
+            last_status_change_at=timezone.now(),
             created_by=created_by,
         )
         
@@ -673,8 +1126,10 @@ class RentalLegalCaseService:
                 f"Allowed transitions: {', '.join(allowed_next) if allowed_next else 'None (case closed)'}"
             )
         
-        # Update status
+        # Update status and the denormalized history summary
         legal_case.current_status = new_status
+        legal_case.last_status_change_at = timezone.now()
+        legal_case.status_change_count += 1
         legal_case.save()
         
         # Update unit status
@@ -696,21 +1151,571 @@ class RentalLegalCaseService:
         """
         Update unit status based on legal case status.
         """
-        unit = legal_case.unit
-        
-        # Map case status to unit status
-        status_map = {
-            'filed': 'under_legal_case',
-            'in_progress': 'under_legal_case',
-            'judgment_passed': 'blocked',
-            'closed_tenant_won': 'occupied',
-            'closed_owner_won': 'vacant',
-        }
-        
-        new_unit_status = status_map.get(legal_case.current_status, 'under_legal_case')
-        
-        if unit.status != new_unit_status:
-            unit.status = new_unit_status
-            unit.save(update_fields=['status'])
-        
+        return UnitStatusService.sync_unit(legal_case.unit)
+
+
+class UnitStatusService:
+    """
+    Projects unit status from the active lease and open legal cases.
+
+    Open cases take precedence (judgment passed -> blocked, filed or in
+    progress -> under legal case). Otherwise a unit with an active lease is
+    occupied, unless the owner won an eviction case on that lease. Units
+    under maintenance keep that status; everything else is vacant.
+    Statuses are written with queryset updates, and only where they differ.
+    UnitSerializer rejects statuses the projection would overwrite.
+    """
+
+    MANUAL_STATUSES = ['maintenance']
+    UPDATE_BATCH_SIZE = 500
+
+    @staticmethod
+    def derived_status_expression(keep_manual=True):
+        cases = RentalLegalCase.objects.filter(unit=OuterRef('pk'))
+        active_leases = Lease.objects.filter(unit=OuterRef('pk'), status='active').exclude(
+            legal_cases__current_status='closed_owner_won'
+        )
+        whens = [
+            When(Exists(cases.filter(current_status='judgment_passed')), then=Value('blocked')),
+            When(Exists(cases.filter(current_status__in=['filed', 'in_progress'])), then=Value('under_legal_case')),
+            When(Exists(active_leases), then=Value('occupied')),
+        ]
+        if keep_manual:
+            whens.append(When(status__in=UnitStatusService.MANUAL_STATUSES, then=F('status')))
+        return Case(*whens, default=Value('vacant'), output_field=CharField())
+
+    @staticmethod
+    def derived_status(unit_id):
+        """Status implied by the unit's leases and legal cases, ignoring manual statuses"""
+        if unit_id is None:
+            return 'vacant'
+        return Unit.objects.filter(pk=unit_id).annotate(
+            derived_status=UnitStatusService.derived_status_expression(keep_manual=False)
+        ).values_list('derived_status', flat=True).first() or 'vacant'
+
+    @staticmethod
+    @profiled
+    def project(unit_ids=None):
+        """
+        Recompute status for the given units (all units when None) and
+        write only the ones that changed.
+
+        Returns a dict of unit id -> new status for changed units.
+        """
+        units = Unit.objects.all() if unit_ids is None else Unit.objects.filter(pk__in=list(unit_ids))
+        changes = dict(
+            units.annotate(derived_status=UnitStatusService.derived_status_expression())
+            .exclude(status=F('derived_status'))
+            .values_list('pk', 'derived_status')
+        )
+
+        by_status = defaultdict(list)
+        for unit_id, new_status in changes.items():
+            by_status[new_status].append(unit_id)
+
+        now = timezone.now()
+        batch_size = UnitStatusService.UPDATE_BATCH_SIZE
+        for new_status, ids in by_status.items():
+            for offset in range(0, len(ids), batch_size):
+                Unit.objects.filter(pk__in=ids[offset:offset + batch_size]).update(
+                    status=new_status,
+                    updated_at=now,
+                )
+        if changes:
+            # Queryset updates skip post_save; keep version-keyed caches (dashboard) in step
+            transaction.on_commit(lambda: bump_version(Unit))
+        return changes
+
+    @staticmethod
+    def sync_unit(unit):
+        """Project a single unit and reflect the result on the instance"""
+        changes = UnitStatusService.project([unit.pk])
+        if unit.pk in changes:
+            unit.status = changes[unit.pk]
         return unit
+
+
+class PortfolioImportService:
+    """
+    Bulk onboarding of properties, units and tenants from CSV/XLSX files.
+
+    Rows are streamed and handled in chunks. Each chunk is validated against
+    in-memory lookups of the existing keys (property_id, property_id +
+    unit_number, tenant email), upserted with bulk_create/bulk_update and has
+    its cost centers provisioned in bulk. Chunks commit independently so an
+    interrupted import can resume after the last completed row.
+
+    Blank cells never overwrite existing values; on create they fall back to
+    the model defaults.
+    """
+
+    KINDS = ('properties', 'units', 'tenants')
+    CHUNK_SIZE = 1000
+    # bulk_update builds one CASE per field and batch; small batches keep that linear
+    UPDATE_BATCH_SIZE = 200
+    MAX_REPORTED_ERRORS = 1000
+
+    PROPERTY_FIELDS = [
+        'property_id', 'name', 'description', 'property_type', 'status', 'street_address', 'city', 'state',
+        'zip_code', 'country', 'purchase_price', 'market_value', 'total_area', 'built_area',
+        'number_of_units', 'year_built', 'acquisition_date',
+    ]
+    UNIT_FIELDS = ['unit_number', 'unit_type', 'status', 'area', 'bedrooms', 'bathrooms', 'monthly_rent']
+    TENANT_FIELDS = [
+        'first_name', 'last_name', 'email', 'phone', 'move_in_date', 'move_out_date',
+        'emergency_contact', 'emergency_contact_phone', 'ledger_account_type',
+    ]
+
+    @staticmethod
+    def _normalize_header(name):
+        return str(name or '').strip().lower().replace(' ', '_')
+
+    @staticmethod
+    def read_rows(file_obj, filename):
+        """Yield (line number, row dict) pairs from a CSV or XLSX file with a header row"""
+        if filename.lower().endswith(('.xlsx', '.xlsm')):
+            return PortfolioImportService._read_xlsx(file_obj)
+        return PortfolioImportService._read_csv(file_obj)
+
+    @staticmethod
+    def _read_csv(file_obj):
+        reader = csv.reader(codecs.iterdecode(file_obj, 'utf-8-sig'))
+        header = [PortfolioImportService._normalize_header(name) for name in next(reader, [])]
+        for values in reader:
+            if not any(value.strip() for value in values):
+                continue
+            yield reader.line_num, dict(zip(header, values))
+
+    @staticmethod
+    def _read_xlsx(file_obj):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ValueError('XLSX import requires openpyxl; upload a CSV file instead.')
+
+        workbook = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [PortfolioImportService._normalize_header(name) for name in next(rows, ())]
+            for line, values in enumerate(rows, start=2):
+                if all(value is None or str(value).strip() == '' for value in values):
+                    continue
+                # Excel stores every number as a float; keep unit numbers like 101 as "101"
+                values = [int(value) if isinstance(value, float) and value.is_integer() else value for value in values]
+                yield line, dict(zip(header, values))
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _clean(model, row, field_names):
+        """
+        Coerce and validate the non-blank cells of a row with the model field rules.
+
+        Returns (values, errors, missing) where missing lists required fields
+        left blank (only relevant when the row creates a record).
+        """
+        values, errors, missing = {}, [], []
+        for name in field_names:
+            field = model._meta.get_field(name)
+            raw = row.get(name)
+            if isinstance(raw, str):
+                raw = raw.strip()
+            if raw is None or raw == '':
+                if not field.blank and not field.has_default():
+                    missing.append(name)
+                continue
+            try:
+                values[name] = field.clean(raw, None)
+            except ValidationError as exc:
+                errors.append(f"{name}: {' '.join(exc.messages)}")
+        return values, errors, missing
+
+    @staticmethod
+    def _key(row, name):
+        value = row.get(name)
+        return str(value).strip() if value is not None else ''
+
+    @staticmethod
+    def _fail(result, line, errors):
+        result['error_count'] += 1
+        if len(result['errors']) < PortfolioImportService.MAX_REPORTED_ERRORS:
+            result['errors'].append({'row': line, 'errors': errors})
+
+    @staticmethod
+    def _save(model, creates, updates, update_fields):
+        if creates:
+            model.objects.bulk_create(creates, batch_size=PortfolioImportService.CHUNK_SIZE)
+        if updates:
+            model.objects.bulk_update(
+                updates, sorted(update_fields), batch_size=PortfolioImportService.UPDATE_BATCH_SIZE
+            )
+            # One shared timestamp; keeping it out of bulk_update avoids a per-row CASE
+            model.objects.filter(pk__in=[record.pk for record in updates]).update(updated_at=timezone.now())
+        if creates or updates:
+            SearchIndexService.index_records(model, [record.pk for record in creates + updates])
+            transaction.on_commit(lambda: bump_version(model))
+
+    @staticmethod
+    def _apply(record, values, update_fields):
+        """Copy changed values onto an existing record, returning whether anything changed"""
+        changed = {name for name, value in values.items() if getattr(record, name) != value}
+        for name in changed:
+            setattr(record, name, values[name])
+        update_fields.update(changed)
+        return bool(changed)
+
+    @staticmethod
+    def _import_properties(chunk, result):
+        existing = {
+            prop.property_id: prop
+            for prop in Property.objects.filter(
+                property_id__in={PortfolioImportService._key(row, 'property_id') for _, row in chunk}
+            )
+        }
+        creates, updates, update_fields, seen = [], [], set(), set()
+        for line, row in chunk:
+            values, errors, missing = PortfolioImportService._clean(
+                Property, row, PortfolioImportService.PROPERTY_FIELDS
+            )
+            key = values.get('property_id')
+            if key in seen:
+                errors.append(f"property_id: {key} appears more than once in this chunk")
+            prop = existing.get(key)
+            if not prop and missing:
+                errors.append(f"Missing required field(s): {', '.join(missing)}")
+            if errors:
+                PortfolioImportService._fail(result, line, errors)
+                continue
+
+            seen.add(key)
+            if prop:
+                if PortfolioImportService._apply(prop, values, update_fields):
+                    updates.append(prop)
+                else:
+                    result['unchanged'] += 1
+            else:
+                creates.append(Property(**values))
+
+        PortfolioImportService._save(Property, creates, updates, update_fields)
+        result['created'] += len(creates)
+        result['updated'] += len(updates)
+
+    @staticmethod
+    def _lookup_units(chunk):
+        """Resolve the property_id/unit_number cells of a chunk to properties and existing units"""
+        properties = {
+            prop.property_id: prop
+            for prop in Property.objects.filter(
+                property_id__in={PortfolioImportService._key(row, 'property_id') for _, row in chunk}
+            ).only('id', 'property_id', 'name')
+        }
+        units = {}
+        unit_numbers = {PortfolioImportService._key(row, 'unit_number') for _, row in chunk}
+        if properties:
+            for unit in Unit.objects.filter(
+                property__in=properties.values(), unit_number__in=unit_numbers
+            ).select_related('property'):
+                units[(unit.property_id, unit.unit_number)] = unit
+        return properties, units
+
+    @staticmethod
+    def _import_units(chunk, result):
+        properties, existing = PortfolioImportService._lookup_units(chunk)
+        creates, updates, update_fields, seen = [], [], set(), set()
+        for line, row in chunk:
+            values, errors, missing = PortfolioImportService._clean(Unit, row, PortfolioImportService.UNIT_FIELDS)
+            property_key = PortfolioImportService._key(row, 'property_id')
+            prop = properties.get(property_key)
+            if not prop:
+                errors.append(f"property_id: unknown property '{property_key}'")
+            key = (prop.id if prop else None, values.get('unit_number'))
+            if prop and key in seen:
+                errors.append(f"unit_number: {key[1]} appears more than once for {property_key} in this chunk")
+            unit = existing.get(key)
+            if not unit and missing:
+                errors.append(f"Missing required field(s): {', '.join(missing)}")
+            if errors:
+                PortfolioImportService._fail(result, line, errors)
+                continue
+
+            seen.add(key)
+            if unit:
+                if PortfolioImportService._apply(unit, values, update_fields):
+                    updates.append(unit)
+                else:
+                    result['unchanged'] += 1
+            else:
+                creates.append(Unit(property=prop, **values))
+
+        PortfolioImportService._save(Unit, creates, updates, update_fields)
+        units = creates + updates
+        CostCenterProvisioningService.provision_units(units)
+        UnitStatusService.project([unit.pk for unit in units])
+        result['created'] += len(creates)
+        result['updated'] += len(updates)
+
+    @staticmethod
+    def _import_tenants(chunk, result):
+        existing = {}
+        for tenant in Tenant.objects.filter(
+            email__in={PortfolioImportService._key(row, 'email') for _, row in chunk}
+        ).order_by('-id'):
+            existing[tenant.email] = tenant
+
+        properties, units = PortfolioImportService._lookup_units(
+            [(line, row) for line, row in chunk if PortfolioImportService._key(row, 'unit_number')]
+        )
+        occupied = dict(
+            Tenant.objects.filter(unit__in=list(units.values())).values_list('unit_id', 'id')
+        ) if units else {}
+
+        creates, updates, update_fields, seen, claimed = [], [], set(), set(), set()
+        for line, row in chunk:
+            values, errors, missing = PortfolioImportService._clean(
+                Tenant, row, PortfolioImportService.TENANT_FIELDS
+            )
+            key = values.get('email')
+            if key in seen:
+                errors.append(f"email: {key} appears more than once in this chunk")
+            tenant = existing.get(key)
+            if not tenant and missing:
+                errors.append(f"Missing required field(s): {', '.join(missing)}")
+
+            unit_number = PortfolioImportService._key(row, 'unit_number')
+            if unit_number:
+                property_key = PortfolioImportService._key(row, 'property_id')
+                prop = properties.get(property_key)
+                unit = units.get((prop.id, unit_number)) if prop else None
+                if not unit:
+                    errors.append(f"unit_number: unknown unit '{unit_number}' in property '{property_key}'")
+                elif unit.id in claimed or occupied.get(unit.id, getattr(tenant, 'id', None)) != getattr(tenant, 'id', None):
+                    errors.append(f"unit_number: unit '{unit_number}' is already assigned to another tenant")
+                else:
+                    values['unit'] = unit
+
+            if errors:
+                PortfolioImportService._fail(result, line, errors)
+                continue
+
+            seen.add(key)
+            if 'unit' in values:
+                claimed.add(values['unit'].id)
+            if tenant:
+                if PortfolioImportService._apply(tenant, values, update_fields):
+                    updates.append(tenant)
+                else:
+                    result['unchanged'] += 1
+            else:
+                creates.append(Tenant(**values))
+
+        # bulk_create/bulk_update bypass Tenant.save()
+        for tenant in creates + updates:
+            tenant.refresh_name_keys()
+        if update_fields & {'first_name', 'last_name'}:
+            update_fields.update(Tenant.NAME_KEY_FIELDS)
+        PortfolioImportService._save(Tenant, creates, updates, update_fields)
+        CostCenterProvisioningService.provision_tenants(creates + updates)
+        result['created'] += len(creates)
+        result['updated'] += len(updates)
+
+    @staticmethod
+    def new_result(kind):
+        return {'kind': kind, 'rows': 0, 'created': 0, 'updated': 0, 'unchanged': 0, 'error_count': 0, 'errors': []}
+
+    @staticmethod
+    def run(kind, rows, chunk_size=None, skip_rows=0, result=None, on_chunk=None):
+        """
+        Import (line, row) pairs of the given kind.
+
+        The first ``skip_rows`` data rows are skipped (resume support) and
+        ``on_chunk(result)`` is called after every committed chunk.
+        """
+        if kind not in PortfolioImportService.KINDS:
+            raise ValueError(f"Unknown import kind '{kind}'. Expected one of: {', '.join(PortfolioImportService.KINDS)}")
+
+        handler = {
+            'properties': PortfolioImportService._import_properties,
+            'units': PortfolioImportService._import_units,
+            'tenants': PortfolioImportService._import_tenants,
+        }[kind]
+        chunk_size = chunk_size or PortfolioImportService.CHUNK_SIZE
+        result = result or PortfolioImportService.new_result(kind)
+
+        def flush(chunk):
+            with transaction.atomic():
+                handler(chunk, result)
+            result['rows'] += len(chunk)
+            if on_chunk:
+                on_chunk(result)
+
+        chunk = []
+        for index, item in enumerate(rows):
+            if index < skip_rows:
+                continue
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+        return result
+
+
+class DashboardService:
+    """
+    Portfolio KPIs for the dashboard, from grouped aggregate queries.
+
+    The result is cached for CACHE_TIMEOUT seconds under a key built from
+    the core caching versions of the source models, so any save or delete
+    (and the bulk writes that bump versions explicitly) invalidates it.
+    """
+    CACHE_TIMEOUT = 60
+    SOURCE_MODELS = (Property, Unit, Maintenance, Rent, RentalLegalCase)
+    OPEN_MAINTENANCE_STATUSES = ['pending', 'in_progress']
+    OPEN_LEGAL_CASE_STATUSES = RentalLegalCaseService.OPEN_STATUSES
+
+    @staticmethod
+    def _counts(queryset, field, choices):
+        """Row count per choice value, zero-filled"""
+        counts = {value: 0 for value, _ in choices}
+        counts.update(queryset.order_by().values_list(field).annotate(total=Count('id')))
+        return counts
+
+    @staticmethod
+    def _amount(value):
+        return float(value or 0)
+
+    @staticmethod
+    def kpis(today=None):
+        today = today or timezone.localdate()
+        versions = ':'.join(str(version) for version in get_versions(DashboardService.SOURCE_MODELS))
+        cache_key = f"property-dashboard:{today:%Y-%m-%d}:{hashlib.md5(versions.encode()).hexdigest()}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        properties = DashboardService._counts(Property.objects.all(), 'status', Property.STATUS_CHOICES)
+        units = DashboardService._counts(Unit.objects.all(), 'status', Unit.UNIT_STATUS_CHOICES)
+        total_units = sum(units.values())
+
+        open_maintenance = DashboardService._counts(
+            Maintenance.objects.filter(status__in=DashboardService.OPEN_MAINTENANCE_STATUSES),
+            'priority', Maintenance.PRIORITY_CHOICES,
+        )
+
+        month_start = today.replace(day=1)
+        month_end = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+        zero = Value(Decimal('0'), output_field=DecimalField(max_digits=14, decimal_places=2))
+        this_month = Q(due_date__range=(month_start, month_end))
+        rent = Rent.objects.aggregate(
+            due=Coalesce(Sum('amount', filter=this_month), zero),
+            collected=Coalesce(Sum('paid_amount', filter=this_month), zero),
+            unpaid_count=Count('id', filter=~Q(status='paid')),
+            overdue_count=Count('id', filter=~Q(status='paid') & Q(due_date__lt=today)),
+        )
+
+        legal_cases = DashboardService._counts(
+            RentalLegalCase.objects.filter(current_status__in=DashboardService.OPEN_LEGAL_CASE_STATUSES),
+            'current_status',
+            [choice for choice in RentalLegalCase.STATUS_CHOICES
+             if choice[0] in DashboardService.OPEN_LEGAL_CASE_STATUSES],
+        )
+
+        result = {
+            'as_of': today.isoformat(),
+            'properties': {'total': sum(properties.values()), 'by_status': properties},
+            'occupancy': {
+                'total_units': total_units,
+                'occupied_units': units.get('occupied', 0),
+                'occupancy_rate': round(units.get('occupied', 0) / total_units * 100, 1) if total_units else 0.0,
+                'by_status': units,
+            },
+            'maintenance': {'open': sum(open_maintenance.values()), 'open_by_priority': open_maintenance},
+            'rent': {
+                'month': f'{month_start:%Y-%m}',
+                'due': DashboardService._amount(rent['due']),
+                'collected': DashboardService._amount(rent['collected']),
+                'outstanding': DashboardService._amount(rent['due'] - rent['collected']),
+                'unpaid_count': rent['unpaid_count'],
+                'overdue_count': rent['overdue_count'],
+            },
+            'legal_cases': {'open': sum(legal_cases.values()), 'open_by_status': legal_cases},
+        }
+        cache.set(cache_key, result, DashboardService.CACHE_TIMEOUT)
+        return result
+
+
+class _RecentQueries:
+    """
+    Per-process LRU of autocomplete results. Keys include the Tenant version
+    token, so any tenant write makes earlier entries unreachable and they
+    age out.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, maxsize):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TenantAutocompleteService:
+    """
+    Related-party pickers: prefix matches on the normalized "first last" and
+    "last first" name keys, each an index range scan that stops at the limit.
+    """
+    FIELDS = ('id', 'first_name', 'last_name', 'email', 'phone', 'unit_id', 'ledger_account_type')
+    KEY_FIELDS = ('name_key', 'surname_key')
+    recent = _RecentQueries()
+
+    @staticmethod
+    def _prefix(field, prefix):
+        if connection.vendor == 'sqlite':
+            # SQLite's LIKE is case-insensitive and cannot use the index; a range can
+            return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\U0010ffff'})
+        return Q(**{f'{field}__startswith': prefix})
+
+    @staticmethod
+    def search(query, limit=None, ledger_account_type=None):
+        """Up to ``limit`` tenants as dicts of FIELDS, first-name matches before surname matches"""
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+        limit = min(limit or settings.TENANT_AUTOCOMPLETE_LIMIT, settings.TENANT_AUTOCOMPLETE_MAX_LIMIT)
+        version, = get_versions([Tenant])
+        key = (version, prefix, limit, ledger_account_type)
+        results = TenantAutocompleteService.recent.get(key)
+        if results is not None:
+            return results
+
+        tenants = Tenant.objects.all()
+        if ledger_account_type:
+            tenants = tenants.filter(ledger_account_type=ledger_account_type)
+        results, seen = [], set()
+        for field in TenantAutocompleteService.KEY_FIELDS:
+            matches = tenants.filter(TenantAutocompleteService._prefix(field, prefix)).order_by(field, 'id')
+            for row in matches.values(*TenantAutocompleteService.FIELDS)[:limit]:
+                if row['id'] not in seen:
+                    seen.add(row['id'])
+                    results.append(row)
+            if len(results) >= limit:
+                break
+        results = results[:limit]
+        TenantAutocompleteService.recent.set(key, results, settings.TENANT_AUTOCOMPLETE_CACHE_SIZE)
+        return results
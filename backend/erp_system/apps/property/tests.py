@@ -1,5 +1,411 @@
-import os
-from django.core.wsgi import get_wsgi_application
+import calendar
+import random
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from io import StringIO
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "erp_system.config.settings")
-application = get_wsgi_application()
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from erp_system.apps.accounts.models import Account, JournalEntry, JournalLine
+from erp_system.apps.search.models import SearchDocument
+from erp_system.apps.search.services import SearchIndexService
+from .models import Lease, LeaseTermination, Property, Tenant, Unit
+from .services import LeaseScheduleService, LeaseTerminationService, TenantAutocompleteService, UnitStatusService
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def legacy_prorated_amount(lease, run_date):
+    """LeaseRevenueRecognitionService._calculate_prorated_amount before the schedule engine, in Decimal"""
+    month_days = calendar.monthrange(run_date.year, run_date.month)[1]
+    period_start = run_date.replace(day=1)
+    period_end = run_date.replace(day=month_days)
+
+    start_date = max(lease.start_date, period_start)
+    end_date = min(lease.end_date, period_end)
+    if end_date < start_date:
+        return Decimal('0.00')
+
+    active_days = (end_date - start_date).days + 1
+    amount = (Decimal(lease.monthly_rent) / Decimal(month_days)) * Decimal(active_days)
+    return amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def month_starts(first_day, last_day):
+    month = first_day.replace(day=1)
+    while month <= last_day:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+def month_end(month):
+    return month.replace(day=calendar.monthrange(month.year, month.month)[1])
+
+
+def random_leases(seed, count):
+    rng = random.Random(seed)
+    leases = []
+    for index in range(1, count + 1):
+        start = date(2019, 1, 1) + timedelta(days=rng.randrange(0, 365 * 7))
+        leases.append(Lease(
+            id=index,
+            start_date=start,
+            end_date=start + timedelta(days=rng.choice([rng.randrange(0, 90), rng.randrange(300, 1200)])),
+            monthly_rent=Decimal(rng.randint(1, 2_000_000)) / 100,
+        ))
+    return leases
+
+
+class LeaseScheduleTests(SimpleTestCase):
+    """The NumPy schedule engine must recognize exactly what the per-lease Decimal proration did"""
+
+    def assertMatchesLegacy(self, leases, months):
+        for month in months:
+            amounts = LeaseScheduleService.amounts_for_period(leases, month, month_end(month))
+            for lease in leases:
+                self.assertEqual(
+                    amounts[lease.id], legacy_prorated_amount(lease, month),
+                    f'{lease.start_date}..{lease.end_date} @ {lease.monthly_rent} in {month:%Y-%m}',
+                )
+
+    def test_edge_months_match_legacy(self):
+        leases = [
+            # Partial first and last months
+            Lease(id=1, start_date=date(2025, 1, 15), end_date=date(2026, 1, 14), monthly_rent=Decimal('1000.00')),
+            # February of a leap year and of a common year
+            Lease(id=2, start_date=date(2024, 2, 10), end_date=date(2025, 2, 20), monthly_rent=Decimal('2999.99')),
+            Lease(id=3, start_date=date(2024, 2, 29), end_date=date(2024, 3, 1), monthly_rent=Decimal('1234.56')),
+            Lease(id=4, start_date=date(2023, 2, 1), end_date=date(2023, 2, 28), monthly_rent=Decimal('850.00')),
+            # Single day, and a lease inside one month
+            Lease(id=5, start_date=date(2024, 12, 31), end_date=date(2024, 12, 31), monthly_rent=Decimal('3100.00')),
+            Lease(id=6, start_date=date(2026, 4, 3), end_date=date(2026, 4, 27), monthly_rent=Decimal('0.07')),
+        ]
+        self.assertMatchesLegacy(leases, list(month_starts(date(2023, 1, 1), date(2026, 6, 30))))
+
+        amounts = LeaseScheduleService.amounts_for_period(leases, date(2024, 2, 1), date(2024, 2, 29))
+        self.assertEqual(amounts[2], Decimal('2068.96'))  # 2999.99 / 29 x 20
+        self.assertEqual(amounts[3], Decimal('42.57'))    # 1234.56 / 29 x 1
+
+    def test_matches_legacy_on_random_leases(self):
+        leases = random_leases(2026, 400)
+        self.assertMatchesLegacy(leases, list(month_starts(date(2018, 12, 1), date(2029, 6, 30))))
+
+    def test_schedule_adds_up_to_lease_total(self):
+        leases = random_leases(27, 300)
+        schedules = LeaseScheduleService.build_schedules(leases)
+
+        for lease in leases:
+            rows = schedules[lease.id]
+            expected = [legacy_prorated_amount(lease, month) for month in month_starts(lease.start_date, lease.end_date)]
+            total = sum(expected, Decimal('0.00'))
+
+            self.assertEqual([row['amount'] for row in rows], expected)
+            self.assertEqual(sum(row['days_active'] for row in rows), (lease.end_date - lease.start_date).days + 1)
+            self.assertEqual(
+                LeaseScheduleService.amounts_for_period([lease], lease.start_date, lease.end_date)[lease.id], total
+            )
+            recognized = Decimal('0.00')
+            for row in rows:
+                recognized += row['amount']
+                self.assertEqual(row['cumulative_recognized'], recognized)
+                self.assertEqual(row['cumulative_recognized'] + row['remaining_unearned'], total)
+            self.assertEqual(rows[-1]['cumulative_recognized'], total)
+            self.assertEqual(rows[-1]['remaining_unearned'], Decimal('0.00'))
+
+    def test_empty_inputs(self):
+        self.assertEqual(LeaseScheduleService.build_schedules([]), {})
+        lease = Lease(id=1, start_date=date(2025, 1, 1), end_date=date(2025, 12, 31), monthly_rent=Decimal('100.00'))
+        self.assertEqual(
+            LeaseScheduleService.amounts_for_period([lease], date(2025, 3, 2), date(2025, 3, 1)), {1: Decimal('0.00')}
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class GenerateLoadDataTests(TestCase):
+    """The benchmark dataset is written with bulk_create, which skips save() and signals"""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'generate_load_data', prefix='LOADTEST', properties=1, units_per_property=4, months=1,
+            suppliers=2, supplier_invoices_per_month=2, contracts=0, stdout=StringIO(),
+        )
+
+    def test_bulk_created_tenants_have_name_keys(self):
+        self.assertFalse(Tenant.objects.filter(last_name='Loadtest', name_key='').exists())
+        tenant = Tenant.objects.get(first_name='Tenant1', last_name='Loadtest')
+        self.assertEqual((tenant.name_key, tenant.surname_key), ('tenant1 loadtest', 'loadtest tenant1'))
+
+    def test_bulk_created_tenants_are_found_by_autocomplete(self):
+        names = {(row['first_name'], row['last_name']) for row in TenantAutocompleteService.search('Tena')}
+        self.assertIn(('Tenant1', 'Loadtest'), names)
+
+        suppliers = TenantAutocompleteService.search('loadtest sup', ledger_account_type='supplier')
+        self.assertEqual(
+            sorted(row['first_name'] for row in suppliers), ['Supplier1', 'Supplier2']
+        )
+
+    def test_generated_records_are_searchable(self):
+        for kind, model in [('property', Property), ('unit', Unit), ('tenant', Tenant), ('lease', Lease)]:
+            self.assertEqual(
+                SearchDocument.objects.filter(kind=kind).count(), model.objects.count(), kind
+            )
+        self.assertTrue(SearchDocument.objects.filter(kind='receipt_voucher').exists())
+        self.assertTrue(SearchDocument.objects.filter(kind='supplier_invoice').exists())
+
+        results = SearchIndexService.search('LOADTEST-L000001')
+        self.assertEqual(results[0]['kind'], 'lease')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class LeaseTerminationSettlementTests(TestCase):
+    """Settlement amounts and the entries complete_terminations posts for them"""
+
+    ACCOUNTS = {
+        '1100': ('Tenant Receivable', 'asset'),
+        '1230': ('Post-Dated Cheques', 'asset'),
+        '2100': ('Unearned Lease Revenue', 'liability'),
+        '2200': ('Refundable Security Deposits', 'liability'),
+        '4100': ('Early Termination Penalties', 'income'),
+        '6000': ('Maintenance Expense', 'expense'),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.accounts = {
+            number: Account.objects.create(account_number=number, account_name=name, account_type=account_type)
+            for number, (name, account_type) in cls.ACCOUNTS.items()
+        }
+        cls.property = Property.objects.create(
+            property_id='TERM-P1', name='Settlement Court', property_type='residential',
+            street_address='1 Exit Road', city='Dubai', state='N/A', country='UAE', acquisition_date=date(2020, 1, 1),
+        )
+
+    def create_lease(self, number):
+        unit = Unit.objects.create(property=self.property, unit_number=number, area=Decimal('80.00'))
+        tenant = Tenant.objects.create(
+            unit=unit, first_name='Settle', last_name=number, email=f'{number}@example.com', phone='555-0101',
+            move_in_date=date(2025, 1, 1),
+        )
+        return Lease.objects.create(
+            lease_number=f'TERM-L{number}', unit=unit, tenant=tenant, status='active',
+            start_date=date(2025, 1, 1), end_date=date(2025, 12, 31),
+            monthly_rent=Decimal('1000.00'), security_deposit=Decimal('2000.00'),
+            unearned_revenue_account=self.accounts['2100'], refundable_deposit_account=self.accounts['2200'],
+        )
+
+    def create_termination(self, number, termination_type, termination_date, **fields):
+        values = {
+            'original_security_deposit': Decimal('2000.00'),
+            'refundable_amount': Decimal('2000.00'),
+            'penalty_account': self.accounts['4100'],
+            'maintenance_charges_account': self.accounts['6000'],
+            'post_dated_cheques_account': self.accounts['1230'],
+            **fields,
+        }
+        return LeaseTermination.objects.create(
+            lease=self.create_lease(number), termination_type=termination_type,
+            termination_date=termination_date, status='approved', **values,
+        )
+
+    def posted_lines(self, termination):
+        lines = JournalLine.objects.filter(reference_type='lease_termination', reference_id=termination.pk)
+        return {line.account.account_number: (line.debit, line.credit) for line in lines.select_related('account')}
+
+    def assertBalanced(self, lines):
+        self.assertEqual(sum(debit for debit, _ in lines.values()), sum(credit for _, credit in lines.values()))
+
+    def test_normal_settlement_ignores_penalty(self):
+        termination = self.create_termination(
+            'N1', 'normal', date(2025, 12, 31),
+            early_termination_penalty=Decimal('500.00'), maintenance_charges=Decimal('300.00'),
+        )
+        completed, errors = LeaseTerminationService.complete_terminations([termination.pk])
+
+        self.assertEqual(errors, {})
+        self.assertEqual([record.pk for record in completed], [termination.pk])
+        termination.refresh_from_db()
+        self.assertEqual(
+            (termination.unearned_rent, termination.early_termination_penalty, termination.net_refund),
+            (Decimal('0.00'), Decimal('0.00'), Decimal('1700.00')),
+        )
+        lines = self.posted_lines(termination)
+        self.assertEqual(lines, {
+            '2200': (Decimal('2000.00'), Decimal('0.00')),
+            '6000': (Decimal('0.00'), Decimal('300.00')),
+            '1100': (Decimal('0.00'), Decimal('1700.00')),
+        })
+        self.assertEqual(Lease.objects.get(pk=termination.lease_id).status, 'terminated')
+
+    def test_early_settlement_adjusts_cancelled_cheques(self):
+        # 15 unearned days of June (1000 / 30 x 15) and July to December
+        termination = self.create_termination(
+            'E1', 'early', date(2025, 6, 15),
+            early_termination_penalty=Decimal('1000.00'), post_dated_cheques_adjusted=True,
+        )
+        settlement = LeaseTerminationService.calculate_settlements(
+            LeaseTermination.objects.select_related('lease').filter(pk=termination.pk)
+        )[termination.pk]
+        self.assertEqual(settlement['unearned_rent'], Decimal('6500.00'))
+        self.assertEqual(settlement['net_refund'], Decimal('7500.00'))
+        self.assertEqual(
+            settlement['unearned_rent'],
+            LeaseScheduleService.unearned_after(termination.lease, termination.termination_date),
+        )
+
+        completed, errors = LeaseTerminationService.complete_terminations([termination.pk])
+        self.assertEqual(errors, {})
+        lines = self.posted_lines(termination)
+        self.assertEqual(lines, {
+            '2200': (Decimal('2000.00'), Decimal('0.00')),
+            '2100': (Decimal('6500.00'), Decimal('0.00')),
+            '4100': (Decimal('0.00'), Decimal('1000.00')),
+            '1230': (Decimal('0.00'), Decimal('6500.00')),
+            '1100': (Decimal('0.00'), Decimal('1000.00')),
+        })
+        self.assertBalanced(lines)
+
+    def test_early_settlement_without_cheque_adjustment_refunds_tenant(self):
+        termination = self.create_termination(
+            'E2', 'early', date(2025, 6, 15), early_termination_penalty=Decimal('1000.00'),
+        )
+        LeaseTerminationService.complete_terminations([termination.pk])
+        lines = self.posted_lines(termination)
+        self.assertNotIn('1230', lines)
+        self.assertEqual(lines['1100'], (Decimal('0.00'), Decimal('7500.00')))
+        self.assertBalanced(lines)
+
+    def test_charges_exceeding_refund_debit_the_tenant(self):
+        normal = self.create_termination('C1', 'normal', date(2025, 12, 31), maintenance_charges=Decimal('2500.00'))
+        early = self.create_termination(
+            'C2', 'early', date(2025, 12, 15), early_termination_penalty=Decimal('3000.00'),
+            maintenance_charges=Decimal('100.00'), post_dated_cheques_adjusted=True,
+        )
+        completed, errors = LeaseTerminationService.complete_terminations([normal.pk, early.pk])
+        self.assertEqual(errors, {})
+        self.assertEqual(len(completed), 2)
+
+        lines = self.posted_lines(normal)
+        self.assertEqual(lines['1100'], (Decimal('500.00'), Decimal('0.00')))
+        self.assertBalanced(lines)
+
+        # 2000 + 516.13 unearned - 3000 - 100: nothing is left to set against cancelled cheques
+        lines = self.posted_lines(early)
+        self.assertEqual(lines['2100'], (Decimal('516.13'), Decimal('0.00')))
+        self.assertNotIn('1230', lines)
+        self.assertEqual(lines['1100'], (Decimal('583.87'), Decimal('0.00')))
+        self.assertBalanced(lines)
+        early.refresh_from_db()
+        self.assertEqual(early.net_refund, Decimal('-583.87'))
+
+    def test_missing_account_is_reported_per_termination(self):
+        missing = self.create_termination(
+            'M1', 'early', date(2025, 6, 15), early_termination_penalty=Decimal('1000.00'), penalty_account=None,
+        )
+        valid = self.create_termination('M2', 'normal', date(2025, 12, 31))
+
+        completed, errors = LeaseTerminationService.complete_terminations([missing.pk, valid.pk])
+
+        self.assertEqual(errors, {missing.pk: 'Penalty account is required.'})
+        self.assertEqual([record.pk for record in completed], [valid.pk])
+        missing.refresh_from_db()
+        self.assertEqual((missing.status, missing.accounting_posted), ('approved', False))
+        self.assertEqual(self.posted_lines(missing), {})
+        self.assertTrue(self.posted_lines(valid))
+
+    def test_completing_twice_posts_nothing_more(self):
+        termination = self.create_termination('T1', 'normal', date(2025, 12, 31))
+        LeaseTerminationService.complete_terminations([termination.pk])
+        entries = JournalEntry.objects.count()
+
+        completed, errors = LeaseTerminationService.complete_terminations([termination.pk])
+        self.assertEqual(completed, [])
+        self.assertEqual(errors, {termination.pk: 'Only approved terminations can be completed.'})
+        self.assertEqual(JournalEntry.objects.count(), entries)
+
+    def test_already_posted_termination_completes_without_an_entry(self):
+        termination = self.create_termination(
+            'P1', 'normal', date(2025, 12, 31), accounting_posted=True, net_refund=Decimal('2000.00'),
+        )
+        entries = JournalEntry.objects.count()
+
+        completed, errors = LeaseTerminationService.complete_terminations([termination.pk, termination.pk])
+
+        self.assertEqual(errors, {})
+        self.assertEqual([record.pk for record in completed], [termination.pk])
+        self.assertIsNone(completed[0].journal_entry)
+        self.assertEqual(JournalEntry.objects.count(), entries)
+        termination.refresh_from_db()
+        self.assertEqual(termination.status, 'completed')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class UnitStatusApiTests(TestCase):
+    """Clients may set a status only where the projection from leases and legal cases keeps it"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='units', password='units')
+        cls.property = Property.objects.create(
+            property_id='STAT-P1', name='Status House', property_type='residential',
+            street_address='2 Status Road', city='Dubai', state='N/A', country='UAE', acquisition_date=date(2020, 1, 1),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_unit(self, number, status):
+        return self.client.post(
+            '/api/property/units/', {'property': self.property.pk, 'unit_number': number, 'area': '60.00', 'status': status},
+            format='json',
+        )
+
+    def set_status(self, unit, status):
+        return self.client.patch(f'/api/property/units/{unit.pk}/', {'status': status}, format='json')
+
+    def test_create_accepts_manual_and_implied_statuses_only(self):
+        self.assertEqual(self.create_unit('S1', 'occupied').status_code, 400)
+        self.assertEqual(self.create_unit('S1', 'blocked').status_code, 400)
+        self.assertFalse(Unit.objects.filter(unit_number='S1').exists())
+
+        response = self.create_unit('S1', 'maintenance')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['status'], 'maintenance')
+        self.assertEqual(self.create_unit('S2', 'vacant').status_code, 201)
+
+    def test_derived_statuses_are_rejected_on_update(self):
+        unit = Unit.objects.create(property=self.property, unit_number='S3', area=Decimal('60.00'))
+        for status in ('occupied', 'blocked', 'under_legal_case'):
+            response = self.set_status(unit, status)
+            self.assertEqual(response.status_code, 400, status)
+            self.assertIn('status', response.data)
+        unit.refresh_from_db()
+        self.assertEqual(unit.status, 'vacant')
+
+        self.assertEqual(self.set_status(unit, 'maintenance').data['status'], 'maintenance')
+        self.assertEqual(self.set_status(unit, 'vacant').data['status'], 'vacant')
+
+    def test_leased_unit_keeps_its_projected_status(self):
+        unit = Unit.objects.create(property=self.property, unit_number='S4', area=Decimal('60.00'))
+        tenant = Tenant.objects.create(
+            unit=unit, first_name='Status', last_name='Tenant', email='status@example.com', phone='555-0102',
+            move_in_date=date(2026, 1, 1),
+        )
+        Lease.objects.create(
+            lease_number='STAT-L1', unit=unit, tenant=tenant, status='active',
+            start_date=date(2026, 1, 1), end_date=date(2026, 12, 31),
+            monthly_rent=Decimal('1000.00'), security_deposit=Decimal('1000.00'),
+        )
+        self.assertEqual(UnitStatusService.project([unit.pk]), {unit.pk: 'occupied'})
+
+        # The unit form resubmits the status it was loaded with
+        self.assertEqual(self.set_status(unit, 'occupied').status_code, 200)
+        self.assertEqual(self.set_status(unit, 'vacant').status_code, 400)
+
+        self.assertEqual(self.set_status(unit, 'maintenance').status_code, 400)
+        unit.refresh_from_db()
+        self.assertEqual(unit.status, 'occupied')
@@ -3,7 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     PropertyViewSet, UnitViewSet, TenantViewSet, LeaseViewSet,
     MaintenanceViewSet, ExpenseViewSet, RentViewSet,
-    LeaseRenewalViewSet, LeaseTerminationViewSet, RentalLegalCaseViewSet
+    LeaseRenewalViewSet, LeaseTerminationViewSet, RentalLegalCaseViewSet, dashboard
 )
 
 router = DefaultRouter()
@@ -19,5 +19,6 @@ router.register(r'expenses', ExpenseViewSet, basename='expense')
 router.register(r'rent', RentViewSet, basename='rent')
 
 urlpatterns = [
+    path('dashboard/', dashboard, name='property-dashboard'),
     path('', include(router.urls)),
 ]
@@ -1,9 +1,17 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from rest_framework import viewsets, filters, status, serializers
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Count, Max, Min
 from django.utils import timezone
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework.pagination import PageNumberPagination
+from erp_system.apps.accounts.models import Account
+from erp_system.apps.core.bulk import request_ids
+from erp_system.apps.core.caching import ConditionalDetailMixin
+from erp_system.apps.core.db_router import reads_from_replica
 from .models import (
     Property, Unit, Tenant, Lease, Maintenance, Expense, Rent,
     LeaseRenewal, LeaseTermination, RentalLegalCase, RentalLegalCaseStatusHistory
@@ -12,9 +20,33 @@ from .serializers import (
     PropertySerializer, UnitSerializer, TenantSerializer, LeaseSerializer,
     MaintenanceSerializer, ExpenseSerializer, RentSerializer,
     LeaseRenewalSerializer, LeaseTerminationSerializer,
-    RentalLegalCaseSerializer, RentalLegalCaseStatusHistorySerializer
+    RentalLegalCaseSerializer, RentalLegalCaseListSerializer, RentalLegalCaseStatusHistorySerializer
 )
-from .services import LeaseService, RentalLegalCaseService
+from .services import (
+    LeaseService, LeaseRenewalService, LeaseTerminationService, LeaseScheduleService, LeaseForecastService,
+    RentalLegalCaseService, UnitStatusService, PortfolioImportService, DashboardService, TenantAutocompleteService,
+)
+
+
+def _error_message(exc):
+    """Flatten service-layer exceptions into a single message"""
+    if isinstance(exc, DjangoValidationError):
+        return ' '.join(exc.messages)
+    return str(exc)
+
+
+@api_view(['GET'])
+def dashboard(request):
+    """
+    Dashboard KPIs in one response: properties by status, unit occupancy,
+    open maintenance by priority, rent due and collected this month and
+    open legal cases.
+    """
+    return Response(DashboardService.kpis())
+
+
+def _bulk_result(key, ids, errors):
+    return Response({key: ids, 'errors': {str(record_id): message for record_id, message in errors.items()}})
 
 
 # custome pagination in drf
@@ -23,7 +55,7 @@ class CustomPageNumberPagination(PageNumberPagination):
     max_page_size = 100 
 
 
-class PropertyViewSet(viewsets.ModelViewSet):
+class PropertyViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = Property.objects.all()
     serializer_class = PropertySerializer
     pagination_class = CustomPageNumberPagination
@@ -33,8 +65,27 @@ class PropertyViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'name']
     ordering = ['-created_at']
 
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_portfolio(self, request):
+        """Upsert properties, units or tenants from an uploaded CSV/XLSX file"""
+        upload = request.FILES.get('file')
+        kind = request.data.get('kind')
+        if not upload:
+            return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if kind not in PortfolioImportService.KINDS:
+            return Response(
+                {'error': f"kind must be one of: {', '.join(PortfolioImportService.KINDS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            result = PortfolioImportService.run(kind, PortfolioImportService.read_rows(upload, upload.name))
+        except (ValueError, UnicodeDecodeError) as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
 
-class UnitViewSet(viewsets.ModelViewSet):
+
+class UnitViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = Unit.objects.all()
     serializer_class = UnitSerializer
     pagination_class = CustomPageNumberPagination
@@ -42,8 +93,16 @@ class UnitViewSet(viewsets.ModelViewSet):
     filterset_fields = ['property', 'status', 'unit_type']
     search_fields = ['unit_number']
 
+    def perform_create(self, serializer):
+        unit = serializer.save()
+        UnitStatusService.sync_unit(unit)
+
+    def perform_update(self, serializer):
+        unit = serializer.save()
+        UnitStatusService.sync_unit(unit)
 
-class TenantViewSet(viewsets.ModelViewSet):
+
+class TenantViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = Tenant.objects.all()
     serializer_class = TenantSerializer
     pagination_class = CustomPageNumberPagination
@@ -55,10 +114,27 @@ class TenantViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'first_name', 'last_name', 'move_in_date']
     ordering = ['-created_at']
 
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Related-party picker lookups: ?q=jo sm matches "John Smith" (and
+        "Smith, John") by name prefix, ignoring case and accents. Optional
+        ledger_account_type and limit (default 20). Returns minimal fields.
+        """
+        limit = request.query_params.get('limit')
+        if limit is not None and (not limit.isdigit() or int(limit) < 1):
+            return Response({'error': 'limit must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(TenantAutocompleteService.search(
+            request.query_params.get('q', ''),
+            limit=int(limit) if limit else None,
+            ledger_account_type=request.query_params.get('ledger_account_type') or None,
+        ))
+
 
-class LeaseViewSet(viewsets.ModelViewSet):
+class LeaseViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = Lease.objects.all()
     serializer_class = LeaseSerializer
+    etag_dependencies = {'unit': 'updated_at', 'tenant': 'updated_at'}
     pagination_class = CustomPageNumberPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'unit', 'tenant']
@@ -81,8 +157,48 @@ class LeaseViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(data)
         return Response(data, status=status.HTTP_201_CREATED, headers=headers)
 
+    @action(detail=False, methods=['get'])
+    @reads_from_replica
+    def forecast(self, request):
+        """
+        Forward rental revenue by property and cost center.
+
+        GET /api/property/leases/forecast/?start=2026-01&months=12&renewal_probability=0.6
+        """
+        try:
+            start = request.query_params.get('start')
+            start_date = datetime.strptime(start, '%Y-%m').date() if start else None
+            months = int(request.query_params.get('months', 12))
+            renewal_probability = Decimal(request.query_params.get('renewal_probability', '0'))
+        except (ValueError, InvalidOperation):
+            return Response(
+                {'error': 'start must be YYYY-MM, months an integer and renewal_probability a number.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not 1 <= months <= 60:
+            return Response({'error': 'months must be between 1 and 60.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not renewal_probability.is_finite() or not Decimal('0') <= renewal_probability <= Decimal('1'):
+            return Response({'error': 'renewal_probability must be between 0 and 1.'}, status=status.HTTP_400_BAD_REQUEST)
 
-class MaintenanceViewSet(viewsets.ModelViewSet):
+        return Response(LeaseForecastService.forecast(start_date, months, renewal_probability))
+
+    @action(detail=True, methods=['get'])
+    @reads_from_replica
+    def schedule(self, request, pk=None):
+        """Month-by-month revenue recognition schedule for the lease"""
+        lease = self.get_object()
+        rows = LeaseScheduleService.build_schedule(lease)
+        return Response({
+            'lease_id': lease.id,
+            'lease_number': lease.lease_number,
+            'monthly_rent': lease.monthly_rent,
+            'total_contract_value': rows[-1]['cumulative_recognized'] if rows else 0,
+            'schedule': rows,
+        })
+
+
+class MaintenanceViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = Maintenance.objects.all()
     serializer_class = MaintenanceSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -91,7 +207,7 @@ class MaintenanceViewSet(viewsets.ModelViewSet):
     ordering_fields = ['reported_date', 'priority']
 
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+class ExpenseViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = Expense.objects.all()
     serializer_class = ExpenseSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -99,7 +215,7 @@ class ExpenseViewSet(viewsets.ModelViewSet):
     search_fields = ['expense_id', 'description']
 
 
-class RentViewSet(viewsets.ModelViewSet):
+class RentViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = Rent.objects.all()
     serializer_class = RentSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -107,7 +223,7 @@ class RentViewSet(viewsets.ModelViewSet):
     ordering_fields = ['rent_date', 'due_date']
 
 
-class LeaseRenewalViewSet(viewsets.ModelViewSet):
+class LeaseRenewalViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     """
     ViewSet for Lease Renewal
     
@@ -116,6 +232,11 @@ class LeaseRenewalViewSet(viewsets.ModelViewSet):
     """
     queryset = LeaseRenewal.objects.all()
     serializer_class = LeaseRenewalSerializer
+    etag_dependencies = {
+        'original_lease': 'updated_at',
+        'original_lease__unit': 'updated_at',
+        'original_lease__tenant': 'updated_at',
+    }
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['original_lease', 'status']
     search_fields = ['renewal_number', 'original_lease__lease_number']
@@ -165,9 +286,20 @@ class LeaseRenewalViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(renewal)
         return Response(serializer.data)
     
+    def _renewal_accounts(self, request):
+        """Resolve optional account ids supplied for renewal activation"""
+        accounts = {}
+        for field in ['unearned_revenue_account', 'refundable_deposit_account', 'other_charges_account']:
+            account_id = request.data.get(field)
+            if account_id:
+                accounts[field] = Account.objects.filter(id=account_id).first()
+                if accounts[field] is None:
+                    raise serializers.ValidationError({field: 'Account not found.'})
+        return accounts
+
     @action(detail=True, methods=['post'])
     def activate(self, request, pk=None):
-        """Activate an approved lease renewal (create new lease)"""
+        """Activate an approved lease renewal (create new lease and post accounting)"""
         renewal = self.get_object()
         
         if renewal.status != 'approved':
@@ -177,41 +309,78 @@ class LeaseRenewalViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            # Create new lease with renewed terms
-            original_lease = renewal.original_lease
-            new_lease = Lease.objects.create(
-                lease_number=f"{original_lease.lease_number}-REN",
-                unit=original_lease.unit,
-                tenant=original_lease.tenant,
-                start_date=renewal.new_start_date,
-                end_date=renewal.new_end_date,
-                monthly_rent=renewal.new_monthly_rent,
-                security_deposit=renewal.new_security_deposit or original_lease.security_deposit,
-                status='active',
-                terms_conditions=renewal.terms_conditions or original_lease.terms_conditions,
-            )
-            
-            # End original lease
-            original_lease.status = 'expired'
-            original_lease.save()
-            
-            # Update renewal status
-            renewal.status = 'active'
-            renewal.activation_date = timezone.now().date()
-            renewal.save()
-            
-            serializer = self.get_serializer(renewal)
-            return Response({
-                'renewal': serializer.data,
-                'new_lease_id': new_lease.id,
-                'message': 'Renewal activated and new lease created'
-            })
-        except Exception as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_400_BAD_REQUEST
+            new_lease, journal_entry = LeaseRenewalService.activate_renewal(
+                renewal,
+                self._renewal_accounts(request)
             )
+        except (ValueError, DjangoValidationError) as exc:
+            return Response({'error': _error_message(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(renewal)
+        return Response({
+            'renewal': serializer.data,
+            'new_lease_id': new_lease.id,
+            'journal_entry_id': journal_entry.id,
+            'message': 'Renewal activated and new lease created'
+        })
+
+    @action(detail=False, methods=['post'])
+    def bulk_activate(self, request):
+        """
+        Activate many approved renewals in one request.
+
+        POST /api/property/lease-renewals/bulk_activate/
+        Body: {
+            "ids": [1, 2, 3],
+            "unearned_revenue_account": 5,      (optional)
+            "refundable_deposit_account": 6     (optional)
+        }
+        """
+        ids, error = request_ids(request)
+        if error:
+            return error
+
+        try:
+            activated, errors = LeaseRenewalService.activate_renewals(ids, self._renewal_accounts(request))
+        except DjangoValidationError as exc:
+            return Response({'error': _error_message(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'activated': [
+                {
+                    'renewal_id': renewal_id,
+                    'new_lease_id': lease.id,
+                    'lease_number': lease.lease_number,
+                    'journal_entry_id': entry.id,
+                }
+                for renewal_id, (lease, entry) in activated.items()
+            ],
+            'errors': {str(renewal_id): message for renewal_id, message in errors.items()},
+        })
     
+    @action(detail=False, methods=['post'])
+    def bulk_approve(self, request):
+        """
+        Approve many draft or pending renewals.
+
+        POST /api/property/lease-renewals/bulk_approve/ {"ids": [1, 2, 3]}
+        returns {"approved": [1, 2], "errors": {"3": "..."}}
+        """
+        ids, error = request_ids(request)
+        if error:
+            return error
+        approved, errors = LeaseRenewalService.approve_renewals(ids)
+        return _bulk_result('approved', approved, errors)
+
+    @action(detail=False, methods=['post'])
+    def bulk_reject(self, request):
+        """Reject many renewals: {"ids": [...]} -> {"rejected": [...], "errors": {...}}"""
+        ids, error = request_ids(request)
+        if error:
+            return error
+        rejected, errors = LeaseRenewalService.reject_renewals(ids)
+        return _bulk_result('rejected', rejected, errors)
+
     @action(detail=True, methods=['post'])
     def reject(self, request, pk=None):
         """Reject a lease renewal"""
@@ -223,7 +392,7 @@ class LeaseRenewalViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class LeaseTerminationViewSet(viewsets.ModelViewSet):
+class LeaseTerminationViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     """
     ViewSet for Lease Termination
     
@@ -239,6 +408,7 @@ class LeaseTerminationViewSet(viewsets.ModelViewSet):
     """
     queryset = LeaseTermination.objects.all()
     serializer_class = LeaseTerminationSerializer
+    etag_dependencies = {'lease': 'updated_at', 'lease__unit': 'updated_at', 'lease__tenant': 'updated_at'}
     pagination_class = CustomPageNumberPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['lease', 'termination_type', 'status']
@@ -290,46 +460,90 @@ class LeaseTerminationViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
-        """Complete the termination (process refund/charges)"""
+        """Complete the termination: post the settlement entry and terminate the lease"""
         termination = self.get_object()
-        
-        if termination.status != 'approved':
-            return Response(
-                {'error': 'Only approved terminations can be completed.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        try:
-            # Update lease status
-            termination.lease.status = 'terminated'
-            termination.lease.save()
-            
-            # Update tenant move-out date
-            if termination.lease.tenant:
-                termination.lease.tenant.move_out_date = termination.termination_date
-                termination.lease.tenant.save()
-            
-            # Mark termination as completed
-            termination.status = 'completed'
-            termination.completion_date = timezone.now().date()
-            termination.save()
-            
-            # Return summary
-            serializer = self.get_serializer(termination)
-            return Response({
-                'termination': serializer.data,
-                'accounting_entries': {
-                    'type': termination.termination_type,
-                    'net_refund': float(termination.net_refund),
-                    'message': 'Refund' if termination.net_refund > 0 else 'Charge'
-                }
-            })
-        except Exception as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-    
+        completed, errors = LeaseTerminationService.complete_terminations([termination.id])
+        if errors:
+            return Response({'error': errors[termination.id]}, status=status.HTTP_400_BAD_REQUEST)
+
+        termination = completed[0]
+        serializer = self.get_serializer(termination)
+        return Response({
+            'termination': serializer.data,
+            'accounting_entries': {
+                'type': termination.termination_type,
+                'journal_entry_id': termination.journal_entry.id if termination.journal_entry else None,
+                'net_refund': float(termination.net_refund),
+                'message': 'Refund' if termination.net_refund > 0 else 'Charge'
+            }
+        })
+
+    @action(detail=False, methods=['post'])
+    def bulk_approve(self, request):
+        """Approve many draft or pending terminations: {"ids": [...]} -> {"approved": [...], "errors": {...}}"""
+        ids, error = request_ids(request)
+        if error:
+            return error
+        approved, errors = LeaseTerminationService.approve_terminations(ids)
+        return _bulk_result('approved', approved, errors)
+
+    @action(detail=False, methods=['post'])
+    def bulk_complete(self, request):
+        """
+        Complete many approved terminations.
+
+        POST /api/property/lease-terminations/bulk_complete/ {"ids": [1, 2]}
+        returns {"completed": [{"termination_id", "lease_id", "net_refund"}], "errors": {...}}
+        """
+        ids, error = request_ids(request)
+        if error:
+            return error
+        completed, errors = LeaseTerminationService.complete_terminations(ids)
+        return _bulk_result('completed', [
+            {
+                'termination_id': termination.id,
+                'lease_id': termination.lease_id,
+                'journal_entry_id': termination.journal_entry.id if termination.journal_entry else None,
+                'net_refund': float(termination.net_refund),
+            }
+            for termination in completed
+        ], errors)
+
+    @action(detail=False, methods=['get'])
+    def preview_settlement(self, request):
+        """
+        Settlement amounts for many terminations without posting anything.
+
+        GET /api/property/lease-terminations/preview_settlement/?status=approved
+        (any list filter applies; ids=1,2,3 selects terminations directly)
+        """
+        terminations = self.filter_queryset(self.get_queryset()).select_related('lease')
+        ids = request.query_params.get('ids')
+        if ids:
+            try:
+                terminations = terminations.filter(id__in=[int(record_id) for record_id in ids.split(',')])
+            except ValueError:
+                return Response({'error': 'ids must be comma separated integers.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        terminations = list(terminations)
+        settlements = LeaseTerminationService.calculate_settlements(terminations)
+        results = [
+            {
+                'termination_id': termination.id,
+                'lease_id': termination.lease_id,
+                'termination_type': termination.termination_type,
+                **{field: float(amount) for field, amount in settlements[termination.id].items()},
+            }
+            for termination in terminations
+        ]
+        return Response({
+            'count': len(results),
+            'total_net_refund': float(sum(
+                (settlement['net_refund'] for settlement in settlements.values()), Decimal('0.00')
+            )),
+            'results': results,
+        })
+
     @action(detail=False, methods=['post'])
     def create_early_termination(self, request):
         """Helper endpoint to create early termination with auto-calculated values"""
@@ -345,14 +559,9 @@ class LeaseTerminationViewSet(viewsets.ModelViewSet):
         try:
             lease = Lease.objects.get(id=lease_id)
             
-            # Calculate unearned rent
-            from datetime import datetime
+            # Calculate unearned rent for the remaining term
             term_date = datetime.strptime(termination_date, '%Y-%m-%d').date()
-            days_remaining = (lease.end_date - term_date).days
-            if days_remaining > 0:
-                unearned_rent = (lease.monthly_rent / 30) * days_remaining
-            else:
-                unearned_rent = 0
+            unearned_rent = LeaseScheduleService.unearned_after(lease, term_date)
             
             # Create termination
             termination = LeaseTermination.objects.create(
@@ -391,21 +600,42 @@ class LegalCasePagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
-class RentalLegalCaseViewSet(viewsets.ModelViewSet):
+class RentalLegalCaseViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     """
     ViewSet for Rental Legal Cases
     
     Tracks legal cases against tenants with automatic unit status updates.
     NO accounting entries are created.
     """
-    queryset = RentalLegalCase.objects.all()
+    queryset = RentalLegalCase.objects.select_related('tenant', 'lease', 'property', 'unit')
     serializer_class = RentalLegalCaseSerializer
+    # Status changes save the case itself, so its updated_at covers the history
+    etag_dependencies = {
+        'tenant': 'updated_at',
+        'lease': 'updated_at',
+        'property': 'updated_at',
+        'unit': 'updated_at',
+    }
     pagination_class = LegalCasePagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['tenant', 'lease', 'property', 'unit', 'case_type', 'current_status']
     search_fields = ['case_number', 'court_name']
-    ordering_fields = ['filing_date', 'created_at']
+    ordering_fields = ['filing_date', 'created_at', 'last_status_change_at']
     ordering = ['-filing_date']
+
+    def get_serializer_class(self):
+        """Lists carry the status summary fields; the history has its own endpoint"""
+        if self.action in ('list', 'by_tenant', 'by_unit'):
+            return RentalLegalCaseListSerializer
+        if self.action == 'history':
+            return RentalLegalCaseStatusHistorySerializer
+        return RentalLegalCaseSerializer
+
+    def _paginated(self, queryset):
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
     
     def perform_create(self, serializer):
         """Create legal case using service"""
@@ -479,9 +709,17 @@ class RentalLegalCaseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """Status history of a case, newest first (paginated)"""
+        legal_case = self.get_object()
+        return self._paginated(
+            RentalLegalCaseStatusHistory.objects.filter(legal_case=legal_case).order_by('-changed_at', '-id')
+        )
+
     @action(detail=False, methods=['get'])
     def by_tenant(self, request):
-        """Get all legal cases for a specific tenant"""
+        """Get all legal cases for a specific tenant (paginated)"""
         tenant_id = request.query_params.get('tenant_id')
         if not tenant_id:
             return Response(
@@ -489,13 +727,11 @@ class RentalLegalCaseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        cases = self.queryset.filter(tenant_id=tenant_id)
-        serializer = self.get_serializer(cases, many=True)
-        return Response(serializer.data)
+        return self._paginated(self.filter_queryset(self.get_queryset()).filter(tenant_id=tenant_id))
     
     @action(detail=False, methods=['get'])
     def by_unit(self, request):
-        """Get all legal cases for a specific unit"""
+        """Get all legal cases for a specific unit (paginated)"""
         unit_id = request.query_params.get('unit_id')
         if not unit_id:
             return Response(
@@ -503,6 +739,48 @@ class RentalLegalCaseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        cases = self.queryset.filter(unit_id=unit_id)
-        serializer = self.get_serializer(cases, many=True)
-        return Response(serializer.data)
+        return self._paginated(self.filter_queryset(self.get_queryset()).filter(unit_id=unit_id))
+
+    @action(detail=False, methods=['get'])
+    @reads_from_replica
+    def workload(self, request):
+        """
+        Case load per court and status from one grouped query.
+
+        Honors the list filters (property, case_type, ...). Open cases are
+        those not closed; oldest_open_filing_date shows the longest-running one.
+        """
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .order_by()
+            .values('court_name', 'current_status')
+            .annotate(cases=Count('id'), oldest_filing_date=Min('filing_date'), last_change=Max('last_status_change_at'))
+        )
+
+        courts = {}
+        for row in rows:
+            court = courts.setdefault(row['court_name'], {
+                'court_name': row['court_name'],
+                'total': 0,
+                'open': 0,
+                'by_status': {value: 0 for value, _ in RentalLegalCase.STATUS_CHOICES},
+                'oldest_open_filing_date': None,
+                'last_status_change_at': None,
+            })
+            court['total'] += row['cases']
+            court['by_status'][row['current_status']] = row['cases']
+            if row['last_change'] and (court['last_status_change_at'] is None or row['last_change'] > court['last_status_change_at']):
+                court['last_status_change_at'] = row['last_change']
+            if row['current_status'] in RentalLegalCaseService.OPEN_STATUSES:
+                court['open'] += row['cases']
+                oldest = court['oldest_open_filing_date']
+                court['oldest_open_filing_date'] = min(oldest, row['oldest_filing_date']) if oldest else row['oldest_filing_date']
+
+        results = sorted(courts.values(), key=lambda court: (-court['open'], court['court_name']))
+        return Response({
+            'courts': results,
+            'totals': {
+                'cases': sum(court['total'] for court in results),
+                'open': sum(court['open'] for court in results),
+            },
+        })
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import PurchaseOrder, SupplierInvoice, PaymentVoucher
+from .models import APAgingSnapshot, PurchaseOrder, SupplierInvoice, PaymentVoucher
 
 
 @admin.register(PurchaseOrder)
@@ -21,3 +21,10 @@ class PaymentVoucherAdmin(admin.ModelAdmin):
     list_display = ['voucher_number', 'supplier', 'payment_date', 'amount', 'status']
     list_filter = ['status', 'payment_date', 'payment_method']
     search_fields = ['voucher_number', 'supplier__first_name', 'supplier__last_name']
+
+
+@admin.register(APAgingSnapshot)
+class APAgingSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['as_of_date', 'supplier', 'current', 'days_1_30', 'days_31_60', 'days_61_90', 'days_over_90', 'balance']
+    list_filter = ['as_of_date']
+    search_fields = ['supplier__first_name', 'supplier__last_name']
@@ -0,0 +1,21 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from erp_system.apps.purchase.services import PayablesAgingService
+
+
+class Command(BaseCommand):
+    help = 'Store the accounts payable aging per supplier (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=str, help='As-of date in YYYY-MM-DD format (defaults to today)')
+
+    def handle(self, *args, **options):
+        as_of = None
+        if options.get('date'):
+            try:
+                as_of = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format.')
+
+        count = PayablesAgingService.snapshot(as_of=as_of)
+        self.stdout.write(self.style.SUCCESS(f'AP aging snapshot stored for {count} suppliers.'))
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0015_tenant_name_keys'),
+        ('purchase', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='APAgingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of_date', models.DateField()),
+                ('current', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('days_1_30', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('days_31_60', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('days_61_90', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('days_over_90', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('open_invoices', models.PositiveIntegerField(default=0)),
+                ('oldest_due_date', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('supplier', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ap_aging_snapshots', to='property.tenant')),
+            ],
+            options={
+                'ordering': ['-as_of_date', '-balance'],
+                'indexes': [models.Index(fields=['supplier', 'as_of_date'], name='ap_aging_supplier_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='apagingsnapshot',
+            constraint=models.UniqueConstraint(fields=('as_of_date', 'supplier'), name='ap_aging_snapshot_date_supplier_uniq'),
+        ),
+    ]
@@ -199,3 +199,32 @@ class PaymentVoucher(models.Model):
             else:
                 self.voucher_number = "PV-00001"
         super().save(*args, **kwargs)
+
+
+class APAgingSnapshot(models.Model):
+    """Open payables of one supplier on one date, written nightly by snapshot_ap_aging"""
+    as_of_date = models.DateField()
+    supplier = models.ForeignKey(Tenant, on_delete=models.PROTECT, related_name='ap_aging_snapshots')
+
+    current = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    days_1_30 = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    days_31_60 = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    days_61_90 = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    days_over_90 = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    balance = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    open_invoices = models.PositiveIntegerField(default=0)
+    oldest_due_date = models.DateField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-as_of_date', '-balance']
+        constraints = [
+            models.UniqueConstraint(fields=['as_of_date', 'supplier'], name='ap_aging_snapshot_date_supplier_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['supplier', 'as_of_date'], name='ap_aging_supplier_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"AP aging {self.as_of_date} - {self.supplier_id}: {self.balance}"
@@ -19,6 +19,24 @@ class SupplierInvoiceSerializer(serializers.ModelSerializer):
         return data
 
 
+class SupplierInvoiceBatchSerializer(SupplierInvoiceSerializer):
+    """
+    Bulk ingest row. Related records are plain ids, checked by
+    PayablesBatchService with one query per model instead of one per row.
+    """
+    invoice_number = serializers.CharField(max_length=50, required=False, allow_null=True, allow_blank=True)
+    supplier = serializers.IntegerField(source='supplier_id')
+    expense_account = serializers.IntegerField(source='expense_account_id')
+    supplier_account = serializers.IntegerField(source='supplier_account_id')
+    tax_account = serializers.IntegerField(source='tax_account_id', required=False, allow_null=True)
+    cost_center = serializers.IntegerField(source='cost_center_id', required=False, allow_null=True)
+
+    def validate(self, data):
+        if data.get('is_taxable') and not data.get('tax_account_id'):
+            raise serializers.ValidationError('Tax account is required for taxable supplier invoices.')
+        return data
+
+
 class PaymentVoucherSerializer(serializers.ModelSerializer):
     class Meta:
         model = PaymentVoucher
@@ -33,3 +51,27 @@ class PaymentVoucherSerializer(serializers.ModelSerializer):
         if method == 'cheque' and not data.get('cheques_issued_account'):
             raise serializers.ValidationError('Cheques issued account is required for cheque payments.')
         return data
+
+
+class PaymentVoucherBatchSerializer(PaymentVoucherSerializer):
+    """Bulk ingest row; see SupplierInvoiceBatchSerializer"""
+    voucher_number = serializers.CharField(max_length=50, required=False, allow_null=True, allow_blank=True)
+    supplier = serializers.IntegerField(source='supplier_id')
+    supplier_invoice = serializers.IntegerField(source='supplier_invoice_id', required=False, allow_null=True)
+    cash_account = serializers.IntegerField(source='cash_account_id', required=False, allow_null=True)
+    bank_account = serializers.IntegerField(source='bank_account_id', required=False, allow_null=True)
+    cheques_issued_account = serializers.IntegerField(
+        source='cheques_issued_account_id', required=False, allow_null=True
+    )
+    supplier_account = serializers.IntegerField(source='supplier_account_id')
+    cost_center = serializers.IntegerField(source='cost_center_id', required=False, allow_null=True)
+
+    def validate(self, data):
+        method = data.get('payment_method')
+        if method == 'cash' and not data.get('cash_account_id'):
+            raise serializers.ValidationError('Cash account is required for cash payments.')
+        if method == 'bank' and not data.get('bank_account_id'):
+            raise serializers.ValidationError('Bank account is required for bank payments.')
+        if method == 'cheque' and not data.get('cheques_issued_account_id'):
+            raise serializers.ValidationError('Cheques issued account is required for cheque payments.')
+        return data
@@ -1,164 +1,551 @@
-from decimal import Decimal
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, DecimalField, F, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
-from erp_system.apps.accounts.models import Account, JournalEntry, JournalLine, CostCenter
-from erp_system.apps.accounts.services import require_transaction_mapping
-from .models import SupplierInvoice, PaymentVoucher
+from django.utils import timezone
+from erp_system.apps.core.profiling import profiled
+from erp_system.apps.accounts.models import Account, ChequeRegister, CostCenter
+from erp_system.apps.accounts.services import (
+    CostCenterProvisioningService, post_journal_entries, require_transaction_mapping
+)
+from erp_system.apps.property.models import Tenant
+from erp_system.apps.search.services import SearchIndexService
+from .models import APAgingSnapshot, SupplierInvoice, PaymentVoucher
 
+# Chart of accounts defaults when neither the document nor the supplier names an account
+SUPPLIER_PAYABLE_ACCOUNT = '2400'
+PAYMENT_METHOD_ACCOUNTS = {
+    'cash': ('cash_account', '1200'),
+    'bank': ('bank_account', '1210'),
+    'cheque': ('cheques_issued_account', '1240'),
+}
+
+
+def _to_cents(amount):
+    return int((Decimal(amount or 0) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _from_cents(cents):
+    return (Decimal(int(cents)) / 100).quantize(Decimal('0.01'))
 
-class SupplierInvoiceService:
-    """Service for supplier invoice accounting"""
+
+class PayablesBatchService:
+    """
+    Accounts payable pipeline: ingests and posts supplier invoices and
+    payment vouchers in batches.
+
+    Related records, fallback accounts and cost centers are resolved once
+    per batch, invoice taxes are computed in one vectorized pass, and
+    documents, journal entries and journal lines are written with bulk
+    inserts. The single-document services below run through the same code.
+    """
+    BATCH_SIZE = 500
+
+    INVOICE_RELATIONS = {
+        'supplier_id': Tenant,
+        'expense_account_id': Account,
+        'supplier_account_id': Account,
+        'tax_account_id': Account,
+        'cost_center_id': CostCenter,
+    }
+    VOUCHER_RELATIONS = {
+        'supplier_id': Tenant,
+        'supplier_invoice_id': SupplierInvoice,
+        'cash_account_id': Account,
+        'bank_account_id': Account,
+        'cheques_issued_account_id': Account,
+        'supplier_account_id': Account,
+        'cost_center_id': CostCenter,
+    }
 
     @staticmethod
+    def compute_taxes(invoices):
+        """
+        Tax and total in cents per invoice. An explicit tax amount on a
+        taxable invoice wins; otherwise amount x rate is rounded half-even
+        like Decimal.quantize. Non-taxable invoices carry no tax.
+        """
+        amounts = np.array([_to_cents(invoice.amount) for invoice in invoices], dtype=np.int64)
+        given = np.array([_to_cents(invoice.tax_amount) for invoice in invoices], dtype=np.int64)
+        # Rates in hundredths of a percent, so amount x rate is in 1/10000 cents
+        rates = np.array([_to_cents(invoice.tax_rate) for invoice in invoices], dtype=np.int64)
+        taxable = np.array([invoice.is_taxable for invoice in invoices], dtype=bool)
+
+        quotient, remainder = np.divmod(amounts * rates, 10000)
+        computed = quotient + ((remainder > 5000) | ((remainder == 5000) & (quotient % 2 == 1)))
+        taxes = np.where(taxable, np.where(given > 0, given, computed), 0)
+        return taxes, amounts + taxes
+
+    @staticmethod
+    def _fallback_accounts():
+        numbers = [SUPPLIER_PAYABLE_ACCOUNT, *(number for _, number in PAYMENT_METHOD_ACCOUNTS.values())]
+        return dict(Account.objects.filter(account_number__in=numbers).values_list('account_number', 'id'))
+
+    @staticmethod
+    def _cost_centers(documents):
+        """Cost center id per document: its own, else the supplier's unit, else a per-supplier one"""
+        suppliers = {
+            document.supplier_id: document.supplier for document in documents
+            if not document.cost_center_id and not (document.supplier.unit and document.supplier.unit.cost_center_id)
+        }
+        code = CostCenterProvisioningService.supplier_code
+        created = CostCenterProvisioningService.ensure({
+            code(supplier): f"Supplier {supplier.first_name} {supplier.last_name}" for supplier in suppliers.values()
+        }) if suppliers else {}
+        result = []
+        for document in documents:
+            unit = document.supplier.unit
+            result.append(
+                document.cost_center_id
+                or (unit.cost_center_id if unit else None)
+                or created[code(document.supplier)].id
+            )
+        return result
+
+    @staticmethod
+    def _supplier_account_id(document, fallback):
+        return (
+            document.supplier_account_id
+            or document.supplier.ledger_account_id
+            or fallback.get(SUPPLIER_PAYABLE_ACCOUNT)
+        )
+
+    @staticmethod
+    @profiled
     @transaction.atomic
-    def post_supplier_invoice(invoice: SupplierInvoice):
+    def post_supplier_invoices(invoices):
+        """
+        Post unposted invoices (supplier and supplier.unit loaded). Returns
+        (posted invoices with ``journal_entry`` set, {invoice id: error}).
+        """
         require_transaction_mapping('supplier_invoice')
-        if invoice.accounting_posted:
-            return None
+        errors = {}
+        pending = []
+        for invoice in invoices:
+            if invoice.accounting_posted:
+                continue
+            if invoice.amount <= 0:
+                errors[invoice.id] = 'Invoice amount must be greater than 0.'
+            else:
+                pending.append(invoice)
+        if not pending:
+            return [], errors
+
+        taxes, totals = PayablesBatchService.compute_taxes(pending)
+        cost_centers = PayablesBatchService._cost_centers(pending)
+        fallback = PayablesBatchService._fallback_accounts()
+        now = timezone.now()
+
+        posted, entries = [], []
+        for invoice, tax_cents, total_cents, cost_center_id in zip(pending, taxes, totals, cost_centers):
+            supplier_account_id = PayablesBatchService._supplier_account_id(invoice, fallback)
+            if not supplier_account_id:
+                errors[invoice.id] = 'Supplier account is required for supplier invoice posting.'
+                continue
+            if tax_cents > 0 and not invoice.tax_account_id:
+                errors[invoice.id] = 'Tax account is required for taxable supplier invoices.'
+                continue
+
+            tax_amount, total_amount = _from_cents(tax_cents), _from_cents(total_cents)
+            line = {'cost_center_id': cost_center_id, 'reference_type': 'supplier_invoice', 'reference_id': invoice.id}
+            zero = Decimal('0.00')
+            # Debit expense (and tax), credit the supplier payable
+            lines = [{'account_id': invoice.expense_account_id, 'debit': invoice.amount, 'credit': zero, **line}]
+            if tax_cents > 0:
+                lines.append({'account_id': invoice.tax_account_id, 'debit': tax_amount, 'credit': zero, **line})
+            lines.append({'account_id': supplier_account_id, 'debit': zero, 'credit': total_amount, **line})
+            entries.append({
+                'entry_type': 'invoice',
+                'reference_type': 'supplier_invoice',
+                'reference_id': invoice.id,
+                'description': (
+                    f"Supplier invoice {invoice.invoice_number} - "
+                    f"{invoice.supplier.first_name} {invoice.supplier.last_name}"
+                ),
+                'lines': lines,
+            })
 
-        if invoice.amount <= 0:
-            raise ValidationError('Invoice amount must be greater than 0.')
-
-        tax_amount = invoice.tax_amount or Decimal('0.00')
-        if invoice.is_taxable and tax_amount <= 0:
-            tax_amount = (Decimal(invoice.amount) * Decimal(invoice.tax_rate) / Decimal('100.00')).quantize(Decimal('0.01'))
-
-        total_amount = Decimal(invoice.amount) + Decimal(tax_amount)
-
-        cost_center = invoice.cost_center
-        if not cost_center and invoice.supplier.unit:
-            cost_center = invoice.supplier.unit.cost_center
-        if not cost_center:
-            code = f"CC-SUPPLIER-{invoice.supplier.id:04d}"
-            name = f"Supplier {invoice.supplier.first_name} {invoice.supplier.last_name}"
-            cost_center, _ = CostCenter.objects.get_or_create(code=code, defaults={'name': name})
-
-        if not invoice.supplier_account:
-            invoice.supplier_account = invoice.supplier.ledger_account or Account.objects.filter(account_number='2400').first()
-        if not invoice.supplier_account:
-            raise ValidationError('Supplier account is required for supplier invoice posting.')
-
-        entry = JournalEntry.objects.create(
-            entry_type='invoice',
-            reference_type='supplier_invoice',
-            reference_id=invoice.id,
-            description=f"Supplier invoice {invoice.invoice_number} - {invoice.supplier.first_name} {invoice.supplier.last_name}",
+            invoice.supplier_account_id = supplier_account_id
+            invoice.tax_amount = tax_amount
+            invoice.total_amount = total_amount
+            invoice.accounting_posted = True
+            if invoice.status == 'draft':
+                invoice.status = 'submitted'
+            invoice.updated_at = now
+            posted.append(invoice)
+
+        for invoice, entry in zip(posted, post_journal_entries(entries)):
+            invoice.journal_entry = entry
+        SupplierInvoice.objects.bulk_update(
+            posted,
+            ['tax_amount', 'total_amount', 'accounting_posted', 'status', 'supplier_account', 'updated_at'],
+            batch_size=PayablesBatchService.BATCH_SIZE,
         )
+        return posted, errors
+
+    @staticmethod
+    @profiled
+    @transaction.atomic
+    def post_payment_vouchers(vouchers):
+        """
+        Post unposted vouchers (supplier and supplier.unit loaded). Returns
+        (posted vouchers with ``journal_entry`` set, {voucher id: error}).
+        """
+        require_transaction_mapping('payment_voucher')
+        errors = {}
+        pending = []
+        for voucher in vouchers:
+            if voucher.accounting_posted:
+                continue
+            if voucher.payment_method not in PAYMENT_METHOD_ACCOUNTS:
+                errors[voucher.id] = 'Invalid payment method.'
+            else:
+                pending.append(voucher)
+        if not pending:
+            return [], errors
 
-        # Debit: Expense
-        JournalLine.objects.create(
-            journal_entry=entry,
-            account=invoice.expense_account,
-            debit=invoice.amount,
-            credit=Decimal('0.00'),
-            cost_center=cost_center,
-            reference_type='supplier_invoice',
-            reference_id=invoice.id,
+        cost_centers = PayablesBatchService._cost_centers(pending)
+        fallback = PayablesBatchService._fallback_accounts()
+        now = timezone.now()
+
+        posted, entries = [], []
+        for voucher, cost_center_id in zip(pending, cost_centers):
+            field, number = PAYMENT_METHOD_ACCOUNTS[voucher.payment_method]
+            credit_account_id = getattr(voucher, f'{field}_id') or fallback.get(number)
+            if not credit_account_id:
+                errors[voucher.id] = 'Payment account is required for the selected payment method.'
+                continue
+            supplier_account_id = PayablesBatchService._supplier_account_id(voucher, fallback)
+            if not supplier_account_id:
+                errors[voucher.id] = 'Supplier account is required for payment posting.'
+                continue
+
+            line = {'cost_center_id': cost_center_id, 'reference_type': 'payment_voucher', 'reference_id': voucher.id}
+            entries.append({
+                'entry_type': 'payment',
+                'reference_type': 'payment_voucher',
+                'reference_id': voucher.id,
+                'description': (
+                    f"Payment voucher {voucher.voucher_number} - "
+                    f"{voucher.supplier.first_name} {voucher.supplier.last_name}"
+                ),
+                # Debit the supplier payable, credit cash/bank/cheques issued
+                'lines': [
+                    {'account_id': supplier_account_id, 'debit': voucher.amount, 'credit': Decimal('0.00'), **line},
+                    {'account_id': credit_account_id, 'debit': Decimal('0.00'), 'credit': voucher.amount, **line},
+                ],
+            })
+
+            voucher.supplier_account_id = supplier_account_id
+            voucher.accounting_posted = True
+            if voucher.status == 'draft':
+                voucher.status = 'submitted'
+            voucher.updated_at = now
+            posted.append(voucher)
+
+        for voucher, entry in zip(posted, post_journal_entries(entries)):
+            voucher.journal_entry = entry
+        PaymentVoucher.objects.bulk_update(
+            posted,
+            ['accounting_posted', 'status', 'supplier_account', 'updated_at'],
+            batch_size=PayablesBatchService.BATCH_SIZE,
         )
+        return posted, errors
 
-        # Debit: Tax (if applicable)
-        if invoice.is_taxable and tax_amount > 0:
-            if not invoice.tax_account:
-                raise ValidationError('Tax account is required for taxable supplier invoices.')
-            JournalLine.objects.create(
-                journal_entry=entry,
-                account=invoice.tax_account,
-                debit=tax_amount,
-                credit=Decimal('0.00'),
-                cost_center=cost_center,
-                reference_type='supplier_invoice',
-                reference_id=invoice.id,
-            )
+    @staticmethod
+    def _resolve(model, rows, relations, number_field):
+        """
+        Check the related ids of ingest rows with one query per related
+        model, returning ({row index: errors}, {related model: {id: record}}).
+        """
+        ids = {related: set() for related in relations.values()}
+        for row in rows:
+            for field, related in relations.items():
+                if row.get(field):
+                    ids[related].add(row[field])
+        records = {
+            related: (related.objects.select_related('unit') if related is Tenant else related.objects).in_bulk(pks)
+            for related, pks in ids.items() if pks
+        }
+
+        numbers = [row[number_field] for row in rows if row.get(number_field)]
+        taken = set(model.objects.filter(**{f'{number_field}__in': numbers}).values_list(number_field, flat=True))
+        seen = set()
+
+        errors = {}
+        for index, row in enumerate(rows):
+            row_errors = []
+            for field, related in relations.items():
+                pk = row.get(field)
+                if not pk:
+                    continue
+                record = records[related].get(pk)
+                limit = model._meta.get_field(field[:-3]).get_limit_choices_to() or {}
+                if not record or any(getattr(record, name) != value for name, value in limit.items()):
+                    row_errors.append(f'{field[:-3]}: invalid pk "{pk}".')
+            number = row.get(number_field)
+            if number and (number in taken or number in seen):
+                row_errors.append(f'{number_field}: {number} already exists.')
+            seen.add(number)
+            if row_errors:
+                errors[index] = row_errors
+        return errors, records
+
+    @staticmethod
+    def _number(model, number_field, prefix, documents):
+        """Continue the document numbering of model.save() for documents without a number"""
+        last = model.objects.order_by('-id').values_list(number_field, flat=True).first()
+        try:
+            next_number = int(last.split('-')[-1]) + 1 if last else 1
+        except (ValueError, IndexError):
+            next_number = 1
+        for document in documents:
+            if not getattr(document, number_field):
+                setattr(document, number_field, f'{prefix}-{next_number:05d}')
+                next_number += 1
 
-        # Credit: Supplier payable
-        JournalLine.objects.create(
-            journal_entry=entry,
-            account=invoice.supplier_account,
-            debit=Decimal('0.00'),
-            credit=total_amount,
-            cost_center=cost_center,
-            reference_type='supplier_invoice',
-            reference_id=invoice.id,
+    @staticmethod
+    def _ingest(model, rows, relations, number_field, prefix, post_statuses, post):
+        if len(rows) > settings.AP_BATCH_MAX_DOCUMENTS:
+            raise ValidationError(f'At most {settings.AP_BATCH_MAX_DOCUMENTS} documents can be ingested at once.')
+        errors, records = PayablesBatchService._resolve(model, rows, relations, number_field)
+        if errors:
+            raise ValidationError({str(index): messages for index, messages in errors.items()})
+
+        documents = [model(**row) for row in rows]
+        for document in documents:
+            document.supplier = records[Tenant][document.supplier_id]
+        PayablesBatchService._number(model, number_field, prefix, documents)
+        model.objects.bulk_create(documents, batch_size=PayablesBatchService.BATCH_SIZE)
+
+        posted, post_errors = post([document for document in documents if document.status in post_statuses])
+        if post_errors:
+            raise ValidationError({str(pk): [message] for pk, message in post_errors.items()})
+        SearchIndexService.index_records(model, [document.pk for document in documents])
+        return documents, posted
+
+    @staticmethod
+    @profiled
+    @transaction.atomic
+    def ingest_supplier_invoices(rows):
+        """
+        Create invoices from validated rows (related fields as ``*_id``) and
+        post the submitted and paid ones. All or nothing: any invalid row
+        raises ValidationError keyed by row index. Returns (invoices, posted).
+        """
+        return PayablesBatchService._ingest(
+            SupplierInvoice, rows, PayablesBatchService.INVOICE_RELATIONS, 'invoice_number', 'SI',
+            ('submitted', 'paid'), PayablesBatchService.post_supplier_invoices,
+        )
+
+    @staticmethod
+    @profiled
+    @transaction.atomic
+    def ingest_payment_vouchers(rows):
+        """Payment voucher counterpart of ingest_supplier_invoices; also registers outgoing cheques"""
+        vouchers, posted = PayablesBatchService._ingest(
+            PaymentVoucher, rows, PayablesBatchService.VOUCHER_RELATIONS, 'voucher_number', 'PV',
+            ('submitted', 'cleared'), PayablesBatchService.post_payment_vouchers,
         )
+        ChequeRegister.objects.bulk_create([
+            PaymentVoucherService.cheque_register(voucher)
+            for voucher in vouchers if voucher.payment_method == 'cheque'
+        ], batch_size=PayablesBatchService.BATCH_SIZE)
+        return vouchers, posted
 
-        invoice.tax_amount = tax_amount
-        invoice.total_amount = total_amount
-        invoice.accounting_posted = True
-        if invoice.status == 'draft':
-            invoice.status = 'submitted'
-        invoice.save(update_fields=['tax_amount', 'total_amount', 'accounting_posted', 'status', 'supplier_account'])
 
-        return entry
+class SupplierInvoiceService:
+    """Service for supplier invoice accounting"""
+
+    @staticmethod
+    def post_supplier_invoice(invoice: SupplierInvoice):
+        if invoice.accounting_posted:
+            return None
+        posted, errors = PayablesBatchService.post_supplier_invoices([invoice])
+        if errors:
+            raise ValidationError(errors[invoice.id])
+        return posted[0].journal_entry
 
 
 class PaymentVoucherService:
     """Service for supplier payment vouchers"""
 
     @staticmethod
-    @transaction.atomic
     def post_payment_voucher(voucher: PaymentVoucher):
-        require_transaction_mapping('payment_voucher')
         if voucher.accounting_posted:
             return None
+        posted, errors = PayablesBatchService.post_payment_vouchers([voucher])
+        if errors:
+            raise ValidationError(errors[voucher.id])
+        return posted[0].journal_entry
 
-        # Determine credit account based on payment method
-        if voucher.payment_method == 'cash':
-            credit_account = voucher.cash_account or Account.objects.filter(account_number='1200').first()
-        elif voucher.payment_method == 'bank':
-            credit_account = voucher.bank_account or Account.objects.filter(account_number='1210').first()
-        elif voucher.payment_method == 'cheque':
-            credit_account = voucher.cheques_issued_account or Account.objects.filter(account_number='1240').first()
-        else:
-            raise ValidationError('Invalid payment method.')
-
-        if not credit_account:
-            raise ValidationError('Payment account is required for the selected payment method.')
-
-        cost_center = voucher.cost_center
-        if not cost_center and voucher.supplier.unit:
-            cost_center = voucher.supplier.unit.cost_center
-        if not cost_center:
-            code = f"CC-SUPPLIER-{voucher.supplier.id:04d}"
-            name = f"Supplier {voucher.supplier.first_name} {voucher.supplier.last_name}"
-            cost_center, _ = CostCenter.objects.get_or_create(code=code, defaults={'name': name})
-
-        if not voucher.supplier_account:
-            voucher.supplier_account = voucher.supplier.ledger_account or Account.objects.filter(account_number='2400').first()
-        if not voucher.supplier_account:
-            raise ValidationError('Supplier account is required for payment posting.')
-
-        entry = JournalEntry.objects.create(
-            entry_type='payment',
-            reference_type='payment_voucher',
-            reference_id=voucher.id,
-            description=f"Payment voucher {voucher.voucher_number} - {voucher.supplier.first_name} {voucher.supplier.last_name}",
+    @staticmethod
+    def cheque_register(voucher: PaymentVoucher):
+        """Unsaved outgoing cheque register entry for a cheque payment"""
+        return ChequeRegister(
+            cheque_type='outgoing',
+            cheque_number=voucher.voucher_number,
+            cheque_date=voucher.payment_date,
+            amount=voucher.amount,
+            bank_name='',
+            status='received',
+            payment_voucher=voucher,
+            cheques_issued_account_id=voucher.cheques_issued_account_id,
+            bank_account_id=voucher.bank_account_id,
+            cost_center_id=voucher.cost_center_id,
         )
 
-        # Debit: Supplier payable (reduce liability)
-        JournalLine.objects.create(
-            journal_entry=entry,
-            account=voucher.supplier_account,
-            debit=voucher.amount,
-            credit=Decimal('0.00'),
-            cost_center=cost_center,
-            reference_type='payment_voucher',
-            reference_id=voucher.id,
-        )
 
-        # Credit: Cash/Bank/Cheques issued
-        JournalLine.objects.create(
-            journal_entry=entry,
-            account=credit_account,
-            debit=Decimal('0.00'),
-            credit=voucher.amount,
-            cost_center=cost_center,
-            reference_type='payment_voucher',
-            reference_id=voucher.id,
-        )
+class PayablesAgingService:
+    """
+    Accounts payable aging: open invoice balances (total minus linked,
+    posted payments) per supplier, bucketed by days past due. Invoices
+    without a due date age from their invoice date; void and paid invoices
+    are settled.
+
+    Live aging is one grouped query. snapshot() stores it per supplier in
+    APAgingSnapshot so past dates and trends are read back instead of
+    recomputed; live aging for a past date sees today's invoice statuses.
+    """
+    # (bucket, lowest days past due, highest days past due)
+    BUCKETS = (
+        ('current', None, 0),
+        ('days_1_30', 1, 30),
+        ('days_31_60', 31, 60),
+        ('days_61_90', 61, 90),
+        ('days_over_90', 91, None),
+    )
+    AMOUNT_FIELDS = tuple(bucket for bucket, _, _ in BUCKETS) + ('balance',)
+
+    @staticmethod
+    def _amount(expression):
+        return Coalesce(expression, Value(Decimal('0.00')), output_field=DecimalField(max_digits=15, decimal_places=2))
+
+    @staticmethod
+    def _bucket_filter(as_of, low, high):
+        condition = Q()
+        if low is not None:
+            condition &= Q(due__lte=as_of - timedelta(days=low))
+        if high is not None:
+            condition &= Q(due__gte=as_of - timedelta(days=high))
+        return condition
+
+    @staticmethod
+    def open_invoices(as_of):
+        """Invoices open on ``as_of``, annotated with ``open_amount`` and effective ``due`` date"""
+        paid = PaymentVoucher.objects.filter(
+            supplier_invoice=OuterRef('pk'), accounting_posted=True, payment_date__lte=as_of
+        ).exclude(status='cancelled').order_by().values('supplier_invoice').annotate(
+            total=Sum('amount')
+        ).values('total')
+        return SupplierInvoice.objects.filter(
+            accounting_posted=True, invoice_date__lte=as_of
+        ).exclude(status__in=('void', 'paid')).annotate(
+            open_amount=F('total_amount') - PayablesAgingService._amount(Subquery(paid)),
+            due=Coalesce('due_date', 'invoice_date'),
+        ).filter(open_amount__gt=0)
+
+    @staticmethod
+    def rows(as_of, supplier_id=None):
+        """Per-supplier buckets, balance, open invoice count and oldest due date in one grouped query"""
+        invoices = PayablesAgingService.open_invoices(as_of)
+        if supplier_id:
+            invoices = invoices.filter(supplier_id=supplier_id)
+        amount = PayablesAgingService._amount
+        buckets = {
+            bucket: amount(Sum('open_amount', filter=PayablesAgingService._bucket_filter(as_of, low, high)))
+            for bucket, low, high in PayablesAgingService.BUCKETS
+        }
+        rows = list(invoices.order_by().values(
+            'supplier_id', 'supplier__first_name', 'supplier__last_name'
+        ).annotate(
+            **buckets,
+            balance=amount(Sum('open_amount')),
+            open_invoices=Count('id'),
+            oldest_due_date=Min('due'),
+        ).order_by('-balance', 'supplier_id'))
+        return PayablesAgingService._quantize(rows)
+
+    @staticmethod
+    def _quantize(rows):
+        # SQLite sums decimals as floats
+        for row in rows:
+            for field in PayablesAgingService.AMOUNT_FIELDS:
+                row[field] = Decimal(row[field] or 0).quantize(Decimal('0.01'))
+        return rows
+
+    @staticmethod
+    def _report(as_of, rows, source):
+        totals = {
+            field: sum((row[field] for row in rows), Decimal('0.00')) for field in PayablesAgingService.AMOUNT_FIELDS
+        }
+        totals['open_invoices'] = sum(row['open_invoices'] for row in rows)
+        return {
+            'as_of': as_of.isoformat(),
+            'source': source,
+            'buckets': [bucket for bucket, _, _ in PayablesAgingService.BUCKETS],
+            'totals': totals,
+            'suppliers': [{
+                'supplier_id': row['supplier_id'],
+                'supplier_name': f"{row['supplier__first_name']} {row['supplier__last_name']}",
+                **{field: row[field] for field in PayablesAgingService.AMOUNT_FIELDS},
+                'open_invoices': row['open_invoices'],
+                'oldest_due_date': row['oldest_due_date'],
+            } for row in rows],
+        }
 
-        voucher.accounting_posted = True
-        if voucher.status == 'draft':
-            voucher.status = 'submitted'
-        voucher.save(update_fields=['accounting_posted', 'status', 'supplier_account'])
+    @staticmethod
+    def aging(as_of=None, supplier_id=None):
+        """Aging report for ``as_of`` (today by default), from its snapshot when one was taken"""
+        today = timezone.localdate()
+        as_of = as_of or today
+        if as_of < today:
+            snapshots = APAgingSnapshot.objects.filter(as_of_date=as_of)
+            if snapshots.exists():
+                if supplier_id:
+                    snapshots = snapshots.filter(supplier_id=supplier_id)
+                rows = list(snapshots.order_by('-balance', 'supplier_id').values(
+                    'supplier_id', 'supplier__first_name', 'supplier__last_name',
+                    *PayablesAgingService.AMOUNT_FIELDS, 'open_invoices', 'oldest_due_date',
+                ))
+                return PayablesAgingService._report(as_of, rows, 'snapshot')
+        return PayablesAgingService._report(as_of, PayablesAgingService.rows(as_of, supplier_id), 'live')
 
-        return entry
+    @staticmethod
+    @profiled
+    @transaction.atomic
+    def snapshot(as_of=None):
+        """Store the live aging for ``as_of`` (today by default), replacing an earlier run for that date"""
+        as_of = as_of or timezone.localdate()
+        rows = PayablesAgingService.rows(as_of)
+        APAgingSnapshot.objects.filter(as_of_date=as_of).delete()
+        APAgingSnapshot.objects.bulk_create([
+            APAgingSnapshot(
+                as_of_date=as_of,
+                supplier_id=row['supplier_id'],
+                open_invoices=row['open_invoices'],
+                oldest_due_date=row['oldest_due_date'],
+                **{field: row[field] for field in PayablesAgingService.AMOUNT_FIELDS},
+            ) for row in rows
+        ], batch_size=PayablesBatchService.BATCH_SIZE)
+        return len(rows)
+
+    @staticmethod
+    def history(start=None, end=None, supplier_id=None):
+        """Bucket totals per snapshot date, oldest first"""
+        snapshots = APAgingSnapshot.objects.all()
+        if start:
+            snapshots = snapshots.filter(as_of_date__gte=start)
+        if end:
+            snapshots = snapshots.filter(as_of_date__lte=end)
+        if supplier_id:
+            snapshots = snapshots.filter(supplier_id=supplier_id)
+        return PayablesAgingService._quantize(list(snapshots.order_by().values('as_of_date').annotate(
+            **{field: Sum(field) for field in PayablesAgingService.AMOUNT_FIELDS},
+            suppliers=Count('supplier_id'),
+            open_invoices=Sum('open_invoices'),
+        ).order_by('as_of_date')))
@@ -0,0 +1,154 @@
+import random
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase
+
+from erp_system.apps.accounts.models import Account, CostCenter, JournalLine, TransactionAccountMapping
+from erp_system.apps.property.models import Tenant
+from .models import SupplierInvoice
+from .services import PayablesBatchService, _from_cents
+
+
+def legacy_tax(invoice):
+    """Tax and total as SupplierInvoiceService computed them before the batch pipeline, in Decimal"""
+    tax_amount = invoice.tax_amount or Decimal('0.00')
+    if invoice.is_taxable and tax_amount <= 0:
+        tax_amount = (Decimal(invoice.amount) * Decimal(invoice.tax_rate) / Decimal('100.00')).quantize(Decimal('0.01'))
+    return tax_amount, Decimal(invoice.amount) + Decimal(tax_amount)
+
+
+def invoice(amount, tax_rate='0', tax_amount='0', is_taxable=True):
+    return SupplierInvoice(
+        amount=Decimal(amount), tax_rate=Decimal(tax_rate), tax_amount=Decimal(tax_amount), is_taxable=is_taxable
+    )
+
+
+class ComputeTaxesTests(SimpleTestCase):
+
+    def compute(self, invoices):
+        taxes, totals = PayablesBatchService.compute_taxes(invoices)
+        return [(_from_cents(tax), _from_cents(total)) for tax, total in zip(taxes, totals)]
+
+    def assertMatchesLegacy(self, invoices):
+        self.assertEqual(self.compute(invoices), [legacy_tax(invoice) for invoice in invoices])
+
+    def test_half_cent_ties_round_to_even(self):
+        invoices = [
+            invoice('0.50', '5'),      # 0.025 -> 0.02
+            invoice('0.70', '5'),      # 0.035 -> 0.04
+            invoice('0.10', '25'),     # 0.025 -> 0.02
+            invoice('1.30', '5'),      # 0.065 -> 0.06
+            invoice('2.50', '0.50'),   # 0.0125 -> 0.01
+            invoice('100.10', '7.50'),  # 7.5075 -> 7.51
+        ]
+        self.assertEqual(
+            [tax for tax, _ in self.compute(invoices)],
+            [Decimal(value) for value in ('0.02', '0.04', '0.02', '0.06', '0.01', '7.51')],
+        )
+        self.assertMatchesLegacy(invoices)
+
+    def test_explicit_tax_amount_wins_over_computed(self):
+        invoices = [
+            invoice('1000.00', '15', tax_amount='120.00'),
+            invoice('1000.00', '15'),
+            invoice('1000.00', '15', tax_amount='-5.00'),
+        ]
+        self.assertEqual(self.compute(invoices), [
+            (Decimal('120.00'), Decimal('1120.00')),
+            (Decimal('150.00'), Decimal('1150.00')),
+            (Decimal('150.00'), Decimal('1150.00')),
+        ])
+        self.assertMatchesLegacy(invoices)
+
+    def test_non_taxable_invoices_carry_no_tax(self):
+        invoices = [invoice('250.00', '15', is_taxable=False), invoice('0.01', '0', is_taxable=False)]
+        self.assertEqual(self.compute(invoices), [
+            (Decimal('0.00'), Decimal('250.00')),
+            (Decimal('0.00'), Decimal('0.01')),
+        ])
+        self.assertMatchesLegacy(invoices)
+
+    def test_stray_tax_amount_on_non_taxable_invoice_is_ignored(self):
+        # The Decimal version added it to the total without posting a tax line
+        self.assertEqual(
+            self.compute([invoice('250.00', '15', tax_amount='37.50', is_taxable=False)]),
+            [(Decimal('0.00'), Decimal('250.00'))],
+        )
+
+    def test_matches_legacy_on_random_invoices(self):
+        rng = random.Random(2026)
+        invoices = [
+            invoice(
+                Decimal(rng.randint(1, 10 ** 9)) / 100,
+                Decimal(rng.randint(0, 10000)) / 100,
+                tax_amount=Decimal(rng.choice([0, 0, 0, rng.randint(1, 10 ** 6)])) / 100,
+                is_taxable=rng.random() < 0.8,
+            )
+            for _ in range(5000)
+        ]
+        # Non-taxable invoices with a stray tax amount differ by design, see above
+        invoices = [record for record in invoices if record.is_taxable or not record.tax_amount]
+        self.assertMatchesLegacy(invoices)
+
+    def test_empty_batch(self):
+        taxes, totals = PayablesBatchService.compute_taxes([])
+        self.assertEqual((len(taxes), len(totals)), (0, 0))
+
+
+class PostSupplierInvoicesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.expense = Account.objects.create(account_number='5100', account_name='Repairs', account_type='expense')
+        cls.payable = Account.objects.create(account_number='2400', account_name='Payables', account_type='liability')
+        cls.tax = Account.objects.create(account_number='2300', account_name='Input VAT', account_type='liability')
+        cls.cost_center = CostCenter.objects.create(code='CC-AP', name='Payables')
+        TransactionAccountMapping.objects.create(
+            transaction_type='supplier_invoice', debit_account=cls.expense, credit_account=cls.payable,
+        )
+        cls.supplier = Tenant.objects.create(
+            first_name='Acme', last_name='Supplies', email='ap@example.com', phone='555-0100',
+            move_in_date=date(2026, 1, 1), ledger_account_type='supplier', ledger_account=cls.payable,
+        )
+
+    def create_invoice(self, number, amount, tax_rate='0', tax_amount='0', is_taxable=True):
+        return SupplierInvoice.objects.create(
+            invoice_number=number, supplier=self.supplier, invoice_date=date(2026, 3, 1),
+            amount=Decimal(amount), tax_rate=Decimal(tax_rate), tax_amount=Decimal(tax_amount), is_taxable=is_taxable,
+            expense_account=self.expense, supplier_account=self.payable, tax_account=self.tax,
+            cost_center=self.cost_center,
+        )
+
+    def test_posted_totals_and_entries_match_legacy(self):
+        invoices = [
+            self.create_invoice('SI-1', '0.50', '5'),
+            self.create_invoice('SI-2', '0.70', '5'),
+            self.create_invoice('SI-3', '1000.00', '15', tax_amount='120.00'),
+            self.create_invoice('SI-4', '1000.00', '15'),
+            self.create_invoice('SI-5', '250.00', '15', is_taxable=False),
+        ]
+        expected = {record.pk: legacy_tax(record) for record in invoices}
+        for record in invoices:
+            record.supplier = self.supplier
+
+        posted, errors = PayablesBatchService.post_supplier_invoices(invoices)
+
+        self.assertEqual(errors, {})
+        self.assertEqual(len(posted), len(invoices))
+        for record in SupplierInvoice.objects.filter(pk__in=expected):
+            tax_amount, total_amount = expected[record.pk]
+            self.assertTrue(record.accounting_posted)
+            self.assertEqual((record.tax_amount, record.total_amount), (tax_amount, total_amount))
+
+            lines = JournalLine.objects.filter(reference_type='supplier_invoice', reference_id=record.pk)
+            totals = lines.aggregate(debit=Sum('debit'), credit=Sum('credit'))
+            self.assertEqual(totals['debit'], totals['credit'])
+            self.assertEqual(totals['credit'], total_amount)
+            self.assertEqual(lines.get(account=self.payable).credit, total_amount)
+            tax_lines = lines.filter(account=self.tax)
+            if tax_amount:
+                self.assertEqual(tax_lines.get().debit, tax_amount)
+            else:
+                self.assertFalse(tax_lines.exists())
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PurchaseOrderViewSet, SupplierInvoiceViewSet, PaymentVoucherViewSet
+from .views import PurchaseOrderViewSet, SupplierInvoiceViewSet, PaymentVoucherViewSet, ap_aging, ap_aging_history
 
 router = DefaultRouter()
 router.register(r'orders', PurchaseOrderViewSet)
@@ -8,5 +8,7 @@ router.register(r'supplier-invoices', SupplierInvoiceViewSet)
 router.register(r'payment-vouchers', PaymentVoucherViewSet)
 
 urlpatterns = [
+    path('ap-aging/', ap_aging, name='ap-aging'),
+    path('ap-aging/history/', ap_aging_history, name='ap-aging-history'),
     path('', include(router.urls)),
 ]
@@ -1,16 +1,108 @@
+from datetime import datetime
+from django.conf import settings
+from django.db import transaction
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import viewsets, status
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
+from erp_system.apps.core.bulk import request_ids
+from erp_system.apps.core.caching import ConditionalDetailMixin
+from erp_system.apps.core.db_router import reads_from_replica
 from .models import PurchaseOrder, SupplierInvoice, PaymentVoucher
-from .serializers import PurchaseOrderSerializer, SupplierInvoiceSerializer, PaymentVoucherSerializer
-from .services import SupplierInvoiceService, PaymentVoucherService
-from erp_system.apps.accounts.models import ChequeRegister
+from .serializers import (
+    PurchaseOrderSerializer, SupplierInvoiceSerializer, PaymentVoucherSerializer,
+    SupplierInvoiceBatchSerializer, PaymentVoucherBatchSerializer,
+)
+from .services import SupplierInvoiceService, PaymentVoucherService, PayablesAgingService, PayablesBatchService
 from erp_system.apps.accounts.services import ChequeRegisterService
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.pagination import PageNumberPagination
 
-class PurchaseOrderViewSet(viewsets.ModelViewSet):
+def _query_date(request, name):
+    """Parse an optional YYYY-MM-DD query parameter, returning (date, error response)"""
+    value = request.query_params.get(name)
+    if not value:
+        return None, None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date(), None
+    except ValueError:
+        return None, Response({'error': f'{name} must be in YYYY-MM-DD format.'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _query_supplier(request):
+    supplier = request.query_params.get('supplier')
+    if supplier and not supplier.isdigit():
+        return None, Response({'error': 'supplier must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+    return (int(supplier) if supplier else None), None
+
+
+@api_view(['GET'])
+@reads_from_replica
+def ap_aging(request):
+    """
+    Accounts payable aging and supplier balances: open invoice amounts
+    (totals minus linked payments) per supplier in current, 1-30, 31-60,
+    61-90 and over 90 days past due buckets.
+
+    ?as_of=YYYY-MM-DD (default today) and ?supplier=<id>. Past dates are
+    served from the nightly snapshot when one exists ("source": "snapshot").
+    """
+    as_of, error = _query_date(request, 'as_of')
+    if error:
+        return error
+    supplier_id, error = _query_supplier(request)
+    if error:
+        return error
+    return Response(PayablesAgingService.aging(as_of=as_of, supplier_id=supplier_id))
+
+
+@api_view(['GET'])
+@reads_from_replica
+def ap_aging_history(request):
+    """Snapshot bucket totals per date: ?start=YYYY-MM-DD&end=YYYY-MM-DD&supplier=<id>"""
+    start, error = _query_date(request, 'start')
+    if error:
+        return error
+    end, error = _query_date(request, 'end')
+    if error:
+        return error
+    supplier_id, error = _query_supplier(request)
+    if error:
+        return error
+    return Response(PayablesAgingService.history(start=start, end=end, supplier_id=supplier_id))
+
+
+def _batch_rows(request, key):
+    """Rows of a bulk ingest: {key: [...]} or a bare list, returning (rows, error response)"""
+    rows = request.data.get(key) if isinstance(request.data, dict) else request.data
+    if not isinstance(rows, list) or not rows:
+        return None, Response({'error': f'{key} must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(rows) > settings.AP_BATCH_MAX_DOCUMENTS:
+        return None, Response(
+            {'error': f'At most {settings.AP_BATCH_MAX_DOCUMENTS} documents can be ingested at once.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return rows, None
+
+
+def _validation_error(exc):
+    if hasattr(exc, 'error_dict'):
+        return Response(
+            {'error': 'Some documents are invalid.', 'errors': exc.message_dict},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response({'error': ' '.join(exc.messages)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _posting_result(posted, errors):
+    return Response({
+        'posted': [{'id': document.id, 'journal_entry_id': document.journal_entry.id} for document in posted],
+        'errors': {str(pk): message for pk, message in errors.items()},
+    })
+
+
+class PurchaseOrderViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = PurchaseOrder.objects.all()
     serializer_class = PurchaseOrderSerializer
 
@@ -19,7 +111,7 @@ class CustomPageNumberPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class SupplierInvoiceViewSet(viewsets.ModelViewSet):
+class SupplierInvoiceViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = SupplierInvoice.objects.all()
     serializer_class = SupplierInvoiceSerializer
     pagination_class = CustomPageNumberPagination
@@ -34,6 +126,47 @@ class SupplierInvoiceViewSet(viewsets.ModelViewSet):
         if invoice.status in ['submitted', 'paid']:
             SupplierInvoiceService.post_supplier_invoice(invoice)
 
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        """
+        Ingest an AP run: POST {"invoices": [{...}, ...]} with the fields of
+        a single create. Submitted and paid invoices are posted. All or
+        nothing; row errors are keyed by position.
+        """
+        rows, error = _batch_rows(request, 'invoices')
+        if error:
+            return error
+        serializer = SupplierInvoiceBatchSerializer(data=rows, many=True)
+        serializer.is_valid(raise_exception=True)
+        try:
+            invoices, posted = PayablesBatchService.ingest_supplier_invoices(serializer.validated_data)
+        except DjangoValidationError as exc:
+            return _validation_error(exc)
+        return Response({
+            'created': [{'id': invoice.id, 'invoice_number': invoice.invoice_number} for invoice in invoices],
+            'posted': len(posted),
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def bulk_post(self, request):
+        """Post draft invoices: POST {"ids": [1, 2, 3]}"""
+        ids, error = request_ids(request)
+        if error:
+            return error
+        try:
+            with transaction.atomic():
+                invoices = list(
+                    SupplierInvoice.objects.select_for_update().select_related('supplier__unit').filter(id__in=ids)
+                )
+                already_posted = {invoice.id for invoice in invoices if invoice.accounting_posted}
+                posted, errors = PayablesBatchService.post_supplier_invoices(invoices)
+        except DjangoValidationError as exc:
+            return _validation_error(exc)
+        found = {invoice.id for invoice in invoices}
+        errors.update({pk: 'Already posted.' for pk in already_posted})
+        errors.update({pk: 'Not found.' for pk in ids if pk not in found})
+        return _posting_result(posted, errors)
+
 
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
@@ -44,7 +177,7 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
-class PaymentVoucherViewSet(viewsets.ModelViewSet):
+class PaymentVoucherViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = PaymentVoucher.objects.all()
     serializer_class = PaymentVoucherSerializer
     pagination_class = StandardResultsSetPagination
@@ -83,18 +216,48 @@ class PaymentVoucherViewSet(viewsets.ModelViewSet):
             PaymentVoucherService.post_payment_voucher(voucher)
 
         if voucher.payment_method == 'cheque':
-            ChequeRegister.objects.create(
-                cheque_type='outgoing',
-                cheque_number=voucher.voucher_number,
-                cheque_date=voucher.payment_date,
-                amount=voucher.amount,
-                bank_name='',
-                status='received',
-                payment_voucher=voucher,
-                cheques_issued_account=voucher.cheques_issued_account,
-                bank_account=voucher.bank_account,
-                cost_center=voucher.cost_center,
-            )
+            PaymentVoucherService.cheque_register(voucher).save()
+
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        """
+        Ingest supplier payments: POST {"vouchers": [{...}, ...]}. Submitted
+        and cleared vouchers are posted and cheque payments registered.
+        All or nothing; row errors are keyed by position.
+        """
+        rows, error = _batch_rows(request, 'vouchers')
+        if error:
+            return error
+        serializer = PaymentVoucherBatchSerializer(data=rows, many=True)
+        serializer.is_valid(raise_exception=True)
+        try:
+            vouchers, posted = PayablesBatchService.ingest_payment_vouchers(serializer.validated_data)
+        except DjangoValidationError as exc:
+            return _validation_error(exc)
+        return Response({
+            'created': [{'id': voucher.id, 'voucher_number': voucher.voucher_number} for voucher in vouchers],
+            'posted': len(posted),
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def bulk_post(self, request):
+        """Post draft vouchers: POST {"ids": [1, 2, 3]}"""
+        ids, error = request_ids(request)
+        if error:
+            return error
+        try:
+            with transaction.atomic():
+                vouchers = list(
+                    PaymentVoucher.objects.select_for_update().select_related('supplier__unit').filter(id__in=ids)
+                )
+                already_posted = {voucher.id for voucher in vouchers if voucher.accounting_posted}
+                posted, errors = PayablesBatchService.post_payment_vouchers(vouchers)
+        except DjangoValidationError as exc:
+            return _validation_error(exc)
+        found = {voucher.id for voucher in vouchers}
+        errors.update({pk: 'Already posted.' for pk in already_posted})
+        errors.update({pk: 'Not found.' for pk in ids if pk not in found})
+        return _posting_result(posted, errors)
 
     @action(detail=True, methods=['post'])
     def mark_cleared(self, request, pk=None):
@@ -108,6 +271,6 @@ class PaymentVoucherViewSet(viewsets.ModelViewSet):
 
         ChequeRegisterService.mark_cleared(cheque)
         voucher.status = 'cleared'
-        voucher.save(update_fields=['status'])
+        voucher.save(update_fields=['status', 'updated_at'])
 
         return Response(self.get_serializer(voucher).data)
@@ -5,8 +5,9 @@ Sales app services for receipt voucher accounting.
 from django.db import transaction
 from decimal import Decimal
 from django.core.exceptions import ValidationError
-from erp_system.apps.accounts.models import Account, JournalEntry, JournalLine, CostCenter
-from erp_system.apps.accounts.services import require_transaction_mapping
+from erp_system.apps.core.profiling import profiled
+from erp_system.apps.accounts.models import Account, JournalEntry, JournalLine
+from erp_system.apps.accounts.services import CostCenterProvisioningService, require_transaction_mapping
 from erp_system.apps.sales.models import ReceiptVoucher, CustomerInvoice
 
 
@@ -14,6 +15,7 @@ class ReceiptVoucherService:
     """Service for receipt voucher (tenant payment) accounting"""
     
     @staticmethod
+    @profiled
     @transaction.atomic
     def post_receipt_voucher(receipt_voucher):
         require_transaction_mapping('receipt_voucher')
@@ -50,13 +52,8 @@ class ReceiptVoucherService:
             cost_center = receipt_voucher.tenant.unit.cost_center
         
         if not cost_center:
-            # Create default cost center
-            code = f"CC-TENANT-{receipt_voucher.tenant.id:04d}"
-            name = f"Tenant {receipt_voucher.tenant.first_name} {receipt_voucher.tenant.last_name}"
-            cost_center, created = CostCenter.objects.get_or_create(
-                code=code,
-                defaults={'name': name}
-            )
+            # Fall back to the tenant's own cost center
+            cost_center = CostCenterProvisioningService.for_tenant(receipt_voucher.tenant)
         
         # Create journal entry
         journal_entry = JournalEntry.objects.create(
@@ -89,7 +86,7 @@ class ReceiptVoucherService:
         receipt_voucher.accounting_posted = True
         if receipt_voucher.status == 'draft':
             receipt_voucher.status = 'submitted'
-        receipt_voucher.save(update_fields=['accounting_posted', 'status', 'tenant_account'])
+        receipt_voucher.save(update_fields=['accounting_posted', 'status', 'tenant_account', 'updated_at'])
         
         return journal_entry
 
@@ -98,6 +95,7 @@ class CustomerInvoiceService:
     """Service for customer invoice accounting"""
 
     @staticmethod
+    @profiled
     @transaction.atomic
     def post_customer_invoice(invoice: CustomerInvoice):
         require_transaction_mapping('customer_invoice')
@@ -118,9 +116,7 @@ class CustomerInvoiceService:
         if not cost_center and invoice.tenant.unit:
             cost_center = invoice.tenant.unit.cost_center
         if not cost_center:
-            code = f"CC-TENANT-{invoice.tenant.id:04d}"
-            name = f"Tenant {invoice.tenant.first_name} {invoice.tenant.last_name}"
-            cost_center, _ = CostCenter.objects.get_or_create(code=code, defaults={'name': name})
+            cost_center = CostCenterProvisioningService.for_tenant(invoice.tenant)
 
         entry = JournalEntry.objects.create(
             entry_type='invoice',
@@ -176,6 +172,6 @@ class CustomerInvoiceService:
         invoice.accounting_posted = True
         if invoice.status == 'draft':
             invoice.status = 'submitted'
-        invoice.save(update_fields=['tax_amount', 'total_amount', 'accounting_posted', 'status'])
+        invoice.save(update_fields=['tax_amount', 'total_amount', 'accounting_posted', 'status', 'updated_at'])
 
         return entry
@@ -9,9 +9,11 @@ from erp_system.apps.accounts.models import ChequeRegister
 from erp_system.apps.accounts.services import ChequeRegisterService
 from rest_framework.pagination import PageNumberPagination
 from erp_system.apps.property.models import Tenant
+from erp_system.apps.core.caching import ConditionalDetailMixin
+from erp_system.apps.core.db_router import reads_from_replica
 
 
-class SalesOrderViewSet(viewsets.ModelViewSet):
+class SalesOrderViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     queryset = SalesOrder.objects.all()
     serializer_class = SalesOrderSerializer
 
@@ -21,7 +23,7 @@ class CustomPageNumberPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class ReceiptVoucherViewSet(viewsets.ModelViewSet):
+class ReceiptVoucherViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     """
     ViewSet for Receipt Vouchers
     
@@ -31,6 +33,7 @@ class ReceiptVoucherViewSet(viewsets.ModelViewSet):
     """
     queryset = ReceiptVoucher.objects.all()
     serializer_class = ReceiptVoucherSerializer
+    etag_dependencies = {'tenant': 'updated_at'}
     pagination_class = CustomPageNumberPagination 
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['tenant', 'payment_method', 'status', 'payment_date']
@@ -109,7 +112,7 @@ class ReceiptVoucherViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CustomerInvoiceViewSet(viewsets.ModelViewSet):
+class CustomerInvoiceViewSet(ConditionalDetailMixin, viewsets.ModelViewSet):
     """Customer invoice viewset with accounting posting"""
     queryset = CustomerInvoice.objects.all()
     serializer_class = CustomerInvoiceSerializer
@@ -148,6 +151,7 @@ class CustomerInvoiceViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @reads_from_replica
     def summary(self, request):
         """Get summary statistics for receipt vouchers"""
         total_receipts = ReceiptVoucher.objects.count()
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'erp_system.apps.search'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from . import indexes  # noqa: F401
+        from .registry import indexed_models
+        from .signals import instance_deleted, instance_saved
+        for model in indexed_models():
+            post_save.connect(instance_saved, sender=model, dispatch_uid=f'search.saved.{model._meta.label_lower}')
+            post_delete.connect(instance_deleted, sender=model, dispatch_uid=f'search.deleted.{model._meta.label_lower}')
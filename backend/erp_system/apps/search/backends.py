@@ -0,0 +1,141 @@
+"""
+Vendor-specific full-text index over SearchDocument.
+
+SQLite uses an external-content FTS5 table kept in sync by triggers and
+ranked with bm25(); PostgreSQL uses a GIN index on a weighted tsvector
+expression ranked with ts_rank(). Title matches weigh most, then subtitle,
+then body. Other backends fall back to a substring scan.
+"""
+
+import re
+from django.db import connection
+
+FTS_TABLE = 'search_searchdocument_fts'
+
+SQLITE_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, subtitle, body,
+        content='search_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER search_searchdocument_ai AFTER INSERT ON search_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, subtitle, body) VALUES (new.id, new.title, new.subtitle, new.body);
+    END""",
+    f"""CREATE TRIGGER search_searchdocument_ad AFTER DELETE ON search_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, subtitle, body)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.body);
+    END""",
+    f"""CREATE TRIGGER search_searchdocument_au AFTER UPDATE ON search_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, subtitle, body)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, subtitle, body) VALUES (new.id, new.title, new.subtitle, new.body);
+    END""",
+]
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS search_searchdocument_au',
+    'DROP TRIGGER IF EXISTS search_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS search_searchdocument_ai',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+# bm25() column weights for title, subtitle and body
+SQLITE_WEIGHTS = (10.0, 4.0, 1.0)
+
+# The query repeats this expression verbatim so the planner uses the index
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple'::regconfig, title), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, subtitle), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, body), 'C')"
+)
+POSTGRES_SCHEMA = [
+    f'CREATE INDEX search_document_vector_idx ON search_searchdocument USING GIN (({POSTGRES_VECTOR}))',
+]
+POSTGRES_DROP = ['DROP INDEX IF EXISTS search_document_vector_idx']
+
+MAX_TERMS = 8
+TERM_RE = re.compile(r'[^\W_]+')
+
+
+def terms(query):
+    """Lowercased word tokens of a user query, split the way both tokenizers split text"""
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def create_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in SQLITE_SCHEMA if vendor == 'sqlite' else POSTGRES_SCHEMA if vendor == 'postgresql' else []:
+        schema_editor.execute(sql)
+
+
+def drop_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in SQLITE_DROP if vendor == 'sqlite' else POSTGRES_DROP if vendor == 'postgresql' else []:
+        schema_editor.execute(sql)
+
+
+def _kind_filter(kinds, column):
+    if not kinds:
+        return '', []
+    return f" AND {column} IN ({', '.join(['%s'] * len(kinds))})", list(kinds)
+
+
+def _sqlite_search(words, kinds, limit):
+    # Every term must match; each is a prefix so results appear while typing
+    match = ' '.join(f'"{word}"*' for word in words)
+    kind_sql, kind_params = _kind_filter(kinds, 'd.kind')
+    sql = f"""
+        SELECT d.kind, d.object_id, d.title, d.subtitle, -bm25({FTS_TABLE}, %s, %s, %s) AS score
+        FROM {FTS_TABLE} JOIN search_searchdocument d ON d.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH %s{kind_sql}
+        ORDER BY score DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*SQLITE_WEIGHTS, match, *kind_params, limit])
+        return cursor.fetchall()
+
+
+def _postgres_search(words, kinds, limit):
+    tsquery = ' & '.join(f'{word}:*' for word in words)
+    kind_sql, kind_params = _kind_filter(kinds, 'kind')
+    sql = f"""
+        SELECT kind, object_id, title, subtitle, ts_rank({POSTGRES_VECTOR}, query) AS score
+        FROM search_searchdocument, to_tsquery('simple'::regconfig, %s) query
+        WHERE ({POSTGRES_VECTOR}) @@ query{kind_sql}
+        ORDER BY score DESC, id
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [tsquery, *kind_params, limit])
+        return cursor.fetchall()
+
+
+def _scan_search(words, kinds, limit):
+    from django.db.models import Q
+    from .models import SearchDocument
+    documents = SearchDocument.objects.all()
+    for word in words:
+        documents = documents.filter(
+            Q(title__icontains=word) | Q(subtitle__icontains=word) | Q(body__icontains=word)
+        )
+    if kinds:
+        documents = documents.filter(kind__in=kinds)
+    return [(*row, 0.0) for row in documents.values_list('kind', 'object_id', 'title', 'subtitle')[:limit]]
+
+
+def search(query, kinds=None, limit=20):
+    """Best matches as (kind, object_id, title, subtitle, score) rows, best first"""
+    words = terms(query)
+    if not words:
+        return []
+    if connection.vendor == 'sqlite':
+        return _sqlite_search(words, kinds, limit)
+    if connection.vendor == 'postgresql':
+        return _postgres_search(words, kinds, limit)
+    return _scan_search(words, kinds, limit)
+
+
+def optimize():
+    """Merge index segments after a bulk rebuild"""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
@@ -0,0 +1,118 @@
+"""
+Searchable records. Titles are what a user types first (names and document
+numbers); bodies carry the related names a record is also found by.
+"""
+
+from erp_system.apps.property.models import Lease, Maintenance, Property, RentalLegalCase, Tenant, Unit
+from erp_system.apps.purchase.models import PaymentVoucher, SupplierInvoice
+from erp_system.apps.sales.models import CustomerInvoice, ReceiptVoucher
+from .registry import register
+
+
+def _join(*parts, sep=' '):
+    return sep.join(str(part) for part in parts if part)
+
+
+def _name(tenant):
+    return f'{tenant.first_name} {tenant.last_name}' if tenant else ''
+
+
+@register('property', 'Property', Property)
+def property_document(prop):
+    return {
+        'title': prop.name,
+        'subtitle': _join(prop.property_id, prop.city),
+        'body': _join(prop.street_address, prop.city, prop.state, prop.country, prop.description),
+    }
+
+
+@register('unit', 'Unit', Unit, select_related=['property'], related=[(Property, 'property')])
+def unit_document(unit):
+    return {
+        'title': f'Unit {unit.unit_number}',
+        'subtitle': unit.property.name,
+        'body': _join(unit.unit_type, unit.property.property_id),
+    }
+
+
+@register('tenant', 'Tenant', Tenant, select_related=['unit__property'], related=[(Unit, 'unit')])
+def tenant_document(tenant):
+    unit = tenant.unit
+    return {
+        'title': _name(tenant),
+        'subtitle': tenant.email,
+        'body': _join(tenant.phone, tenant.emergency_contact, unit and unit.unit_number, unit and unit.property.name),
+    }
+
+
+@register('lease', 'Lease', Lease, select_related=['tenant', 'unit__property'],
+          related=[(Tenant, 'tenant'), (Unit, 'unit'), (Property, 'unit__property')])
+def lease_document(lease):
+    return {
+        'title': lease.lease_number,
+        'subtitle': _join(
+            _name(lease.tenant), f'{lease.unit.property.name} Unit {lease.unit.unit_number}', sep=' - '
+        ),
+        'body': '',
+    }
+
+
+@register('maintenance', 'Maintenance request', Maintenance, select_related=['property', 'unit'],
+          related=[(Property, 'property')])
+def maintenance_document(record):
+    return {
+        'title': _join(record.maintenance_id, record.title),
+        'subtitle': _join(record.property.name, record.unit and f'Unit {record.unit.unit_number}'),
+        'body': _join(record.description, record.assigned_to),
+    }
+
+
+@register('legal_case', 'Legal case', RentalLegalCase, select_related=['tenant', 'lease', 'property', 'unit'],
+          related=[(Tenant, 'tenant')])
+def legal_case_document(case):
+    return {
+        'title': case.case_number,
+        'subtitle': _join(case.court_name, _name(case.tenant), sep=' - '),
+        'body': _join(case.get_case_type_display(), case.lease.lease_number, case.property.name,
+                      case.unit.unit_number, case.remarks),
+    }
+
+
+@register('receipt_voucher', 'Receipt voucher', ReceiptVoucher, select_related=['tenant', 'lease'],
+          related=[(Tenant, 'tenant')])
+def receipt_voucher_document(receipt):
+    return {
+        'title': receipt.receipt_number or f'Receipt {receipt.pk}',
+        'subtitle': _name(receipt.tenant),
+        'body': _join(receipt.cheque_number, receipt.bank_name, receipt.lease and receipt.lease.lease_number),
+    }
+
+
+@register('customer_invoice', 'Customer invoice', CustomerInvoice, select_related=['tenant', 'lease'],
+          related=[(Tenant, 'tenant')])
+def customer_invoice_document(invoice):
+    return {
+        'title': invoice.invoice_number or f'Invoice {invoice.pk}',
+        'subtitle': _name(invoice.tenant),
+        'body': invoice.lease.lease_number if invoice.lease else '',
+    }
+
+
+@register('supplier_invoice', 'Supplier invoice', SupplierInvoice, select_related=['supplier'],
+          related=[(Tenant, 'supplier')])
+def supplier_invoice_document(invoice):
+    return {
+        'title': invoice.invoice_number or f'Supplier invoice {invoice.pk}',
+        'subtitle': _name(invoice.supplier),
+        'body': '',
+    }
+
+
+@register('payment_voucher', 'Payment voucher', PaymentVoucher, select_related=['supplier', 'supplier_invoice'],
+          related=[(Tenant, 'supplier')])
+def payment_voucher_document(voucher):
+    return {
+        'title': voucher.voucher_number or f'Payment voucher {voucher.pk}',
+        'subtitle': _name(voucher.supplier),
+        'body': voucher.supplier_invoice.invoice_number if voucher.supplier_invoice else '',
+    }
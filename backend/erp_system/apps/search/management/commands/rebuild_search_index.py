@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from erp_system.apps.search.registry import search_indexes
+from erp_system.apps.search.services import SearchIndexService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild search documents (after imports, bulk updates or loading fixtures)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kinds', nargs='+', help='Only rebuild these kinds')
+        parser.add_argument('--batch-size', type=int, help='Documents written per upsert')
+
+    def handle(self, *args, **options):
+        kinds = options.get('kinds')
+        known = {index.kind for index in search_indexes()}
+        unknown = sorted(set(kinds or []) - known)
+        if unknown:
+            raise CommandError(f"Unknown kinds: {', '.join(unknown)}. Choose from: {', '.join(sorted(known))}.")
+
+        counts = SearchIndexService.rebuild(
+            kinds=kinds,
+            batch_size=options.get('batch_size'),
+            progress=lambda kind, count: self.stdout.write(f'{kind}: {count} documents'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Indexed {sum(counts.values())} documents.'))
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:13
+
+from django.db import migrations, models
+from erp_system.apps.search.backends import create_index, drop_index
+
+
+def create_full_text_index(apps, schema_editor):
+    create_index(schema_editor)
+
+
+def drop_full_text_index(apps, schema_editor):
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('subtitle', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='search_document_kind_object_uniq'),
+        ),
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+    ]
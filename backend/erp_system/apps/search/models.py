@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized text of one searchable record, kept current by post_save and
+    post_delete signals. The full-text index over title, subtitle and body is
+    created by migration 0001: an FTS5 table on SQLite, a weighted tsvector
+    GIN index on PostgreSQL. On SQLite, a migration that rebuilds this table
+    drops the FTS triggers with it and must recreate them.
+    """
+    kind = models.CharField(max_length=30)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_document_kind_object_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.title}"
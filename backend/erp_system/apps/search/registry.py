@@ -0,0 +1,56 @@
+"""
+Search index registry.
+
+Each searchable model registers a ``document(instance)`` function returning
+``{'title', 'subtitle', 'body'}``. ``related`` lists ``(model, lookup)``
+pairs whose saves change this kind's documents (a renamed tenant changes
+the text of their leases), so those documents are rebuilt as well.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    kind: str
+    label: str
+    model: type
+    document: Callable
+    select_related: tuple = ()
+    related: tuple = field(default=())
+
+    def queryset(self):
+        return self.model._default_manager.select_related(*self.select_related).order_by('pk')
+
+
+_indexes = {}
+
+
+def register(kind, label, model, select_related=(), related=()):
+    def decorator(document):
+        _indexes[kind] = SearchIndex(kind, label, model, document, tuple(select_related), tuple(related))
+        return document
+    return decorator
+
+
+def get_index(kind):
+    return _indexes.get(kind)
+
+
+def search_indexes():
+    return list(_indexes.values())
+
+
+def indexes_for_model(model):
+    return [index for index in _indexes.values() if index.model is model]
+
+
+def indexed_models():
+    """Models whose saves update the index, directly or through ``related``"""
+    models = []
+    for index in _indexes.values():
+        for model in (index.model, *(related for related, _ in index.related)):
+            if model not in models:
+                models.append(model)
+    return models
@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.db.models import Subquery
+from django.utils import timezone
+from . import backends
+from .models import SearchDocument
+from .registry import get_index, indexes_for_model, search_indexes
+
+UPDATE_FIELDS = ['title', 'subtitle', 'body', 'updated_at']
+
+
+def _clip(value, length):
+    return value[:length] if value else ''
+
+
+class SearchIndexService:
+    """Maintains SearchDocument rows and answers /api/search/ queries"""
+
+    @staticmethod
+    def build_documents(index, instances):
+        now = timezone.now()
+        documents = []
+        for instance in instances:
+            fields = index.document(instance)
+            documents.append(SearchDocument(
+                kind=index.kind,
+                object_id=instance.pk,
+                title=_clip(fields.get('title'), 255),
+                subtitle=_clip(fields.get('subtitle'), 255),
+                body=fields.get('body') or '',
+                updated_at=now,
+            ))
+        return documents
+
+    @staticmethod
+    def index_objects(index, instances, batch_size=None):
+        """Insert or refresh the documents of ``instances`` with one upsert per batch"""
+        documents = SearchIndexService.build_documents(index, instances)
+        if documents:
+            SearchDocument.objects.bulk_create(
+                documents,
+                batch_size=batch_size or settings.SEARCH_INDEX_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['kind', 'object_id'],
+                update_fields=UPDATE_FIELDS,
+            )
+        return len(documents)
+
+    @staticmethod
+    def index_queryset(index, queryset, batch_size=None):
+        batch_size = batch_size or settings.SEARCH_INDEX_BATCH_SIZE
+        indexed, batch = 0, []
+        for instance in queryset.iterator(chunk_size=batch_size):
+            batch.append(instance)
+            if len(batch) >= batch_size:
+                indexed += SearchIndexService.index_objects(index, batch, batch_size)
+                batch = []
+        return indexed + SearchIndexService.index_objects(index, batch, batch_size)
+
+    @staticmethod
+    def index_instance(instance):
+        """Refresh the documents of a saved record and of the records that embed its text"""
+        model = type(instance)
+        for index in indexes_for_model(model):
+            SearchIndexService.index_objects(index, [instance])
+        for index in search_indexes():
+            for related_model, lookup in index.related:
+                if related_model is model:
+                    SearchIndexService.index_queryset(index, index.queryset().filter(**{lookup: instance.pk}))
+
+    @staticmethod
+    def index_records(model, pks):
+        """Bulk counterpart of index_instance for writes that skip post_save (bulk_create, bulk_update)"""
+        pks = list(pks)
+        if not pks:
+            return
+        for index in indexes_for_model(model):
+            SearchIndexService.index_queryset(index, index.queryset().filter(pk__in=pks))
+        for index in search_indexes():
+            for related_model, lookup in index.related:
+                if related_model is model:
+                    SearchIndexService.index_queryset(index, index.queryset().filter(**{f'{lookup}__in': pks}))
+
+    @staticmethod
+    def remove_instance(instance):
+        kinds = [index.kind for index in indexes_for_model(type(instance))]
+        if kinds:
+            SearchDocument.objects.filter(kind__in=kinds, object_id=instance.pk).delete()
+
+    @staticmethod
+    def rebuild(kinds=None, batch_size=None, progress=None):
+        """
+        Re-index every record of the given kinds (all by default) and drop
+        documents whose record no longer exists. Bulk writes that bypass
+        signals (queryset.update, bulk_create) are picked up here.
+        """
+        counts = {}
+        for index in search_indexes():
+            if kinds and index.kind not in kinds:
+                continue
+            counts[index.kind] = SearchIndexService.index_queryset(index, index.queryset(), batch_size)
+            SearchDocument.objects.filter(kind=index.kind).exclude(
+                object_id__in=Subquery(index.model._default_manager.values('pk'))
+            ).delete()
+            if progress:
+                progress(index.kind, counts[index.kind])
+        backends.optimize()
+        return counts
+
+    @staticmethod
+    def search(query, kinds=None, limit=None):
+        limit = min(limit or settings.SEARCH_DEFAULT_LIMIT, settings.SEARCH_MAX_LIMIT)
+        results = []
+        for kind, object_id, title, subtitle, score in backends.search(query, kinds, limit):
+            index = get_index(kind)
+            results.append({
+                'kind': kind,
+                'label': index.label if index else kind,
+                'id': object_id,
+                'title': title,
+                'subtitle': subtitle,
+                'score': round(float(score), 4),
+            })
+        return results
@@ -0,0 +1,12 @@
+from .services import SearchIndexService
+
+
+def instance_saved(sender, instance, raw=False, **kwargs):
+    # Fixture loading: documents are built by rebuild_search_index afterwards
+    if raw:
+        return
+    SearchIndexService.index_instance(instance)
+
+
+def instance_deleted(sender, instance, **kwargs):
+    SearchIndexService.remove_instance(instance)
@@ -0,0 +1,39 @@
+import time
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from .registry import get_index
+from .services import SearchIndexService
+
+
+@api_view(['GET'])
+def search(request):
+    """
+    Full-text search across tenants, properties, units, leases, legal cases
+    and vouchers.
+
+    GET /api/search/?q=john%20smi&kind=tenant,lease&limit=20 returns ranked
+    {"kind", "label", "id", "title", "subtitle", "score"} results. Every word
+    must match, each as a prefix of a word in the record.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    kinds = [kind for kind in request.query_params.get('kind', '').split(',') if kind]
+    unknown = [kind for kind in kinds if not get_index(kind)]
+    if unknown:
+        return Response({'error': f"Unknown kind: {', '.join(unknown)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+    limit = request.query_params.get('limit')
+    if limit is not None and (not limit.isdigit() or int(limit) < 1):
+        return Response({'error': 'limit must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    started = time.perf_counter()
+    results = SearchIndexService.search(query, kinds=kinds, limit=int(limit) if limit else None)
+    return Response({
+        'query': query,
+        'count': len(results),
+        'took_ms': round((time.perf_counter() - started) * 1000, 2),
+        'results': results,
+    })
@@ -5,6 +5,7 @@ Django settings for erp_system project.
 from pathlib import Path
 from decouple import config
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -40,6 +41,9 @@ INSTALLED_APPS = [
     'erp_system.apps.sales',
     'erp_system.apps.auth_api',
     'erp_system.apps.maintenance',
+    'erp_system.apps.core',
+    'erp_system.apps.jobs',
+    'erp_system.apps.search',
     
     # Property Management App
     'erp_system.apps.property',
@@ -47,6 +51,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'erp_system.apps.core.middleware.QueryMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -77,25 +82,68 @@ TEMPLATES = [
 WSGI_APPLICATION = 'erp_system.config.wsgi.application'
 
 # Database
-# Using SQLite for quick start - change to PostgreSQL later
-DATABASES = {
+# SQLite is the zero-setup default. Set USE_POSTGRES=True (with the DB_* settings)
+# for production: SQLite serializes every write, so concurrent posting and
+# month-end jobs block each other.
+if config('USE_POSTGRES', default=False, cast=bool):
+    def _postgres(host, port):
+        return {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='erp_property_db'),
+            'USER': config('DB_USER', default='erp_user'),
+            'PASSWORD': config('DB_PASSWORD', default='password'),
+            'HOST': host,
+            'PORT': port,
+            # Persistent connections, validated before reuse
+            'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            # Required behind PgBouncer in transaction pooling mode
+            'DISABLE_SERVER_SIDE_CURSORS': config('DB_USE_PGBOUNCER', default=False, cast=bool),
+            'OPTIONS': {
+                'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+            },
+        }
+
+    DATABASES = {
+        'default': _postgres(config('DB_HOST', default='localhost'), config('DB_PORT', default='5432')),
+    }
+    if config('DB_REPLICA_HOST', default=''):
+        DATABASES['replica'] = _postgres(
+            config('DB_REPLICA_HOST'), config('DB_REPLICA_PORT', default=config('DB_PORT', default='5432'))
+        )
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+    # A second SQLite file (e.g. a copy of db.sqlite3) to exercise replica routing locally
+    if config('SQLITE_REPLICA_NAME', default=''):
+        DATABASES['replica'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('SQLITE_REPLICA_NAME'),
+        }
+
+if 'replica' in DATABASES:
+    # Tests use the primary; there is no replication in a test database
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+# Reporting endpoints opt in to the replica; everything else uses the primary
+DATABASE_ROUTERS = ['erp_system.apps.core.db_router.ReplicaRouter']
+
+# Cache
+# File based by default so every worker process on the host shares it;
+# point CACHE_BACKEND/CACHE_LOCATION at Redis or Memcached for multiple hosts.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('CACHE_LOCATION', default=os.path.join(tempfile.gettempdir(), 'erp_system_cache')),
+        'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=10000, cast=int)},
     }
 }
-
-# PostgreSQL configuration (commented out - uncomment after installing PostgreSQL)
-# DATABASES = {
-#     'default': {
-#         'ENGINE': config('DB_ENGINE', default='django.db.backends.postgresql'),
-#         'NAME': config('DB_NAME', default='erp_property_db'),
-#         'USER': config('DB_USER', default='erp_user'),
-#         'PASSWORD': config('DB_PASSWORD', default='password'),
-#         'HOST': config('DB_HOST', default='localhost'),
-#         'PORT': config('DB_PORT', default='5432'),
-#     }
-# }
+REFERENCE_CACHE_ALIAS = 'default'
+REFERENCE_CACHE_TIMEOUT = config('REFERENCE_CACHE_TIMEOUT', default=3600, cast=int)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -140,14 +188,20 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'erp_system.apps.auth_api.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
+        # Batched sub-requests reuse the batch request's authentication
+        'erp_system.apps.core.batch.BatchAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
 }
 
+# Token lookups are cached; last use is written to TokenActivity in batches
+AUTH_TOKEN_CACHE_TIMEOUT = config('AUTH_TOKEN_CACHE_TIMEOUT', default=60, cast=int)
+AUTH_TOKEN_USAGE_FLUSH_INTERVAL = config('AUTH_TOKEN_USAGE_FLUSH_INTERVAL', default=60, cast=int)
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
@@ -165,3 +219,47 @@ CSRF_TRUSTED_ORIGINS = config(
 CSRF_COOKIE_SECURE = False  # Set to True in production with HTTPS
 CSRF_COOKIE_HTTPONLY = False  # Allow JavaScript to read CSRF token
 CSRF_COOKIE_SAMESITE = 'Lax'  # Allow cross-origin requests from trusted origins
+
+# Request metrics (exposed to admins on /api/metrics/)
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_SERVER_TIMING = config('METRICS_SERVER_TIMING', default=DEBUG, cast=bool)
+METRICS_SAMPLE_SIZE = config('METRICS_SAMPLE_SIZE', default=1000, cast=int)
+METRICS_DUPLICATE_QUERY_THRESHOLD = config('METRICS_DUPLICATE_QUERY_THRESHOLD', default=5, cast=int)
+
+# Service-layer profiling (exposed to admins on /api/metrics/profile/)
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=True, cast=bool)
+PROFILING_BUFFER_SIZE = config('PROFILING_BUFFER_SIZE', default=2000, cast=int)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+
+# SQLite performance mode (WAL journaling and larger caches), opt-in and ignored on PostgreSQL.
+# WAL is persistent on the database file and adds -wal/-shm files next to it.
+SQLITE_PERFORMANCE_MODE = config('SQLITE_PERFORMANCE_MODE', default=False, cast=bool)
+SQLITE_BUSY_TIMEOUT_MS = config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int)
+SQLITE_CACHE_SIZE_KB = config('SQLITE_CACHE_SIZE_KB', default=65536, cast=int)
+SQLITE_MMAP_SIZE = config('SQLITE_MMAP_SIZE', default=268435456, cast=int)
+
+# Background jobs (run with manage.py run_job_worker)
+JOBS_POLL_INTERVAL = config('JOBS_POLL_INTERVAL', default=2.0, cast=float)
+JOBS_PROGRESS_INTERVAL = config('JOBS_PROGRESS_INTERVAL', default=1.0, cast=float)
+JOBS_HEARTBEAT_INTERVAL = config('JOBS_HEARTBEAT_INTERVAL', default=15, cast=int)
+JOBS_STALE_AFTER = config('JOBS_STALE_AFTER', default=120, cast=int)
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=3, cast=int)
+JOBS_STATE_TTL = config('JOBS_STATE_TTL', default=86400, cast=int)
+# Finished jobs and their export/upload files are deleted after this many days by prune_jobs
+JOBS_RETENTION_DAYS = config('JOBS_RETENTION_DAYS', default=30, cast=int)
+
+# Batched GET requests on /api/batch/
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
+
+# Full-text search on /api/search/
+SEARCH_DEFAULT_LIMIT = config('SEARCH_DEFAULT_LIMIT', default=20, cast=int)
+SEARCH_MAX_LIMIT = config('SEARCH_MAX_LIMIT', default=100, cast=int)
+SEARCH_INDEX_BATCH_SIZE = config('SEARCH_INDEX_BATCH_SIZE', default=500, cast=int)
+
+# Related-party autocomplete on /api/property/related-parties/autocomplete/
+TENANT_AUTOCOMPLETE_LIMIT = config('TENANT_AUTOCOMPLETE_LIMIT', default=20, cast=int)
+TENANT_AUTOCOMPLETE_MAX_LIMIT = config('TENANT_AUTOCOMPLETE_MAX_LIMIT', default=50, cast=int)
+TENANT_AUTOCOMPLETE_CACHE_SIZE = config('TENANT_AUTOCOMPLETE_CACHE_SIZE', default=512, cast=int)
+
+# Supplier invoice / payment voucher bulk_create
+AP_BATCH_MAX_DOCUMENTS = config('AP_BATCH_MAX_DOCUMENTS', default=1000, cast=int)
@@ -22,6 +22,15 @@ urlpatterns = [
     
     # Property Management URLs
     path('api/property/', include('erp_system.apps.property.urls')),
+
+    # Background jobs
+    path('api/', include('erp_system.apps.jobs.urls')),
+
+    # Full-text search
+    path('api/', include('erp_system.apps.search.urls')),
+
+    # Instrumentation and request batching
+    path('api/', include('erp_system.apps.core.urls')),
 ]
 
 if settings.DEBUG:
@@ -8,28 +8,23 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'erp_system.config.settings')
 sys.path.insert(0, '/home/sys1/Desktop/app-erp/backend')
 django.setup()
 
-from erp_system.apps.property.models import Unit
-from erp_system.apps.accounts.models import CostCenter
+from erp_system.apps.property.models import Unit, Tenant
+from erp_system.apps.accounts.services import CostCenterProvisioningService
 
-# Find all units without cost centers and create/assign them
-units_without_cc = Unit.objects.filter(cost_center__isnull=True)
-print(f"Found {units_without_cc.count()} units without cost centers")
+# Find all units and tenants without cost centers and create/assign them in bulk
+units_without_cc = list(Unit.objects.filter(cost_center__isnull=True).select_related('property'))
+print(f"Found {len(units_without_cc)} units without cost centers")
 
-for unit in units_without_cc:
-    code = f"CC-UNIT-{unit.id:04d}"
-    name = f"{unit.property.name} - {unit.unit_number}"
-    
-    cost_center, created = CostCenter.objects.get_or_create(
-        code=code,
-        defaults={'name': name}
-    )
-    
-    unit.cost_center = cost_center
-    unit.save(update_fields=['cost_center'])
-    
-    status = "CREATED" if created else "FOUND"
-    print(f"✓ Unit {unit.id} ({unit.unit_number}): Cost Center {status} - {cost_center.name}")
+for unit in CostCenterProvisioningService.provision_units(units_without_cc):
+    print(f"✓ Unit {unit.id} ({unit.unit_number}): Cost Center - {unit.cost_center.name}")
+
+tenants_without_cc = list(Tenant.objects.filter(cost_center__isnull=True))
+print(f"Found {len(tenants_without_cc)} tenants without cost centers")
+
+for tenant in CostCenterProvisioningService.provision_tenants(tenants_without_cc):
+    print(f"✓ Tenant {tenant.id} ({tenant}): Cost Center - {tenant.cost_center.name}")
 
 # Verify
 units_still_without_cc = Unit.objects.filter(cost_center__isnull=True)
-print(f"\nAfter fix: {units_still_without_cc.count()} units still without cost centers")
+tenants_still_without_cc = Tenant.objects.filter(cost_center__isnull=True)
+print(f"\nAfter fix: {units_still_without_cc.count()} units and {tenants_still_without_cc.count()} tenants still without cost centers")
@@ -1,12 +1,13 @@
 import React, { useState, useEffect } from 'react';
 import { Container, Row, Col, Card, Alert, Spinner } from 'react-bootstrap';
-import { propertyService, tenantService, maintenanceService, rentService } from '../services/propertyService';
+import { dashboardService } from '../services/propertyService';
 import './Dashboard.css';
 
 function Dashboard() {
   const [stats, setStats] = useState({
     totalProperties: 0,
     occupiedUnits: 0,
+    occupancyRate: 0,
     pendingMaintenance: 0,
     unpaidRent: 0,
   });
@@ -21,24 +22,15 @@ function Dashboard() {
         setLoading(true);
         setError(null);
         
-        const [propertiesRes, tenantsRes, maintenanceRes, rentRes] = await Promise.all([
-          propertyService.getAll(),
-          tenantService.getAll(),
-          maintenanceService.getAll(),
-          rentService.getAll(),
-        ]);
-
-        const propertiesData = Array.isArray(propertiesRes.data) ? propertiesRes.data : (propertiesRes.data.results || propertiesRes.data.data || []);
-        const tenantsData = Array.isArray(tenantsRes.data) ? tenantsRes.data : (tenantsRes.data.results || tenantsRes.data.data || []);
-        const maintenanceData = Array.isArray(maintenanceRes.data) ? maintenanceRes.data : (maintenanceRes.data.results || maintenanceRes.data.data || []);
-        const rentData = Array.isArray(rentRes.data) ? rentRes.data : (rentRes.data.results || rentRes.data.data || []);
+        const { data } = await dashboardService.get();
 
         if (isMounted) {
           setStats({
-            totalProperties: Array.isArray(propertiesData) ? propertiesData.length : 0,
-            occupiedUnits: Array.isArray(tenantsData) ? tenantsData.filter(t => t.unit).length : 0,
-            pendingMaintenance: Array.isArray(maintenanceData) ? maintenanceData.filter(m => m.status === 'pending').length : 0,
-            unpaidRent: Array.isArray(rentData) ? rentData.filter(r => r.status !== 'paid').length : 0,
+            totalProperties: data.properties.total,
+            occupiedUnits: data.occupancy.occupied_units,
+            occupancyRate: data.occupancy.occupancy_rate,
+            pendingMaintenance: data.maintenance.open,
+            unpaidRent: data.rent.unpaid_count,
           });
         }
       } catch (err) {
@@ -107,7 +99,7 @@ function Dashboard() {
                 </div>
                 <div>
                   <h3 className="stat-number mb-1">{stats.occupiedUnits}</h3>
-                  <p className="stat-label mb-0">Occupied Units</p>
+                  <p className="stat-label mb-0">Occupied Units ({stats.occupancyRate}%)</p>
                 </div>
               </div>
             </Card.Body>
@@ -123,7 +115,7 @@ function Dashboard() {
                 </div>
                 <div>
                   <h3 className="stat-number mb-1">{stats.pendingMaintenance}</h3>
-                  <p className="stat-label mb-0">Pending Maintenance</p>
+                  <p className="stat-label mb-0">Open Maintenance</p>
                 </div>
               </div>
             </Card.Body>
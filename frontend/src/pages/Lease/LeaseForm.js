@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { Container, Form, Button, Alert, Spinner, Card, Row, Col } from 'react-bootstrap';
 import { useNavigate } from 'react-router-dom';
 import { leaseService } from '../../services/propertyService';
-import apiClient from '../../services/api';
+import { batchGet } from '../../services/api';
 import './LeaseForm.css';
 
 function LeaseForm() {
@@ -38,11 +38,11 @@ function LeaseForm() {
 
   const fetchUnitsAndTenants = async () => {
     try {
-      const [unitsResponse, tenantsResponse, leasesResponse, accountsResponse] = await Promise.all([
-        apiClient.get('/property/units/'),
-        apiClient.get('/property/related-parties/'),
-        apiClient.get('/property/leases/'),
-        apiClient.get('/accounts/accounts/')
+      const [unitsResponse, tenantsResponse, leasesResponse, accountsResponse] = await batchGet([
+        '/property/units/',
+        '/property/related-parties/',
+        '/property/leases/',
+        '/accounts/accounts/'
       ]);
       
       const allUnits = unitsResponse.data.results || unitsResponse.data;
@@ -36,4 +36,22 @@ apiClient.interceptors.response.use(
   }
 );
 
+// Fetch several GET endpoints in one round trip through /api/batch/.
+// Resolves to axios-like { data, status } objects in request order and
+// rejects when any of them failed, like Promise.all over apiClient.get.
+export const batchGet = async (paths) => {
+  const response = await apiClient.post('/batch/', { requests: paths.map((path) => ({ path })) });
+  const results = response.data.responses;
+  const failed = results.find((result) => result.status >= 400);
+  if (failed) {
+    const error = new Error(failed.data?.error || `Batched request failed with status ${failed.status}`);
+    error.response = failed;
+    throw error;
+  }
+  return results;
+};
+
+// Ranked full-text search; params may include kind (comma separated) and limit
+export const search = (q, params = {}) => apiClient.get('/search/', { params: { q, ...params } });
+
 export default apiClient;
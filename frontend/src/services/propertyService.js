@@ -28,6 +28,8 @@ export const tenantService = {
   create: (data) => apiClient.post(TENANT_ENDPOINT, data),
   update: (id, data) => apiClient.put(`${TENANT_ENDPOINT}${id}/`, data),
   delete: (id) => apiClient.delete(`${TENANT_ENDPOINT}${id}/`),
+  // Name-prefix lookups for related-party pickers; params may include ledger_account_type and limit
+  autocomplete: (q, params = {}) => apiClient.get(`${TENANT_ENDPOINT}autocomplete/`, { params: { q, ...params } }),
 };
 
 const LEASE_ENDPOINT = '/property/leases/';
@@ -69,3 +71,9 @@ export const rentService = {
   update: (id, data) => apiClient.put(`${RENT_ENDPOINT}${id}/`, data),
   delete: (id) => apiClient.delete(`${RENT_ENDPOINT}${id}/`),
 };
+
+const DASHBOARD_ENDPOINT = '/property/dashboard/';
+
+export const dashboardService = {
+  get: () => apiClient.get(DASHBOARD_ENDPOINT),
+};